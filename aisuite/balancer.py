@@ -0,0 +1,172 @@
+"""Latency-aware load balancing with circuit breaking across equivalent targets."""
+
+import random
+import threading
+import time
+
+from .routing import should_failover
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class TargetStats:
+    """Health and load of one "provider:model" target as seen by a LoadBalancer."""
+
+    def __init__(self, target):
+        self.target = target
+        self.latency = None  # EWMA of successful call latency, in seconds
+        self.error_rate = 0.0  # EWMA of the failure indicator (0 or 1)
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = None
+        self.probing = False
+
+    def score(self):
+        """Expected cost of sending one more request here; lower is better."""
+        latency = self.latency or 0.0
+        return latency * (self.in_flight + 1) / max(1.0 - self.error_rate, 0.01)
+
+    def snapshot(self):
+        return {
+            "latency": self.latency,
+            "error_rate": self.error_rate,
+            "in_flight": self.in_flight,
+            "consecutive_failures": self.consecutive_failures,
+            "state": self.state,
+        }
+
+
+class LoadBalancer:
+    """
+    Spreads requests over equivalent "provider:model" targets, preferring whichever is
+    currently fastest and healthiest. Pass it as the model of create():
+
+        balancer = LoadBalancer(["groq:llama3-70b-8192", "together:meta-llama/Llama-3-70b-chat-hf"])
+        client.chat.completions.create(model=balancer, messages=messages)
+
+    For every target an EWMA of latency and error rate is kept, together with the
+    number of requests in flight, from the calls made through it. Each request goes to
+    the target with the lowest expected cost (latency weighted by load and error rate)
+    out of two picked at random ("p2c", the default), or out of all of them
+    ("least_loaded"). The others are kept, cheapest first, as failover targets.
+
+    A target failing failure_threshold times in a row with a retryable error is
+    ejected (circuit open). After ejection_time seconds a single probe request is let
+    through (half-open): success closes the circuit, failure ejects the target again.
+    If every target is ejected, requests are sent anyway rather than failed locally.
+    """
+
+    def __init__(
+        self,
+        targets,
+        strategy="p2c",
+        alpha=0.3,
+        failure_threshold=5,
+        ejection_time=30.0,
+    ):
+        """
+        Args:
+            targets (list): Equivalent "provider:model" strings.
+            strategy (str): "p2c" (power of two choices) or "least_loaded".
+            alpha (float): EWMA smoothing factor; higher reacts faster.
+            failure_threshold (int): Consecutive failures that eject a target.
+            ejection_time (float): Seconds before an ejected target is probed again.
+        """
+        if not targets:
+            raise ValueError(
+                "A load balancer needs at least one 'provider:model' target."
+            )
+        if strategy not in ("p2c", "least_loaded"):
+            raise ValueError(
+                f"Invalid strategy {strategy!r}. Expected 'p2c' or 'least_loaded'."
+            )
+        self.targets = list(targets)
+        self.strategy = strategy
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self._stats = {target: TargetStats(target) for target in self.targets}
+        self._lock = threading.Lock()
+
+    def _available(self, stats, now):
+        if stats.state == OPEN and now - stats.opened_at >= self.ejection_time:
+            stats.state = HALF_OPEN
+            stats.probing = False
+        if stats.state == HALF_OPEN:
+            return not stats.probing
+        return stats.state == CLOSED
+
+    def ordered_targets(self):
+        """Return the chosen target followed by the failover targets."""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [s for s in self._stats.values() if self._available(s, now)]
+            if not candidates:
+                # Everything is ejected: fail open, starting with the target whose
+                # ejection is closest to expiring.
+                ejected = sorted(self._stats.values(), key=lambda s: s.opened_at or 0)
+                return [s.target for s in ejected]
+
+            if self.strategy == "p2c" and len(candidates) > 2:
+                pool = random.sample(candidates, 2)
+            else:
+                pool = candidates
+            if self.strategy == "least_loaded":
+                chosen = min(pool, key=lambda s: (s.in_flight, s.score()))
+            else:
+                chosen = min(pool, key=lambda s: s.score())
+            rest = sorted(
+                (s for s in candidates if s is not chosen), key=lambda s: s.score()
+            )
+            return [chosen.target] + [s.target for s in rest]
+
+    def hedge_delay(self, target):
+        return None
+
+    def on_start(self, target):
+        with self._lock:
+            stats = self._stats[target]
+            stats.in_flight += 1
+            if stats.state == HALF_OPEN:
+                stats.probing = True
+
+    def on_success(self, target, latency):
+        with self._lock:
+            stats = self._stats[target]
+            stats.in_flight -= 1
+            if stats.latency is None:
+                stats.latency = latency
+            else:
+                stats.latency += self.alpha * (latency - stats.latency)
+            stats.error_rate -= self.alpha * stats.error_rate
+            stats.consecutive_failures = 0
+            stats.state = CLOSED
+            stats.opened_at = None
+            stats.probing = False
+
+    def on_failure(self, target, latency, error):
+        with self._lock:
+            stats = self._stats[target]
+            stats.in_flight -= 1
+            if error is None or not should_failover(error):
+                # Cancelled hedges and caller errors (bad requests, bad credentials)
+                # say nothing about the health of the target.
+                stats.probing = False
+                return
+            stats.error_rate += self.alpha * (1.0 - stats.error_rate)
+            stats.consecutive_failures += 1
+            if (
+                stats.state == HALF_OPEN
+                or stats.consecutive_failures >= self.failure_threshold
+            ):
+                stats.state = OPEN
+                stats.opened_at = time.monotonic()
+                stats.probing = False
+
+    def stats(self):
+        """Return a snapshot of the per-target latency, error rate, load and state."""
+        with self._lock:
+            return {target: s.snapshot() for target, s in self._stats.items()}
@@ -0,0 +1,169 @@
+"""Concurrent fan-out of many chat completion requests with bounded parallelism."""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class BatchResult:
+    """Outcome of one request in a batch. Exactly one of response / error is set."""
+
+    def __init__(self, index, model, response=None, error=None):
+        self.index = index
+        self.model = model
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        outcome = f"error={self.error!r}" if self.error else "ok"
+        return f"BatchResult(index={self.index}, model={self.model!r}, {outcome})"
+
+
+def parse_batch_request(request):
+    """
+    Accept a request as (model, messages), (model, messages, kwargs) or a dict with
+    "model" and "messages" keys plus any extra arguments. Returns (model, messages, kwargs).
+    """
+    if isinstance(request, dict):
+        kwargs = dict(request)
+        return kwargs.pop("model"), kwargs.pop("messages"), kwargs
+    if len(request) == 2:
+        model, messages = request
+        return model, messages, {}
+    model, messages, kwargs = request
+    return model, messages, dict(kwargs or {})
+
+
+def _provider_key(model):
+    return model.split(":", 1)[0] if isinstance(model, str) else None
+
+
+def _provider_limit(per_provider_concurrency, provider_key):
+    if per_provider_concurrency is None:
+        return None
+    if isinstance(per_provider_concurrency, dict):
+        return per_provider_concurrency.get(provider_key)
+    return per_provider_concurrency
+
+
+def run_batch(
+    create,
+    requests,
+    max_concurrency=DEFAULT_MAX_CONCURRENCY,
+    per_provider_concurrency=None,
+    as_completed=False,
+):
+    """
+    Run `create(model, messages, **kwargs)` for every request on a thread pool.
+
+    Requests are only handed to a worker once their provider has spare capacity, so
+    a saturated provider never holds worker threads that other providers could use.
+    Returns a list of BatchResult in input order, or, with as_completed=True, an
+    iterator yielding each BatchResult as soon as it finishes.
+    """
+    results = _run_batch(create, requests, max_concurrency, per_provider_concurrency)
+    if as_completed:
+        return results
+    return sorted(results, key=lambda result: result.index)
+
+
+def _run_batch(create, requests, max_concurrency, per_provider_concurrency):
+    pending = {}  # provider key -> deque of (index, model, messages, kwargs)
+    for index, request in enumerate(requests):
+        model, messages, kwargs = parse_batch_request(request)
+        pending.setdefault(_provider_key(model), deque()).append(
+            (index, model, messages, kwargs)
+        )
+
+    def call(index, model, messages, kwargs):
+        try:
+            return BatchResult(index, model, response=create(model, messages, **kwargs))
+        except Exception as e:
+            return BatchResult(index, model, error=e)
+
+    in_flight = {}  # future -> provider key
+    per_provider = {key: 0 for key in pending}
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        while pending or in_flight:
+            # Fill free worker slots, skipping providers that are at their limit.
+            for key in list(pending):
+                limit = _provider_limit(per_provider_concurrency, key)
+                queue = pending[key]
+                while (
+                    queue
+                    and len(in_flight) < max_concurrency
+                    and (limit is None or per_provider[key] < limit)
+                ):
+                    future = executor.submit(call, *queue.popleft())
+                    in_flight[future] = key
+                    per_provider[key] += 1
+                if not queue:
+                    del pending[key]
+
+            if not in_flight:
+                raise ValueError("Concurrency limits must allow at least one request.")
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                per_provider[in_flight.pop(future)] -= 1
+                yield future.result()
+
+
+async def arun_batch(
+    acreate,
+    requests,
+    max_concurrency=DEFAULT_MAX_CONCURRENCY,
+    per_provider_concurrency=None,
+    as_completed=False,
+):
+    """
+    Async variant of run_batch(), bounded with semaphores instead of a thread pool.
+    With as_completed=True an async iterator of BatchResult is returned.
+    """
+    results = _arun_batch(acreate, requests, max_concurrency, per_provider_concurrency)
+    if as_completed:
+        return results
+    return sorted([result async for result in results], key=lambda result: result.index)
+
+
+async def _arun_batch(acreate, requests, max_concurrency, per_provider_concurrency):
+    overall = asyncio.Semaphore(max_concurrency)
+    provider_semaphores = {}
+
+    async def call(index, model, messages, kwargs):
+        key = _provider_key(model)
+        limit = _provider_limit(per_provider_concurrency, key)
+        if limit is not None and key not in provider_semaphores:
+            provider_semaphores[key] = asyncio.Semaphore(limit)
+        provider_semaphore = provider_semaphores.get(key)
+
+        # Take the provider slot first so a saturated provider does not hold
+        # global slots while it waits.
+        if provider_semaphore is not None:
+            await provider_semaphore.acquire()
+        try:
+            async with overall:
+                response = await acreate(model, messages, **kwargs)
+            return BatchResult(index, model, response=response)
+        except Exception as e:
+            return BatchResult(index, model, error=e)
+        finally:
+            if provider_semaphore is not None:
+                provider_semaphore.release()
+
+    tasks = [
+        asyncio.ensure_future(call(index, *parse_batch_request(request)))
+        for index, request in enumerate(requests)
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,800 @@
+"""
+Offline batch jobs through the providers' batch APIs: OpenAI Batch, Anthropic Message
+Batches and Bedrock batch inference. They cost about half as much as synchronous
+calls, and results arrive within 24 hours.
+
+    job = client.batches.create(requests, state_dir="jobs/nightly")
+    for result in job.results():
+        print(result.custom_id, result.response.choices[0].message.content)
+
+Requests are sharded per provider and model into one provider job each. All the
+state of a job is kept in state_dir: the JSONL payload of every shard, the provider
+job ids and the downloaded results. A driver that crashed or was restarted
+reattaches with client.batches.resume(state_dir). This submits the shards that were
+not submitted yet and continues the others where they were. A shard is recorded as
+submitting before it is sent, so that a job created by a submission interrupted by a
+crash is found again on resume rather than submitted (and billed) twice.
+"""
+
+from abc import ABC, abstractmethod
+import datetime
+import os
+import re
+import time
+import uuid
+
+from . import codec
+from .batch import parse_batch_request
+from .framework import ChatCompletionResponse
+from .http_client import HttpClient, translate_httpx_errors
+from .prompt_caching import strip_cache_markers
+from .provider import (
+    LLMError,
+    RateLimitError,
+    OverloadedError,
+    AuthenticationError,
+    BadRequestError,
+    error_from_status,
+    locked_cached_property,
+)
+
+STATE_FILE = "job.json"
+DEFAULT_POLL_INTERVAL = 60.0
+
+# Shard states. A shard is pending until it has been submitted to the provider, and
+# submitting while it is being submitted.
+PENDING = "pending"
+SUBMITTING = "submitting"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class BatchJobResult:
+    """Outcome of one request of a batch job. Exactly one of response / error is set."""
+
+    def __init__(self, custom_id, model, response=None, error=None):
+        self.custom_id = custom_id
+        self.model = model
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        outcome = f"error={self.error!r}" if self.error else "ok"
+        return (
+            f"BatchJobResult(custom_id={self.custom_id!r}, model={self.model!r}, "
+            f"{outcome})"
+        )
+
+
+def _write_jsonl(path, rows):
+    with open(path, "wb") as f:
+        for row in rows:
+            f.write(codec.dumps(row))
+            f.write(b"\n")
+
+
+def _read_jsonl(path):
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield codec.loads(line)
+
+
+def _write_atomic(path, content):
+    """Write a file so that a crash leaves either the old or the new content."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class BatchAdapter(ABC):
+    """
+    Submits shards to one provider's batch API and reads their results back.
+    All the requests of a shard use the same model.
+    """
+
+    # Fewest and most requests a provider accepts in one job.
+    min_requests_per_job = 1
+    max_requests_per_job = 50_000
+    # Field holding the custom id in the JSONL lines written by format_request().
+    id_field = "custom_id"
+
+    @abstractmethod
+    def format_request(self, custom_id, model, messages, kwargs):
+        """Return the JSONL line describing one request."""
+        pass
+
+    @abstractmethod
+    def submit(self, shard, input_path):
+        """
+        Submit a shard; return the state to record for it, including "job_id". The
+        job is tagged with shard["submission_id"] so that find() can recognize it.
+        """
+        pass
+
+    @abstractmethod
+    def find(self, shard, input_path):
+        """
+        Return the state submit() would have returned for a shard whose submission
+        was interrupted, if the provider job was created, or None if it was not.
+        """
+        pass
+
+    @abstractmethod
+    def poll(self, shard):
+        """Return the current state of a submitted shard, including "state"."""
+        pass
+
+    @abstractmethod
+    def download(self, shard, output_path):
+        """Write the raw JSONL results of a completed shard to output_path."""
+        pass
+
+    @abstractmethod
+    def parse_result(self, line, model):
+        """Return (custom_id, response, error) for one line of the raw results."""
+        pass
+
+    def close(self):
+        pass
+
+
+class OpenaiBatchAdapter(BatchAdapter):
+    """OpenAI Batch API: the shard is uploaded as a file and run as a batch."""
+
+    base_url = "https://api.openai.com/v1"
+
+    STATES = {
+        "validating": RUNNING,
+        "in_progress": RUNNING,
+        "finalizing": RUNNING,
+        "cancelling": RUNNING,
+        "completed": COMPLETED,
+        "failed": FAILED,
+        "expired": FAILED,
+        "cancelled": FAILED,
+    }
+
+    def __init__(self, **config):
+        self.api_key = config.get("api_key") or os.getenv("OPENAI_API_KEY")
+        self.base_url = (config.get("base_url") or self.base_url).rstrip("/")
+        self.http = HttpClient.from_config(config)
+
+    def _headers(self):
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def format_request(self, custom_id, model, messages, kwargs):
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": strip_cache_markers(messages),
+                **kwargs,
+            },
+        }
+
+    def submit(self, shard, input_path):
+        with translate_httpx_errors("OpenAI", "openai"):
+            with open(input_path, "rb") as f:
+                response = self.http.client.post(
+                    f"{self.base_url}/files",
+                    headers=self._headers(),
+                    data={"purpose": "batch"},
+                    files={"file": (os.path.basename(input_path), f)},
+                )
+            response.raise_for_status()
+            file_id = codec.loads(response.content)["id"]
+            batch = self.http.post_json(
+                f"{self.base_url}/batches",
+                {
+                    "input_file_id": file_id,
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": "24h",
+                    "metadata": {"aisuite_submission_id": shard["submission_id"]},
+                },
+                headers=self._headers(),
+            )
+        return {"job_id": batch["id"], "input_file_id": file_id}
+
+    def find(self, shard, input_path):
+        # Interrupted submissions are recent, so the latest batches are enough.
+        with translate_httpx_errors("OpenAI", "openai"):
+            batches = self.http.get_json(
+                f"{self.base_url}/batches?limit=100", headers=self._headers()
+            )
+        for batch in batches["data"]:
+            metadata = batch.get("metadata") or {}
+            if metadata.get("aisuite_submission_id") == shard["submission_id"]:
+                return {"job_id": batch["id"], "input_file_id": batch["input_file_id"]}
+        return None
+
+    def poll(self, shard):
+        with translate_httpx_errors("OpenAI", "openai"):
+            batch = self.http.get_json(
+                f"{self.base_url}/batches/{shard['job_id']}", headers=self._headers()
+            )
+        state = {
+            "state": self.STATES.get(batch["status"], RUNNING),
+            "output_file_ids": [
+                file_id
+                for file_id in (batch.get("output_file_id"), batch.get("error_file_id"))
+                if file_id
+            ],
+        }
+        errors = (batch.get("errors") or {}).get("data")
+        if state["state"] == FAILED:
+            state["error"] = errors[0]["message"] if errors else batch["status"]
+        return state
+
+    def download(self, shard, output_path):
+        with translate_httpx_errors("OpenAI", "openai"):
+            contents = []
+            for file_id in shard["output_file_ids"]:
+                response = self.http.client.get(
+                    f"{self.base_url}/files/{file_id}/content", headers=self._headers()
+                )
+                response.raise_for_status()
+                contents.append(response.content.rstrip(b"\n") + b"\n")
+        _write_atomic(output_path, b"".join(contents))
+
+    def parse_result(self, line, model):
+        response = line.get("response") or {}
+        status_code = response.get("status_code") or 0
+        error = line.get("error")
+        if error or status_code >= 400:
+            error = error or (response.get("body") or {}).get("error") or {}
+            return (
+                line["custom_id"],
+                None,
+                error_from_status(
+                    status_code,
+                    f"OpenAI batch request failed: {error.get('message')}",
+                    provider="openai",
+                ),
+            )
+        body = response["body"]
+        return line["custom_id"], ChatCompletionResponse.from_openai_dict(body), None
+
+    def close(self):
+        self.http.close()
+
+
+# Seconds of difference tolerated between the local and provider clocks.
+CLOCK_SKEW = 300
+
+
+def _timestamp(value):
+    """Return the POSIX timestamp of an RFC 3339 date."""
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+# Map Anthropic error types to LLMError subclasses.
+ANTHROPIC_ERROR_CLASSES = {
+    "invalid_request_error": BadRequestError,
+    "not_found_error": BadRequestError,
+    "request_too_large": BadRequestError,
+    "authentication_error": AuthenticationError,
+    "permission_error": AuthenticationError,
+    "rate_limit_error": RateLimitError,
+    "api_error": OverloadedError,
+    "overloaded_error": OverloadedError,
+}
+
+
+class AnthropicBatchAdapter(BatchAdapter):
+    """Anthropic Message Batches API."""
+
+    base_url = "https://api.anthropic.com"
+    max_requests_per_job = 100_000
+
+    def __init__(self, **config):
+        self.api_key = config.get("api_key") or os.getenv("ANTHROPIC_API_KEY")
+        self.base_url = (config.get("base_url") or self.base_url).rstrip("/")
+        self.http = HttpClient.from_config(config)
+
+    def _headers(self):
+        return {"x-api-key": self.api_key, "anthropic-version": "2023-06-01"}
+
+    def format_request(self, custom_id, model, messages, kwargs):
+        from aisuite.providers.anthropic_provider import build_request
+
+        # Requests are built exactly as for synchronous calls.
+        params = build_request(model, messages, **kwargs)
+        return {"custom_id": custom_id, "params": params}
+
+    def submit(self, shard, input_path):
+        with translate_httpx_errors("Anthropic", "anthropic"):
+            batch = self.http.post_json(
+                f"{self.base_url}/v1/messages/batches",
+                {"requests": list(_read_jsonl(input_path))},
+                headers=self._headers(),
+            )
+        return {"job_id": batch["id"]}
+
+    def find(self, shard, input_path):
+        # Message batches carry no metadata: look for a batch of the shard's size
+        # created since the submission started.
+        with translate_httpx_errors("Anthropic", "anthropic"):
+            batches = self.http.get_json(
+                f"{self.base_url}/v1/messages/batches?limit=100",
+                headers=self._headers(),
+            )
+        size = sum(1 for _ in _read_jsonl(input_path))
+        since = shard["submitted_at"] - CLOCK_SKEW
+        matches = [
+            batch
+            for batch in batches["data"]
+            if _timestamp(batch["created_at"]) >= since
+            and sum(batch["request_counts"].values()) == size
+        ]
+        if len(matches) > 1:
+            raise LLMError(
+                f"Cannot tell which of the Anthropic batches "
+                f"{[batch['id'] for batch in matches]} shard {shard['name']} created; "
+                f"set its job_id in {STATE_FILE} and its state to running.",
+                provider="anthropic",
+            )
+        return {"job_id": matches[0]["id"]} if matches else None
+
+    def poll(self, shard):
+        with translate_httpx_errors("Anthropic", "anthropic"):
+            batch = self.http.get_json(
+                f"{self.base_url}/v1/messages/batches/{shard['job_id']}",
+                headers=self._headers(),
+            )
+        # Individual requests may still have failed, expired or been canceled; that
+        # is reported per request in the results.
+        ended = batch["processing_status"] == "ended"
+        return {
+            "state": COMPLETED if ended else RUNNING,
+            "results_url": batch.get("results_url"),
+        }
+
+    def download(self, shard, output_path):
+        with translate_httpx_errors("Anthropic", "anthropic"):
+            response = self.http.client.get(
+                shard["results_url"], headers=self._headers()
+            )
+            response.raise_for_status()
+        _write_atomic(output_path, response.content)
+
+    def parse_result(self, line, model):
+        from aisuite.providers.anthropic_provider import normalize_message_dict
+
+        result = line["result"]
+        if result["type"] == "succeeded":
+            return line["custom_id"], normalize_message_dict(result["message"]), None
+        error = (result.get("error") or {}).get("error") or {}
+        error_class = ANTHROPIC_ERROR_CLASSES.get(error.get("type"), LLMError)
+        message = error.get("message") or result["type"]
+        return (
+            line["custom_id"],
+            None,
+            error_class(
+                f"Anthropic batch request {result['type']}: {message}",
+                provider="anthropic",
+            ),
+        )
+
+    def close(self):
+        self.http.close()
+
+
+class BedrockBatchAdapter(BatchAdapter):
+    """
+    Bedrock batch inference. The shard is uploaded to S3 and run as a model invocation
+    job, which needs the "batch_s3_uri" (an s3://bucket/prefix the job reads and writes)
+    and "batch_role_arn" (a service role allowed to access it) entries in the aws
+    provider config. Requests use the Anthropic messages format, so only Anthropic
+    models are supported, and Bedrock requires at least 100 requests per job.
+    """
+
+    min_requests_per_job = 100
+    id_field = "recordId"
+
+    STATES = {
+        "Submitted": RUNNING,
+        "Validating": RUNNING,
+        "Scheduled": RUNNING,
+        "InProgress": RUNNING,
+        "Stopping": RUNNING,
+        "Completed": COMPLETED,
+        "PartiallyCompleted": COMPLETED,
+        "Failed": FAILED,
+        "Stopped": FAILED,
+        "Expired": FAILED,
+    }
+
+    def __init__(self, **config):
+        self.region_name = config.get(
+            "region_name", os.getenv("AWS_REGION_NAME", "us-west-2")
+        )
+        self.role_arn = config.get("batch_role_arn") or os.getenv("AWS_BATCH_ROLE_ARN")
+        s3_uri = config.get("batch_s3_uri") or os.getenv("AWS_BATCH_S3_URI")
+        if not self.role_arn or not s3_uri:
+            raise ValueError(
+                "Bedrock batch jobs need batch_role_arn and batch_s3_uri in the aws "
+                "provider config (or AWS_BATCH_ROLE_ARN and AWS_BATCH_S3_URI)."
+            )
+        self.bucket, _, prefix = s3_uri[len("s3://") :].partition("/")
+        self.prefix = prefix.strip("/")
+
+    @locked_cached_property
+    def bedrock(self):
+        import boto3
+
+        return boto3.client("bedrock", region_name=self.region_name)
+
+    @locked_cached_property
+    def s3(self):
+        import boto3
+
+        return boto3.client("s3", region_name=self.region_name)
+
+    def _key(self, *parts):
+        return "/".join(part for part in (self.prefix, *parts) if part)
+
+    def format_request(self, custom_id, model, messages, kwargs):
+        from aisuite.providers.anthropic_provider import build_request
+
+        body = build_request(model, messages, **kwargs)
+        del body["model"]
+        if not body["system"]:
+            del body["system"]
+        body["anthropic_version"] = "bedrock-2023-05-31"
+        return {"recordId": custom_id, "modelInput": body}
+
+    def submit(self, shard, input_path):
+        from aisuite.providers.aws_provider import translate_bedrock_errors
+
+        job_name = self._job_name(shard)
+        input_key = self._key(job_name, "input.jsonl")
+        output_key = self._key(job_name, "output") + "/"
+        with translate_bedrock_errors():
+            self.s3.upload_file(input_path, self.bucket, input_key)
+            response = self.bedrock.create_model_invocation_job(
+                jobName=job_name,
+                clientRequestToken=shard["submission_id"],
+                roleArn=self.role_arn,
+                modelId=shard["model"],
+                inputDataConfig={
+                    "s3InputDataConfig": {"s3Uri": f"s3://{self.bucket}/{input_key}"}
+                },
+                outputDataConfig={
+                    "s3OutputDataConfig": {"s3Uri": f"s3://{self.bucket}/{output_key}"}
+                },
+            )
+        return {"job_id": response["jobArn"], "output_key": output_key}
+
+    def _job_name(self, shard):
+        # Job names must be unique and may only contain letters, digits and dashes;
+        # they are derived from the submission id so that find() can look them up.
+        job_name = f"aisuite-{shard['submission_id'][:12]}-" + re.sub(
+            r"[^a-zA-Z0-9]+", "-", shard["name"]
+        )
+        return job_name[:63].rstrip("-")
+
+    def find(self, shard, input_path):
+        from aisuite.providers.aws_provider import translate_bedrock_errors
+
+        job_name = self._job_name(shard)
+        with translate_bedrock_errors():
+            jobs = self.bedrock.list_model_invocation_jobs(nameContains=job_name)
+        for job in jobs.get("invocationJobSummaries", ()):
+            if job["jobName"] == job_name:
+                return {
+                    "job_id": job["jobArn"],
+                    "output_key": self._key(job_name, "output") + "/",
+                }
+        return None
+
+    def poll(self, shard):
+        from aisuite.providers.aws_provider import translate_bedrock_errors
+
+        with translate_bedrock_errors():
+            job = self.bedrock.get_model_invocation_job(jobIdentifier=shard["job_id"])
+        state = {"state": self.STATES.get(job["status"], RUNNING)}
+        if state["state"] == FAILED:
+            state["error"] = job.get("message") or job["status"]
+        return state
+
+    def download(self, shard, output_path):
+        from aisuite.providers.aws_provider import translate_bedrock_errors
+
+        # Bedrock writes <output prefix>/<job id>/<input file name>.out
+        job_id = shard["job_id"].rsplit("/", 1)[-1]
+        key = f"{shard['output_key']}{job_id}/input.jsonl.out"
+        with translate_bedrock_errors():
+            content = self.s3.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+        _write_atomic(output_path, content)
+
+    def parse_result(self, line, model):
+        from aisuite.providers.anthropic_provider import normalize_message_dict
+
+        if line.get("error"):
+            error = line["error"]
+            message = error.get("errorMessage") if isinstance(error, dict) else error
+            return (
+                line["recordId"],
+                None,
+                LLMError(f"Bedrock batch request failed: {message}", provider="aws"),
+            )
+        return (
+            line["recordId"],
+            normalize_message_dict(line["modelOutput"], model),
+            None,
+        )
+
+
+# Batch adapters, keyed by provider type.
+BATCH_ADAPTERS = {
+    "openai": OpenaiBatchAdapter,
+    "anthropic": AnthropicBatchAdapter,
+    "aws": BedrockBatchAdapter,
+}
+
+
+class BatchJob:
+    """
+    A set of requests run through provider batch APIs, one provider job per shard.
+    Use client.batches.create() or client.batches.resume() to get one.
+    """
+
+    def __init__(self, batches, state_dir, state):
+        self._batches = batches
+        self.state_dir = state_dir
+        self._state = state
+
+    @property
+    def shards(self):
+        """Per-shard state: name, provider, model, state and provider job id."""
+        return self._state["shards"]
+
+    def _path(self, *parts):
+        return os.path.join(self.state_dir, *parts)
+
+    def _save(self):
+        _write_atomic(self._path(STATE_FILE), codec.dumps(self._state))
+
+    def submit(self):
+        """
+        Submit the shards that have not been submitted yet. A shard left submitting by
+        an interrupted driver is only submitted again if its provider job cannot be
+        found.
+        """
+        for shard in self.shards:
+            if shard["state"] not in (PENDING, SUBMITTING):
+                continue
+            adapter = self._batches._adapter(shard["provider"])
+            input_path = self._path(shard["input"])
+            submitted = None
+            if shard["state"] == SUBMITTING:
+                submitted = adapter.find(shard, input_path)
+            if submitted is None:
+                # Recorded before the provider call, so that a crash during it leaves
+                # a trace; the submission id is kept when submitting again.
+                shard["state"] = SUBMITTING
+                shard.setdefault("submission_id", uuid.uuid4().hex)
+                shard["submitted_at"] = time.time()
+                self._save()
+                submitted = adapter.submit(shard, input_path)
+            shard.update(submitted)
+            shard["state"] = RUNNING
+            self._save()
+        return self
+
+    def poll(self):
+        """Refresh the state of the running shards and return status()."""
+        for shard in self.shards:
+            if shard["state"] == RUNNING:
+                adapter = self._batches._adapter(shard["provider"])
+                shard.update(adapter.poll(shard))
+        self._save()
+        return self.status()
+
+    def status(self):
+        """Return the number of shards in each state."""
+        counts = {PENDING: 0, SUBMITTING: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0}
+        for shard in self.shards:
+            counts[shard["state"]] += 1
+        return counts
+
+    @property
+    def done(self):
+        return all(shard["state"] in (COMPLETED, FAILED) for shard in self.shards)
+
+    def wait(self, poll_interval=DEFAULT_POLL_INTERVAL, timeout=None):
+        """Poll until every shard has completed or failed (or timeout seconds passed)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.poll()
+        while not self.done:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch job {self.state_dir} is still running.")
+            time.sleep(poll_interval)
+            self.poll()
+        return self
+
+    def results(self, poll_interval=DEFAULT_POLL_INTERVAL):
+        """
+        Yield a BatchJobResult for every request, shard by shard as shards finish,
+        polling every poll_interval seconds in between. Downloaded results are kept
+        in state_dir, so iterating again (or after resume()) does not download them
+        again. Every request of a failed shard is reported with an error. Shards
+        that were not submitted yet are submitted first.
+        """
+        self.submit()
+        remaining = list(self.shards)
+        while remaining:
+            if any(shard["state"] == RUNNING for shard in remaining):
+                self.poll()
+            for shard in [s for s in remaining if s["state"] in (COMPLETED, FAILED)]:
+                remaining.remove(shard)
+                yield from self._shard_results(shard)
+            if remaining:
+                time.sleep(poll_interval)
+
+    def _shard_results(self, shard):
+        adapter = self._batches._adapter(shard["provider"])
+        model = f"{shard['provider']}:{shard['model']}"
+        custom_ids = [
+            line[adapter.id_field] for line in _read_jsonl(self._path(shard["input"]))
+        ]
+
+        if shard["state"] == FAILED:
+            for custom_id in custom_ids:
+                error = LLMError(
+                    f"Batch job {shard.get('job_id')} failed: {shard.get('error')}",
+                    provider=shard["provider"],
+                )
+                yield BatchJobResult(custom_id, model, error=error)
+            return
+
+        output_path = self._path(shard["name"] + ".results.jsonl")
+        if not os.path.exists(output_path):
+            adapter.download(shard, output_path)
+        seen = set()
+        for line in _read_jsonl(output_path):
+            custom_id, response, error = adapter.parse_result(line, shard["model"])
+            seen.add(custom_id)
+            yield BatchJobResult(custom_id, model, response, error)
+        for custom_id in custom_ids:
+            if custom_id not in seen:
+                error = LLMError(
+                    "Request missing from the batch results.",
+                    provider=shard["provider"],
+                )
+                yield BatchJobResult(custom_id, model, error=error)
+
+
+class Batches:
+    """The client.batches API; see aisuite.batch_jobs."""
+
+    def __init__(self, client):
+        self.client = client
+        self._adapters = {}
+
+    def _adapter(self, provider_key):
+        adapter = self._adapters.get(provider_key)
+        if adapter is None:
+            provider_type = self.client._provider_type(provider_key)
+            adapter_class = BATCH_ADAPTERS.get(provider_type)
+            if adapter_class is None:
+                raise ValueError(
+                    f"Provider '{provider_key}' has no batch API support. "
+                    f"Supported providers: {sorted(BATCH_ADAPTERS)}."
+                )
+            config = self.client._config_for(provider_key)
+            adapter = self._adapters[provider_key] = adapter_class(**config)
+        return adapter
+
+    def create(self, requests, state_dir, submit=True):
+        """
+        Write the requests to state_dir, sharded per provider and model, and submit
+        one provider batch job per shard.
+
+        Args:
+            requests (list): Items of the form (model, messages), (model, messages,
+                kwargs) or {"model": ..., "messages": ..., **kwargs}. Dict items may
+                set a "custom_id" identifying their result; it defaults to
+                "request-<index>".
+            state_dir (str): Directory for the job state. It must not already hold a
+                job; use resume() to reattach to one.
+            submit (bool): Submit the shards now. Otherwise call BatchJob.submit().
+
+        Returns:
+            A BatchJob.
+        """
+        if os.path.exists(os.path.join(state_dir, STATE_FILE)):
+            raise FileExistsError(
+                f"{state_dir} already holds a batch job; use resume() to reattach."
+            )
+
+        shards = {}  # (provider key, model name) -> list of JSONL lines
+        custom_ids = set()
+        for index, request in enumerate(requests):
+            custom_id = f"request-{index}"
+            if isinstance(request, dict) and "custom_id" in request:
+                request = dict(request)
+                custom_id = str(request.pop("custom_id"))
+            if custom_id in custom_ids:
+                raise ValueError(f"Duplicate custom_id '{custom_id}'.")
+            custom_ids.add(custom_id)
+
+            model, messages, kwargs = parse_batch_request(request)
+            provider_key, model_name = self.client._parse_model(model)
+            adapter = self._adapter(provider_key)
+            shards.setdefault((provider_key, model_name), []).append(
+                adapter.format_request(custom_id, model_name, messages, kwargs)
+            )
+
+        # Check every shard before writing anything, so that a job a provider would
+        # refuse fails here rather than after the other shards were submitted.
+        for (provider_key, model_name), lines in shards.items():
+            minimum = self._adapter(provider_key).min_requests_per_job
+            if len(lines) < minimum:
+                raise ValueError(
+                    f"Provider '{provider_key}' needs at least {minimum} requests per "
+                    f"batch job; got {len(lines)} for '{provider_key}:{model_name}'."
+                )
+
+        os.makedirs(state_dir, exist_ok=True)
+        state = {"shards": []}
+        for (provider_key, model_name), lines in shards.items():
+            # Split evenly, so that no trailing shard falls below the minimum.
+            count = -(-len(lines) // self._adapter(provider_key).max_requests_per_job)
+            size = -(-len(lines) // count)
+            for start in range(0, len(lines), size):
+                name = re.sub(
+                    r"[^A-Za-z0-9._-]+",
+                    "_",
+                    f"{len(state['shards']):03d}-{provider_key}-{model_name}",
+                )
+                _write_jsonl(
+                    os.path.join(state_dir, name + ".jsonl"),
+                    lines[start : start + size],
+                )
+                state["shards"].append(
+                    {
+                        "name": name,
+                        "provider": provider_key,
+                        "model": model_name,
+                        "input": name + ".jsonl",
+                        "state": PENDING,
+                        "job_id": None,
+                    }
+                )
+
+        job = BatchJob(self, state_dir, state)
+        job._save()
+        return job.submit() if submit else job
+
+    def resume(self, state_dir, submit=True):
+        """
+        Reattach to the batch job kept in state_dir, submitting its shards that were
+        not submitted yet.
+        """
+        with open(os.path.join(state_dir, STATE_FILE), "rb") as f:
+            state = codec.loads(f.read())
+        job = BatchJob(self, state_dir, state)
+        return job.submit() if submit else job
+
+    def forget(self, provider_keys):
+        """Close the adapters of reconfigured providers; they are rebuilt on next use."""
+        for provider_key in provider_keys:
+            adapter = self._adapters.pop(provider_key, None)
+            if adapter is not None:
+                adapter.close()
+
+    def close(self):
+        """Close the connection pools of the batch adapters."""
+        for adapter in self._adapters.values():
+            adapter.close()
+        self._adapters = {}
@@ -0,0 +1,226 @@
+"""Opt-in response caches for chat completions, keyed on the canonical request."""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+
+def request_key(provider_key, model_name, messages, kwargs):
+    """
+    Return a stable hash of a request. Dict keys are sorted so logically identical
+    requests map to the same key regardless of argument order.
+    """
+    canonical = json.dumps(
+        {
+            "provider": provider_key,
+            "model": model_name,
+            "messages": messages,
+            "kwargs": kwargs,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=repr,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Cache(ABC):
+    """
+    Base class for response caches. Subclasses implement _get/_set; hit and miss
+    counting is done here.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached response for key, or None on a miss."""
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Store a response under key."""
+        self._set(key, value)
+
+    def stats(self):
+        """Return hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    @abstractmethod
+    def _get(self, key):
+        pass
+
+    @abstractmethod
+    def _set(self, key, value):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class MemoryCache(Cache):
+    """In-process LRU cache with optional TTL and size-based eviction."""
+
+    def __init__(self, maxsize=1024, ttl=None, max_bytes=None):
+        """
+        Args:
+            maxsize (int): Maximum number of cached responses.
+            ttl (float): Seconds before an entry expires. None keeps entries until evicted.
+            max_bytes (int): Optional bound on the total pickled size of cached responses.
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        size = len(pickle.dumps(value)) if self.max_bytes is not None else 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (expires_at, size, value)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache(Cache):
+    """
+    SQLite-backed cache that survives process restarts. Responses are pickled;
+    least recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, path, ttl=None, max_entries=100_000):
+        """
+        Args:
+            path (str): Path of the SQLite database file. Parent directories are created.
+            ttl (float): Seconds before an entry expires. None keeps entries until evicted.
+            max_entries (int): Maximum number of cached responses.
+        """
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+                "ON responses (accessed_at)"
+            )
+            # Tracked in memory so eviction does not need a COUNT(*) per write.
+            self._count = self._conn.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+
+    def _get(self, key):
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._count -= 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return pickle.loads(value)
+
+    def _set(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        blob = pickle.dumps(value)
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO responses (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, blob, expires_at, now),
+            ).rowcount
+            if inserted:
+                self._count += 1
+            else:
+                self._conn.execute(
+                    "UPDATE responses SET value = ?, expires_at = ?, accessed_at = ? "
+                    "WHERE key = ?",
+                    (blob, expires_at, now, key),
+                )
+            if self._count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                    (self._count - self.max_entries,),
+                )
+                self._count = self.max_entries
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._count = 0
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self):
+        return self._count
@@ -1,8 +1,126 @@
-from .provider import ProviderFactory
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from .provider import KeyedLocks, ProviderFactory, iterate_in_thread
+from .framework import ChatCompletionResponse
+from .batch import run_batch, arun_batch, DEFAULT_MAX_CONCURRENCY
+from .cache import request_key
+from .singleflight import SingleFlight
+from .rate_limit import RateLimiter
+from .routing import as_route, route_call, aroute_call
+from .prompt_caching import strip_cache_markers
+from .tools import tool_specs, run_tools, arun_tools, DEFAULT_MAX_TURNS
+from . import tokens
+from .hooks import (
+    start_request,
+    join_request,
+    finish_request,
+    fail_request,
+    observe_stream,
+    aobserve_stream,
+)
+
+# Provider config entries consumed by the client itself rather than passed to the provider.
+CLIENT_CONFIG_KEYS = ("rate_limit", "type")
+
+
+def _provider_config(config: dict):
+    """Return a copy of a provider config without the client-level entries."""
+    return {k: v for k, v in config.items() if k not in CLIENT_CONFIG_KEYS}
+
+
+def _fan_out(provider, provider_key, kwargs):
+    """
+    Return how many calls to make to the provider for a request and the arguments of
+    each: one call with n passed through if the provider supports it, otherwise n
+    calls without it.
+    """
+    if "n" not in kwargs or getattr(provider, "supports_n", False):
+        return 1, kwargs
+    n = kwargs["n"] or 1
+    if n > 1 and kwargs.get("stream"):
+        raise ValueError(
+            f"Provider '{provider_key}' does not support n > 1 with stream=True."
+        )
+    return n, {k: v for k, v in kwargs.items() if k != "n"}
+
+
+class _LeasedStream:
+    """
+    A stream holding a lease on its provider. The lease is released when the stream
+    ends, fails, is closed or is garbage collected, even if it was never iterated.
+    """
+
+    def __init__(self, client, provider, stream):
+        self._client = client
+        self._provider = provider
+        self._stream = stream
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._stream)
+        except BaseException:
+            self._release()
+            raise
+
+    def close(self):
+        try:
+            close = getattr(self._stream, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._release()
+
+    def _release(self):
+        provider, self._provider = self._provider, None
+        if provider is not None:
+            self._client._release_provider(provider)
+
+    def __del__(self):
+        if getattr(self, "_provider", None) is not None:
+            self._release()
+
+
+class _AsyncLeasedStream(_LeasedStream):
+    """The async counterpart of _LeasedStream."""
+
+    __iter__ = __next__ = close = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._stream.__anext__()
+        except BaseException:
+            self._release()
+            raise
+
+    async def aclose(self):
+        try:
+            aclose = getattr(self._stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        finally:
+            self._release()
 
 
 class Client:
-    def __init__(self, provider_configs: dict = {}):
+    def __init__(
+        self,
+        provider_configs: dict = None,
+        cache=None,
+        retry_policy=None,
+        hooks=None,
+        preflight=None,
+        coalesce=False,
+        share_providers=False,
+    ):
         """
         Initialize the client with provider configurations.
         Use the ProviderFactory to create provider instances.
@@ -11,6 +129,16 @@ class Client:
             provider_configs (dict): A dictionary containing provider configurations.
                 Each key should be a provider string (e.g., "google" or "aws-bedrock"),
                 and the value should be a dictionary of configuration options for that provider.
+                The HTTP-based providers (ollama, fireworks, together, huggingface, azure)
+                also accept connection pool options: "timeout", "max_connections",
+                "max_keepalive_connections", "keepalive_expiry" and "http2".
+                Any provider config may include a "rate_limit" entry that the client
+                enforces before dispatching, e.g. {"requests_per_minute": 30,
+                "tokens_per_minute": 6000, "models": {"<model>": {...}}}.
+                A config with a "type" entry creates a provider of that type under a key
+                of your choice, e.g. any OpenAI-compatible server (vLLM, llama.cpp
+                server, LM Studio) with {"vllm": {"type": "openai_compatible",
+                "base_url": "http://localhost:8000/v1"}}.
                 For example:
                 {
                     "openai": {"api_key": "your_openai_api_key"},
@@ -20,27 +148,99 @@ class Client:
                         "aws_region": "us-west-2"
                     }
                 }
+            cache (aisuite.cache.Cache): Optional response cache (e.g. MemoryCache or DiskCache).
+                Non-streaming completions are looked up by a hash of provider, model, messages
+                and arguments; pass use_cache=False to create() to bypass it for one call.
+            retry_policy (aisuite.retry.RetryPolicy): Optional policy for retrying rate-limited,
+                overloaded, timed out and connection-failed calls within a deadline.
+            hooks (list): Optional aisuite.hooks.Hook instances (e.g. an
+                aisuite.metrics.MetricsCollector) notified before and after every
+                provider request, on errors and on every streamed chunk.
+            preflight (str): Check locally that requests fit the model's context window
+                before sending them (see aisuite.tokens): "error" raises a
+                ContextWindowExceededError, "truncate" drops the oldest messages until
+                the request fits. Pass preflight=... to create() to override it per call.
+            coalesce (bool or aisuite.singleflight.SingleFlight): Coalesce identical
+                non-streaming requests in flight at the same time into one provider
+                call, whose response all the callers receive. Pass a SingleFlight to
+                share it between clients; client.singleflight.stats() counts the
+                collapsed calls. Pass coalesce=False to create() to opt out per call.
+            share_providers (bool): Reuse process-wide provider instances, keyed by
+                provider type and config, instead of creating them per client, so that
+                short-lived clients (e.g. one per web request) share SDK clients and
+                connection pools. Shared providers are not closed by close(); see
+                ProviderFactory.close_shared_providers() and
+                aclose_shared_providers().
         """
         self.providers = {}
-        self.provider_configs = provider_configs
+        self._provider_locks = KeyedLocks()
+        self.share_providers = share_providers
+        self.provider_configs = dict(provider_configs or {})
+        # Calls in flight per provider instance, and the replaced providers waiting for
+        # theirs to finish before being closed; both keyed by id(provider).
+        self._in_flight = {}
+        self._retired = {}
+        self._in_flight_lock = threading.Lock()
+        self._closing_tasks = set()
+        self.cache = cache
+        self.retry_policy = retry_policy
+        self.hooks = list(hooks or [])
+        self.preflight = preflight
+        if coalesce is True:
+            coalesce = SingleFlight()
+        self.singleflight = coalesce or None
+        self.rate_limiters = {}
+        self._rate_limiters_lock = threading.Lock()
         self._chat = None
+        self._batches = None
         self._initialize_providers()
 
     def _initialize_providers(self):
-        """Helper method to initialize or update providers."""
-        for provider_key, config in self.provider_configs.items():
+        """Create the providers of all the configured keys."""
+        for provider_key in self.provider_configs:
             provider_key = self._validate_provider_key(provider_key)
-            self.providers[provider_key] = ProviderFactory.create_provider(
-                provider_key, config
-            )
+            self.providers[provider_key] = self._create_provider(provider_key)
+
+    def _provider_type(self, provider_key, provider_configs=None):
+        """Return the provider type configured for provider_key (the key by default)."""
+        configs = (
+            self.provider_configs if provider_configs is None else provider_configs
+        )
+        return configs.get(provider_key, {}).get("type", provider_key)
 
-    def _validate_provider_key(self, provider_key):
+    def _config_for(self, provider_key, provider_configs=None):
+        """Return the config passed to the provider for provider_key."""
+        configs = (
+            self.provider_configs if provider_configs is None else provider_configs
+        )
+        return _provider_config(configs.get(provider_key, {}))
+
+    def _create_provider(self, provider_key, provider_configs=None):
+        create = (
+            ProviderFactory.shared_provider
+            if self.share_providers
+            else ProviderFactory.create_provider
+        )
+        return create(
+            self._provider_type(provider_key, provider_configs),
+            self._config_for(provider_key, provider_configs),
+        )
+
+    def _config_changed(self, provider_key, old_configs, new_configs):
+        """Whether provider_key needs a new provider to go from old to new configs."""
+        return self._provider_type(provider_key, old_configs) != self._provider_type(
+            provider_key, new_configs
+        ) or self._config_for(provider_key, old_configs) != self._config_for(
+            provider_key, new_configs
+        )
+
+    def _validate_provider_key(self, provider_key, provider_configs=None):
         """
         Validate if the provider key corresponds to a supported provider.
         """
-        supported_providers = ProviderFactory.get_supported_providers()
-
-        if provider_key not in supported_providers:
+        provider_type = self._provider_type(provider_key, provider_configs)
+        if not ProviderFactory.is_supported(provider_type):
+            supported_providers = ProviderFactory.get_supported_providers()
             raise ValueError(
                 f"Invalid provider key '{provider_key}'. Supported providers: {supported_providers}. "
                 "Make sure the model string is formatted correctly as 'provider:model'."
@@ -48,15 +248,209 @@ class Client:
 
         return provider_key
 
-    def configure(self, provider_configs: dict = None):
+    def configure(self, provider_configs: dict = None, replace: bool = False):
         """
-        Configure the client with provider configurations.
+        Update the provider configurations, e.g. to rotate an API key, while requests
+        are being made.
+
+        Only the providers whose config changed are rebuilt; the others keep their
+        SDK clients and warm connections. Replacement providers are created before
+        being swapped in, so no request waits for their construction, and the
+        replaced ones are closed once the calls in flight on them have finished.
+        A provider whose "rate_limit" entry alone changed is kept, with a new limiter.
+
+        Args:
+            provider_configs (dict): Configs to add or replace, by provider key.
+            replace (bool): Treat provider_configs as the complete configuration:
+                providers missing from it are removed.
         """
         if provider_configs is None:
             return
 
-        self.provider_configs.update(provider_configs)
-        self._initialize_providers()  # NOTE: This will override existing provider instances.
+        old_configs = self.provider_configs
+        new_configs = (
+            dict(provider_configs) if replace else {**old_configs, **provider_configs}
+        )
+        for provider_key in new_configs:
+            self._validate_provider_key(provider_key, new_configs)
+
+        rebuilt = {}
+        removed = []
+        try:
+            for provider_key in set(old_configs) | set(new_configs):
+                if provider_key not in new_configs:
+                    removed.append(provider_key)
+                elif self._config_changed(provider_key, old_configs, new_configs):
+                    rebuilt[provider_key] = self._create_provider(
+                        provider_key, new_configs
+                    )
+        except Exception:
+            # Nothing was swapped in yet: close the providers built so far.
+            for provider in rebuilt.values():
+                self._close_provider(provider)
+            raise
+
+        with self._in_flight_lock:
+            self.provider_configs = new_configs
+            retired = []
+            for provider_key in removed + list(rebuilt):
+                old = self.providers.pop(provider_key, None)
+                if provider_key in rebuilt:
+                    self.providers[provider_key] = rebuilt[provider_key]
+                if old is not None:
+                    if self._in_flight.get(id(old)):
+                        self._retired[id(old)] = old
+                    else:
+                        retired.append(old)
+        for old in retired:
+            self._close_provider(old)
+
+        for provider_key in set(old_configs) | set(new_configs):
+            old_limits = old_configs.get(provider_key, {}).get("rate_limit")
+            if new_configs.get(provider_key, {}).get("rate_limit") != old_limits:
+                self.rate_limiters.pop(provider_key, None)
+        if self._batches:
+            self._batches.forget(removed + list(rebuilt))
+
+    def _parse_model(self, model: str):
+        """
+        Split a 'provider:model' string into a validated provider key and model name.
+        """
+        # Check that correct format is used
+        if ":" not in model:
+            raise ValueError(
+                f"Invalid model format. Expected 'provider:model', got '{model}'"
+            )
+
+        # Extract the provider key from the model identifier, e.g., "google:gemini-xx"
+        provider_key, model_name = model.split(":", 1)
+
+        # Validate if the provider is supported
+        return self._validate_provider_key(provider_key), model_name
+
+    def _get_provider(self, provider_key: str):
+        """
+        Return the provider instance for provider_key, initializing it on first use.
+        """
+        provider = self.providers.get(provider_key)
+        if provider is None:
+            # Concurrent first calls must not build duplicate providers (and SDK
+            # clients and pools), but creating one provider must not block the others.
+            with self._provider_locks(provider_key):
+                provider = self.providers.get(provider_key)
+                while provider is None:
+                    configs = self.provider_configs
+                    created = self._create_provider(provider_key, configs)
+                    # A concurrent configure() may have changed the config meanwhile;
+                    # the provider built from the old one must not replace its own.
+                    with self._in_flight_lock:
+                        provider = self.providers.get(provider_key)
+                        current = self.provider_configs.get(provider_key)
+                        if provider is None and current is configs.get(provider_key):
+                            provider = self.providers[provider_key] = created
+                            created = None
+                    if created is not None:
+                        self._close_provider(created)
+
+        if not provider:
+            raise ValueError(f"Could not load provider for '{provider_key}'.")
+
+        return provider
+
+    def _lease_provider(self, provider_key):
+        """
+        Return the provider for provider_key, counting a call in flight on it until
+        _release_provider(); a provider replaced by configure() meanwhile is closed only
+        after that.
+        """
+        while True:
+            provider = self._get_provider(provider_key)
+            with self._in_flight_lock:
+                # configure() may have swapped the provider since it was looked up.
+                if self.providers.get(provider_key) is provider:
+                    key = id(provider)
+                    self._in_flight[key] = self._in_flight.get(key, 0) + 1
+                    return provider
+
+    def _release_provider(self, provider):
+        with self._in_flight_lock:
+            key = id(provider)
+            count = self._in_flight[key] - 1
+            if count:
+                self._in_flight[key] = count
+                return
+            del self._in_flight[key]
+            retired = self._retired.pop(key, None)
+        if retired is not None:
+            self._close_provider(retired)
+
+    def _close_provider(self, provider):
+        """Close a provider that was removed or replaced, unless it is shared."""
+        if not self.share_providers and hasattr(provider, "close"):
+            provider.close()
+
+    def _release_after_stream(self, provider, stream):
+        return _LeasedStream(self, provider, iter(stream))
+
+    def _get_rate_limiter(self, provider_key: str):
+        """
+        Return the RateLimiter configured for provider_key, or None if it has no limits.
+        """
+        if provider_key not in self.rate_limiters:
+            # Limiters hold shared state, so exactly one may exist per provider.
+            with self._rate_limiters_lock:
+                if provider_key not in self.rate_limiters:
+                    limits = self.provider_configs.get(provider_key, {}).get(
+                        "rate_limit"
+                    )
+                    self.rate_limiters[provider_key] = (
+                        RateLimiter(**limits) if limits else None
+                    )
+        return self.rate_limiters[provider_key]
+
+    def _cache_for(self, provider_key, model_name, messages, kwargs):
+        """
+        Return (cache, key) for a request, or (None, None) when the cache does not apply:
+        no cache is configured, the call streams, or use_cache=False was passed.
+        The use_cache flag is removed from kwargs either way.
+        """
+        use_cache = kwargs.pop("use_cache", True)
+        if self.cache is None or not use_cache or kwargs.get("stream"):
+            return None, None
+        return self.cache, request_key(provider_key, model_name, messages, kwargs)
+
+    def _singleflight_for(self, kwargs):
+        """
+        Return the SingleFlight coalescing a request, or None when it does not apply:
+        coalescing is not enabled, the call streams, or coalesce=False was passed.
+        The coalesce flag is removed from kwargs either way.
+        """
+        coalesce = kwargs.pop("coalesce", True)
+        if self.singleflight is None or not coalesce or kwargs.get("stream"):
+            return None
+        return self.singleflight
+
+    def _preflight(self, provider_key, model_name, messages, kwargs):
+        """
+        Return the messages to send after the context window preflight check. The
+        preflight flag is removed from kwargs either way.
+        """
+        mode = kwargs.pop("preflight", self.preflight)
+        if not mode:
+            return messages
+        return tokens.preflight(
+            self._provider_type(provider_key), model_name, messages, kwargs, mode
+        )
+
+    def count_tokens(self, model: str, messages: list):
+        """
+        Count the prompt tokens of messages for a 'provider:model', locally: exactly for
+        OpenAI models when tiktoken is installed, approximately otherwise.
+        """
+        provider_key, model_name = self._parse_model(model)
+        return tokens.count_tokens(
+            self._provider_type(provider_key), model_name, messages
+        )
 
     @property
     def chat(self):
@@ -65,6 +459,98 @@ class Client:
             self._chat = Chat(self)
         return self._chat
 
+    @property
+    def batches(self):
+        """Return the batch jobs API (see aisuite.batch_jobs)."""
+        if not self._batches:
+            # Imported here: it loads httpx, which plain completions may not need.
+            from .batch_jobs import Batches
+
+            self._batches = Batches(self)
+        return self._batches
+
+    def close(self):
+        """
+        Close the connection pools and SDK clients held by the initialized providers,
+        including the replaced ones still waiting for their calls in flight.
+        """
+        for provider in self._take_providers():
+            if hasattr(provider, "close") and not self.share_providers:
+                provider.close()
+        if self._batches:
+            self._batches.close()
+
+    def _take_providers(self):
+        """Remove and return the current and retired providers, for closing."""
+        with self._in_flight_lock:
+            providers = list(self.providers.values()) + list(self._retired.values())
+            self.providers = {}
+            self._retired = {}
+        return providers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class AsyncClient(Client):
+    """
+    Asyncio variant of Client. Providers are configured exactly as for Client,
+    but `chat.completions.create` is a coroutine.
+    """
+
+    async def aclose(self):
+        """
+        Close the sync and async connection pools held by the initialized providers,
+        including the replaced ones still waiting for their calls in flight.
+        """
+        for provider in self._take_providers():
+            if self.share_providers:
+                continue
+            if hasattr(provider, "aclose"):
+                await provider.aclose()
+            elif hasattr(provider, "close"):
+                provider.close()
+        if self._batches:
+            self._batches.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    def _close_provider(self, provider):
+        """
+        Close a removed or replaced provider, including its async connection pools
+        when called from the event loop.
+        """
+        if self.share_providers:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or not hasattr(provider, "aclose"):
+            super()._close_provider(provider)
+            return
+        task = loop.create_task(provider.aclose())
+        # Keep a reference until the task is done, as the loop only holds a weak one.
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    def _arelease_after_stream(self, provider, stream):
+        return _AsyncLeasedStream(self, provider, stream.__aiter__())
+
+    @property
+    def chat(self):
+        """Return the async chat API interface."""
+        if not self._chat:
+            self._chat = AsyncChat(self)
+        return self._chat
+
 
 class Chat:
     def __init__(self, client: "Client"):
@@ -81,37 +567,354 @@ class Completions:
     def __init__(self, client: "Client"):
         self.client = client
 
-    def create(self, model: str, messages: list, **kwargs):
+    def create(self, model, messages: list, **kwargs):
         """
         Create chat completion based on the model, messages, and any extra arguments.
+        With stream=True, an iterator of ChatCompletionChunk objects is returned instead.
+
+        The model is a 'provider:model' string, or a routing spec (a list of equivalent
+        'provider:model' strings or an aisuite.routing.Route) that fails over between
+        targets on retryable errors and can hedge slow requests.
+
+        n > 1 asks for n choices. Providers that cannot return several choices are
+        called n times concurrently and the responses merged into one, with summed
+        usage; streaming is then not supported.
+
+        preflight="error" or "truncate" checks that the request fits the model's context
+        window before sending it, overriding the client's preflight setting.
+        coalesce=False opts out of the client's request coalescing.
+
+        tools may be given as aisuite.tools.Tool objects and plain functions as well
+        as OpenAI-style definitions; every provider maps them to its own format.
         """
-        # Check that correct format is used
-        if ":" not in model:
-            raise ValueError(
-                f"Invalid model format. Expected 'provider:model', got '{model}'"
+        if not isinstance(model, str):
+            return route_call(
+                as_route(model),
+                lambda target: self._create(target, messages, dict(kwargs)),
             )
+        return self._create(model, messages, kwargs)
 
-        # Extract the provider key from the model identifier, e.g., "google:gemini-xx"
-        provider_key, model_name = model.split(":", 1)
+    def _create(self, model: str, messages: list, kwargs: dict):
+        """Create a chat completion against a single 'provider:model' target."""
+        provider_key, model_name = self.client._parse_model(model)
+        if kwargs.get("tools"):
+            kwargs["tools"] = tool_specs(kwargs["tools"])
+        messages = self.client._preflight(provider_key, model_name, messages, kwargs)
 
-        # Validate if the provider is supported
-        supported_providers = ProviderFactory.get_supported_providers()
-        if provider_key not in supported_providers:
-            raise ValueError(
-                f"Invalid provider key '{provider_key}'. Supported providers: {supported_providers}. "
-                "Make sure the model string is formatted correctly as 'provider:model'."
+        flight = self.client._singleflight_for(kwargs)
+        cache, key = self.client._cache_for(provider_key, model_name, messages, kwargs)
+        if cache is not None:
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+        if flight is not None:
+            return flight.do(
+                key or request_key(provider_key, model_name, messages, kwargs),
+                lambda: self._call(
+                    provider_key, model_name, messages, kwargs, cache, key
+                ),
+                lambda: join_request(
+                    self.client.hooks, provider_key, model_name, messages, kwargs
+                ),
+            )
+        return self._call(provider_key, model_name, messages, kwargs, cache, key)
+
+    def _call(self, provider_key, model_name, messages, kwargs, cache, key):
+        """Dispatch a request, reporting it to the hooks and storing it in the cache."""
+        hooks = self.client.hooks
+        if not hooks:
+            response = self._dispatch(provider_key, model_name, messages, kwargs)
+        else:
+            context = start_request(hooks, provider_key, model_name, messages, kwargs)
+            try:
+                response = self._dispatch(provider_key, model_name, messages, kwargs)
+            except Exception as e:
+                fail_request(hooks, context, e)
+                raise
+            if context.stream:
+                return observe_stream(hooks, context, response)
+            finish_request(hooks, context, response)
+
+        if cache is not None:
+            cache.set(key, response)
+        return response
+
+    def _dispatch(self, provider_key, model_name, messages, kwargs):
+        """
+        Send one request to a provider, applying its rate limits and the retry policy.
+        The provider is leased for the duration of the call (the whole stream, for
+        streamed calls), so that configure() does not close it under the call.
+        """
+        provider = self.client._lease_provider(provider_key)
+        try:
+            response = self._send(provider, provider_key, model_name, messages, kwargs)
+        except BaseException:
+            self.client._release_provider(provider)
+            raise
+        if kwargs.get("stream"):
+            return self.client._release_after_stream(provider, response)
+        self.client._release_provider(provider)
+        return response
+
+    def _send(self, provider, provider_key, model_name, messages, kwargs):
+        rate_limiter = self.client._get_rate_limiter(provider_key)
+        if not getattr(provider, "supports_cache_markers", False):
+            messages = strip_cache_markers(messages)
+
+        def attempt(kwargs):
+            if rate_limiter is not None:
+                rate_limiter.acquire(model_name, messages, kwargs)
+            # Delegate the chat completion to the correct provider's implementation
+            start = time.monotonic()
+            response = provider.chat_completions_create(model_name, messages, **kwargs)
+            if isinstance(response, ChatCompletionResponse):
+                response.latency = time.monotonic() - start
+            return response
+
+        def call(kwargs):
+            retry_policy = self.client.retry_policy
+            if retry_policy is None:
+                return attempt(kwargs)
+            return retry_policy.call(attempt, kwargs)
+
+        n, call_kwargs = _fan_out(provider, provider_key, kwargs)
+        if n == 1:
+            return call(call_kwargs)
+        with ThreadPoolExecutor(max_workers=n) as executor:
+            responses = list(executor.map(call, [call_kwargs] * n))
+        return ChatCompletionResponse.merge(responses)
+
+    def run_tools(
+        self,
+        model,
+        messages: list,
+        tools,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        timeout=None,
+        **kwargs,
+    ):
+        """
+        Run a conversation in which the model may call tools: every reply's tool calls
+        are run concurrently on threads and their results sent back, until the model
+        answers without calling a tool or max_turns completions have been made.
+
+        Args:
+            model: A 'provider:model' string or a routing spec, as for create().
+            messages (list): The conversation so far; it is not modified.
+            tools (list): aisuite.tools.Tool objects and plain functions, or an
+                aisuite.tools.ToolRunner to reuse its threads and the cache of pure
+                tool results across runs.
+            max_turns (int): Maximum number of completions to request.
+            timeout (float): Default timeout of every tool call, in seconds.
+            **kwargs: Passed to create() for every completion.
+
+        Returns:
+            An aisuite.tools.ToolRunResult with the last response and the whole
+            conversation.
+        """
+        return run_tools(
+            self.create, model, messages, tools, max_turns, timeout, **kwargs
+        )
+
+    def batch(
+        self,
+        requests: list,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        per_provider_concurrency=None,
+        as_completed: bool = False,
+    ):
+        """
+        Run many chat completions concurrently.
+
+        Args:
+            requests (list): Items of the form (model, messages), (model, messages, kwargs)
+                or {"model": ..., "messages": ..., **kwargs}.
+            max_concurrency (int): Maximum number of requests in flight overall.
+            per_provider_concurrency (int | dict): Maximum number of requests in flight per
+                provider, either one limit for every provider or a dict keyed by provider.
+            as_completed (bool): Yield results as they finish instead of returning a list.
+
+        Returns:
+            A list of BatchResult in input order (or an iterator of them with as_completed).
+            A failing request sets BatchResult.error instead of failing the whole batch.
+        """
+        return run_batch(
+            self.create,
+            requests,
+            max_concurrency=max_concurrency,
+            per_provider_concurrency=per_provider_concurrency,
+            as_completed=as_completed,
+        )
+
+
+class AsyncChat:
+    def __init__(self, client: "AsyncClient"):
+        self.client = client
+        self._completions = AsyncCompletions(self.client)
+
+    @property
+    def completions(self):
+        """Return the async completions interface."""
+        return self._completions
+
+
+class AsyncCompletions:
+    def __init__(self, client: "AsyncClient"):
+        self.client = client
+
+    async def create(self, model, messages: list, **kwargs):
+        """
+        Asynchronously create chat completion based on the model, messages, and any extra arguments.
+        With stream=True, an async iterator of ChatCompletionChunk objects is returned instead.
+        The model may also be a routing spec, as for Completions.create; the losing
+        request of a hedge is cancelled.
+        """
+        if not isinstance(model, str):
+            return await aroute_call(
+                as_route(model),
+                lambda target: self._create(target, messages, dict(kwargs)),
             )
+        return await self._create(model, messages, kwargs)
+
+    async def _create(self, model: str, messages: list, kwargs: dict):
+        """Create a chat completion against a single 'provider:model' target."""
+        provider_key, model_name = self.client._parse_model(model)
+        if kwargs.get("tools"):
+            kwargs["tools"] = tool_specs(kwargs["tools"])
+        messages = self.client._preflight(provider_key, model_name, messages, kwargs)
 
-        # Initialize provider if not already initialized
-        if provider_key not in self.client.providers:
-            config = self.client.provider_configs.get(provider_key, {})
-            self.client.providers[provider_key] = ProviderFactory.create_provider(
-                provider_key, config
+        flight = self.client._singleflight_for(kwargs)
+        cache, key = self.client._cache_for(provider_key, model_name, messages, kwargs)
+        if cache is not None:
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+        if flight is not None:
+            return await flight.ado(
+                key or request_key(provider_key, model_name, messages, kwargs),
+                lambda: self._call(
+                    provider_key, model_name, messages, kwargs, cache, key
+                ),
+                lambda: join_request(
+                    self.client.hooks, provider_key, model_name, messages, kwargs
+                ),
             )
+        return await self._call(provider_key, model_name, messages, kwargs, cache, key)
 
-        provider = self.client.providers.get(provider_key)
-        if not provider:
-            raise ValueError(f"Could not load provider for '{provider_key}'.")
+    async def _call(self, provider_key, model_name, messages, kwargs, cache, key):
+        """Dispatch a request, reporting it to the hooks and storing it in the cache."""
+        hooks = self.client.hooks
+        if not hooks:
+            response = await self._dispatch(provider_key, model_name, messages, kwargs)
+        else:
+            context = start_request(hooks, provider_key, model_name, messages, kwargs)
+            try:
+                response = await self._dispatch(
+                    provider_key, model_name, messages, kwargs
+                )
+            except Exception as e:
+                fail_request(hooks, context, e)
+                raise
+            if context.stream:
+                return aobserve_stream(hooks, context, response)
+            finish_request(hooks, context, response)
+
+        if cache is not None:
+            cache.set(key, response)
+        return response
+
+    async def _dispatch(self, provider_key, model_name, messages, kwargs):
+        """
+        Send one request to a provider, applying its rate limits and the retry policy.
+        The provider is leased for the duration of the call (the whole stream, for
+        streamed calls), so that configure() does not close it under the call.
+        """
+        provider = self.client._lease_provider(provider_key)
+        try:
+            response = await self._send(
+                provider, provider_key, model_name, messages, kwargs
+            )
+        except BaseException:
+            self.client._release_provider(provider)
+            raise
+        if kwargs.get("stream"):
+            return self.client._arelease_after_stream(provider, response)
+        self.client._release_provider(provider)
+        return response
 
-        # Delegate the chat completion to the correct provider's implementation
-        return provider.chat_completions_create(model_name, messages, **kwargs)
+    async def _send(self, provider, provider_key, model_name, messages, kwargs):
+        rate_limiter = self.client._get_rate_limiter(provider_key)
+        if not getattr(provider, "supports_cache_markers", False):
+            messages = strip_cache_markers(messages)
+
+        async def attempt(kwargs):
+            if rate_limiter is not None:
+                await rate_limiter.aacquire(model_name, messages, kwargs)
+
+            # Providers that are not built on the Provider base class may lack an async
+            # implementation, in which case the blocking call is run in a worker thread.
+            start = time.monotonic()
+            if not hasattr(provider, "achat_completions_create"):
+                response = await asyncio.to_thread(
+                    provider.chat_completions_create, model_name, messages, **kwargs
+                )
+                if kwargs.get("stream"):
+                    return iterate_in_thread(response)
+            else:
+                response = await provider.achat_completions_create(
+                    model_name, messages, **kwargs
+                )
+            if isinstance(response, ChatCompletionResponse):
+                response.latency = time.monotonic() - start
+            return response
+
+        async def call(kwargs):
+            retry_policy = self.client.retry_policy
+            if retry_policy is None:
+                return await attempt(kwargs)
+            return await retry_policy.acall(attempt, kwargs)
+
+        n, call_kwargs = _fan_out(provider, provider_key, kwargs)
+        if n == 1:
+            return await call(call_kwargs)
+        responses = await asyncio.gather(*(call(call_kwargs) for _ in range(n)))
+        return ChatCompletionResponse.merge(responses)
+
+    async def run_tools(
+        self,
+        model,
+        messages: list,
+        tools,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        timeout=None,
+        **kwargs,
+    ):
+        """
+        Async variant of Completions.run_tools: coroutine tools run as tasks on the
+        event loop and sync tools on threads, all of a reply's calls concurrently.
+        """
+        return await arun_tools(
+            self.create, model, messages, tools, max_turns, timeout, **kwargs
+        )
+
+    async def batch(
+        self,
+        requests: list,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        per_provider_concurrency=None,
+        as_completed: bool = False,
+    ):
+        """
+        Run many chat completions concurrently on the event loop.
+        Arguments and results are the same as for Completions.batch; with as_completed
+        an async iterator is returned.
+        """
+        return await arun_batch(
+            self.create,
+            requests,
+            max_concurrency=max_concurrency,
+            per_provider_concurrency=per_provider_concurrency,
+            as_completed=as_completed,
+        )
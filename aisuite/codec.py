@@ -0,0 +1,72 @@
+"""
+JSON encoding and decoding for the HTTP-based providers.
+
+The fastest installed library is used: orjson, then msgspec, then the standard
+library. Neither is required; install one (`pip install orjson`) to speed up
+requests with large message histories.
+"""
+
+import functools
+import json
+
+CODECS = ("orjson", "msgspec", "json")
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _load_codec(name):
+    """Return (dumps, loads) for the named codec; raises ImportError if unavailable."""
+    if name == "orjson":
+        import orjson
+
+        # Non-string keys (e.g. logit_bias token ids) are encoded as strings, as
+        # the standard library does.
+        dumps = functools.partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+        return dumps, orjson.loads
+    if name == "msgspec":
+        import msgspec
+
+        encoder, decoder = msgspec.json.Encoder(), msgspec.json.Decoder()
+        return encoder.encode, decoder.decode
+    if name == "json":
+        return _stdlib_dumps, json.loads
+    raise ValueError(f"Unknown JSON codec {name!r}. Expected one of {CODECS}.")
+
+
+def set_codec(name=None):
+    """
+    Select the codec used by dumps() and loads(): one of CODECS, or None for the
+    fastest one installed.
+    """
+    global _name, _dumps, _loads
+    for candidate in CODECS if name is None else (name,):
+        try:
+            _dumps, _loads = _load_codec(candidate)
+        except ImportError:
+            if name is not None:
+                raise
+            continue
+        _name = candidate
+        return candidate
+
+
+def get_codec():
+    """Return the name of the codec in use."""
+    return _name
+
+
+def dumps(obj):
+    """Encode obj as compact UTF-8 JSON bytes."""
+    return _dumps(obj)
+
+
+def loads(data):
+    """Decode JSON from bytes or str."""
+    return _loads(data)
+
+
+_name = None
+_dumps = _loads = None
+set_codec()
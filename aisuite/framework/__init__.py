@@ -1,2 +1,6 @@
 from .provider_interface import ProviderInterface
 from .chat_completion_response import ChatCompletionResponse
+from .chat_completion_chunk import ChatCompletionChunk, ChoiceDeltaToolCall
+from .usage import CompletionUsage
+from .choice import Choice
+from .message import Message, ToolCall, Function
@@ -0,0 +1,147 @@
+"""Normalized streaming chunk, shaped like OpenAI's chat.completion.chunk objects."""
+
+from aisuite.framework.chat_completion_response import _arguments
+from aisuite.framework.message import Function
+from aisuite.framework.usage import CompletionUsage
+
+
+class ChoiceDeltaToolCall:
+    """
+    A piece of a streamed tool call. The first piece of a call carries its id and
+    function name; the JSON arguments may be split over several pieces, to be
+    concatenated in order. Pieces of the same call share its index.
+    """
+
+    __slots__ = ("index", "id", "type", "function")
+
+    def __init__(self, index=0, id=None, function=None, type="function"):
+        self.index = index
+        self.id = id
+        self.type = type
+        self.function = function or Function()
+
+
+class ChoiceDelta:
+    __slots__ = ("content", "role", "tool_calls")
+
+    def __init__(self, content=None, role=None, tool_calls=None):
+        self.content = content
+        self.role = role
+        self.tool_calls = tool_calls  # list of ChoiceDeltaToolCall, or None
+
+
+class ChunkChoice:
+    __slots__ = ("index", "delta", "finish_reason")
+
+    def __init__(self, index=0, delta=None, finish_reason=None):
+        self.index = index
+        self.delta = delta or ChoiceDelta()
+        self.finish_reason = finish_reason
+
+
+class ChatCompletionChunk:
+    """
+    A single incremental piece of a streamed chat completion.
+
+    Chunks carrying usage report the token counts known so far; counts only grow over
+    a stream, so the largest values seen are the totals.
+    """
+
+    __slots__ = ("choices", "usage")
+
+    def __init__(
+        self, content=None, role=None, finish_reason=None, usage=None, tool_calls=None
+    ):
+        self.choices = [
+            ChunkChoice(
+                delta=ChoiceDelta(content=content, role=role, tool_calls=tool_calls),
+                finish_reason=finish_reason,
+            )
+        ]
+        self.usage = usage
+
+    @classmethod
+    def from_openai_dict(cls, data):
+        """
+        Build from an OpenAI-style chat.completion.chunk JSON object (decoded). Each
+        choice of the chunk keeps its index, for requests with n > 1.
+        """
+        chunk = cls(usage=CompletionUsage.from_dict(data.get("usage")))
+        if data.get("choices"):
+            chunk.choices = [
+                ChunkChoice(
+                    index=choice.get("index", position),
+                    delta=_delta_from_dict(choice.get("delta") or {}),
+                    finish_reason=choice.get("finish_reason"),
+                )
+                for position, choice in enumerate(data["choices"])
+            ]
+        return chunk
+
+    @classmethod
+    def from_openai_object(cls, chunk):
+        """
+        Build from an OpenAI-shaped SDK chunk (openai, groq and mistral SDKs). Each
+        choice of the chunk keeps its index, for requests with n > 1.
+        """
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            usage = CompletionUsage(usage.prompt_tokens, usage.completion_tokens)
+        normalized = cls(usage=usage)
+        if chunk.choices:
+            normalized.choices = [
+                ChunkChoice(
+                    index=getattr(choice, "index", position),
+                    delta=_delta_from_object(choice.delta),
+                    finish_reason=choice.finish_reason,
+                )
+                for position, choice in enumerate(chunk.choices)
+            ]
+        return normalized
+
+
+def _delta_from_dict(delta):
+    tool_calls = [
+        _tool_call_piece(
+            call.get("index", position),
+            call.get("id"),
+            call.get("type"),
+            call.get("function") or {},
+        )
+        for position, call in enumerate(delta.get("tool_calls") or ())
+    ]
+    return ChoiceDelta(
+        content=delta.get("content"),
+        role=delta.get("role"),
+        tool_calls=tool_calls or None,
+    )
+
+
+def _delta_from_object(delta):
+    tool_calls = []
+    for position, call in enumerate(getattr(delta, "tool_calls", None) or ()):
+        index = getattr(call, "index", None)
+        function = call.function
+        tool_calls.append(
+            _tool_call_piece(
+                position if index is None else index,
+                call.id,
+                getattr(call, "type", None),
+                {
+                    "name": getattr(function, "name", None),
+                    "arguments": getattr(function, "arguments", None),
+                },
+            )
+        )
+    return ChoiceDelta(
+        content=delta.content, role=delta.role, tool_calls=tool_calls or None
+    )
+
+
+def _tool_call_piece(index, id, type, function):
+    return ChoiceDeltaToolCall(
+        index=index,
+        id=id,
+        type=type or "function",
+        function=Function(function.get("name"), _arguments(function.get("arguments"))),
+    )
@@ -1,8 +1,161 @@
+import json
+
 from aisuite.framework.choice import Choice
+from aisuite.framework.message import Message, ToolCall, Function
+from aisuite.framework.usage import CompletionUsage
 
 
 class ChatCompletionResponse:
-    """Used to conform to the response model of OpenAI"""
+    """
+    Used to conform to the response model of OpenAI.
+
+    Every provider normalizes into this class. `raw` gives the provider's own payload
+    (an SDK object or the decoded JSON body); providers may pass a callable instead,
+    which is only invoked the first time `raw` is read.
+    """
+
+    __slots__ = ("choices", "usage", "model", "latency", "_raw")
+
+    def __init__(self, choices=None, usage=None, model=None, latency=None, raw=None):
+        # A single empty choice by default, for providers that fill it in place.
+        self.choices = choices if choices is not None else [Choice()]
+        self.usage = usage  # CompletionUsage, when the provider reports it
+        self.model = model
+        self.latency = latency  # seconds spent in the provider call, set by the client
+        self._raw = raw
+
+    @property
+    def raw(self):
+        if callable(self._raw):
+            self._raw = self._raw()
+        return self._raw
+
+    @raw.setter
+    def raw(self, value):
+        self._raw = value
+
+    def __getstate__(self):
+        # Resolve a deferred payload so that responses can be pickled (e.g. cached).
+        return (self.choices, self.usage, self.model, self.latency, self.raw)
+
+    def __setstate__(self, state):
+        self.choices, self.usage, self.model, self.latency, self._raw = state
+
+    @classmethod
+    def merge(cls, responses):
+        """
+        Combine responses to the same request, made concurrently, into one response
+        holding all their choices, with summed usage and the longest latency.
+        """
+        choices = []
+        for response in responses:
+            for choice in response.choices:
+                choices.append(
+                    Choice(len(choices), choice.message, choice.finish_reason)
+                )
+        usages = [r.usage for r in responses if r.usage is not None]
+        latencies = [r.latency for r in responses if r.latency is not None]
+        return cls(
+            choices=choices,
+            usage=(
+                CompletionUsage(
+                    sum(u.prompt_tokens for u in usages),
+                    sum(u.completion_tokens for u in usages),
+                    sum(u.cache_read_tokens for u in usages),
+                    sum(u.cache_write_tokens for u in usages),
+                )
+                if usages
+                else None
+            ),
+            model=responses[0].model,
+            latency=max(latencies) if latencies else None,
+            raw=lambda: [r.raw for r in responses],
+        )
+
+    @classmethod
+    def from_openai_dict(cls, data, model=None):
+        """Build from an OpenAI-style chat.completion JSON body (already decoded)."""
+        choices = []
+        for index, choice in enumerate(data.get("choices") or ()):
+            message = choice.get("message") or {}
+            tool_calls = message.get("tool_calls")
+            if tool_calls:
+                tool_calls = [
+                    ToolCall(
+                        id=call.get("id"),
+                        type=call.get("type") or "function",
+                        function=Function(
+                            call["function"].get("name"),
+                            _arguments(call["function"].get("arguments")),
+                        ),
+                    )
+                    for call in tool_calls
+                ]
+            choices.append(
+                Choice(
+                    index=choice.get("index", index),
+                    message=Message(
+                        content=message.get("content"),
+                        role=message.get("role") or "assistant",
+                        tool_calls=tool_calls or None,
+                    ),
+                    finish_reason=choice.get("finish_reason"),
+                )
+            )
+        return cls(
+            choices=choices or None,
+            usage=CompletionUsage.from_dict(data.get("usage")),
+            model=data.get("model") or model,
+            raw=data,
+        )
+
+    @classmethod
+    def from_openai_object(cls, response, model=None):
+        """Build from an OpenAI-shaped SDK object (openai, groq and mistral SDKs)."""
+        choices = []
+        for index, choice in enumerate(response.choices or ()):
+            message = choice.message
+            tool_calls = getattr(message, "tool_calls", None)
+            if tool_calls:
+                tool_calls = [
+                    ToolCall(
+                        id=call.id,
+                        type=getattr(call, "type", None) or "function",
+                        function=Function(
+                            call.function.name, _arguments(call.function.arguments)
+                        ),
+                    )
+                    for call in tool_calls
+                ]
+            choices.append(
+                Choice(
+                    index=getattr(choice, "index", index),
+                    message=Message(
+                        content=message.content,
+                        role=getattr(message, "role", None) or "assistant",
+                        tool_calls=tool_calls or None,
+                    ),
+                    finish_reason=choice.finish_reason,
+                )
+            )
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            usage = CompletionUsage(
+                usage.prompt_tokens,
+                usage.completion_tokens,
+                cache_read_tokens=getattr(details, "cached_tokens", None),
+            )
+        return cls(
+            choices=choices or None,
+            usage=usage,
+            model=getattr(response, "model", None) or model,
+            raw=response,
+        )
+
 
-    def __init__(self):
-        self.choices = [Choice()]  # Adjust the range as needed for more choices
+def _arguments(arguments):
+    """Tool call arguments are exposed JSON-encoded, whatever the provider returned."""
+    if arguments is None or isinstance(arguments, str):
+        return arguments
+    return json.dumps(arguments)
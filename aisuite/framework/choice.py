@@ -2,5 +2,9 @@ from aisuite.framework.message import Message
 
 
 class Choice:
-    def __init__(self):
-        self.message = Message()
+    __slots__ = ("index", "message", "finish_reason")
+
+    def __init__(self, index=0, message=None, finish_reason=None):
+        self.index = index
+        self.message = message or Message()
+        self.finish_reason = finish_reason
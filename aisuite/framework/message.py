@@ -1,6 +1,44 @@
 """Interface to hold contents of api responses when they do not conform to the OpenAI style response"""
 
 
+class Function:
+    __slots__ = ("name", "arguments")
+
+    def __init__(self, name=None, arguments=None):
+        self.name = name
+        self.arguments = arguments  # JSON-encoded string, as in OpenAI responses
+
+
+class ToolCall:
+    __slots__ = ("id", "type", "function")
+
+    def __init__(self, id=None, function=None, type="function"):
+        self.id = id
+        self.type = type
+        self.function = function or Function()
+
+
 class Message:
-    def __init__(self):
-        self.content = None
+    __slots__ = ("content", "role", "tool_calls")
+
+    def __init__(self, content=None, role="assistant", tool_calls=None):
+        self.content = content
+        self.role = role
+        self.tool_calls = tool_calls  # list of ToolCall, or None
+
+    def to_dict(self):
+        """Return the message as an OpenAI-style dict, to send it back in a conversation."""
+        message = {"role": self.role, "content": self.content}
+        if self.tool_calls:
+            message["tool_calls"] = [
+                {
+                    "id": call.id,
+                    "type": call.type,
+                    "function": {
+                        "name": call.function.name,
+                        "arguments": call.function.arguments,
+                    },
+                }
+                for call in self.tool_calls
+            ]
+        return message
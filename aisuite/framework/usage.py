@@ -0,0 +1,50 @@
+"""Token usage of a completion, shaped like OpenAI's CompletionUsage."""
+
+
+class CompletionUsage:
+    """
+    prompt_tokens counts the whole prompt, cached or not. Of those, cache_read_tokens
+    were read from the provider's prompt cache and cache_write_tokens were written to
+    it (see aisuite.prompt_caching).
+    """
+
+    __slots__ = (
+        "prompt_tokens",
+        "completion_tokens",
+        "total_tokens",
+        "cache_read_tokens",
+        "cache_write_tokens",
+    )
+
+    def __init__(
+        self,
+        prompt_tokens=0,
+        completion_tokens=0,
+        cache_read_tokens=0,
+        cache_write_tokens=0,
+    ):
+        self.prompt_tokens = prompt_tokens or 0
+        self.completion_tokens = completion_tokens or 0
+        self.total_tokens = self.prompt_tokens + self.completion_tokens
+        self.cache_read_tokens = cache_read_tokens or 0
+        self.cache_write_tokens = cache_write_tokens or 0
+
+    @classmethod
+    def from_dict(cls, usage):
+        """Build from an OpenAI-style "usage" object, or return None if there is none."""
+        if not usage:
+            return None
+        details = usage.get("prompt_tokens_details") or {}
+        return cls(
+            usage.get("prompt_tokens"),
+            usage.get("completion_tokens"),
+            cache_read_tokens=details.get("cached_tokens"),
+        )
+
+    def __repr__(self):
+        return (
+            f"CompletionUsage(prompt_tokens={self.prompt_tokens}, "
+            f"completion_tokens={self.completion_tokens}, "
+            f"cache_read_tokens={self.cache_read_tokens}, "
+            f"cache_write_tokens={self.cache_write_tokens})"
+        )
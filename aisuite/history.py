@@ -0,0 +1,312 @@
+"""
+Conversation history that stays bounded as a chat grows.
+
+A History holds the full list of messages of a conversation, and a policy picks the
+messages actually sent on each turn:
+
+- LastTurns(n): the leading system messages and the last n turns.
+- TokenBudget(max_tokens): the leading system messages and as many of the latest
+  turns as fit in a token budget (by default the model's context window).
+- Summarize(client, model, max_tokens): when the prompt exceeds max_tokens, older
+  turns are folded into a running summary written by a (cheaper) model, which is
+  sent at the end of the system message.
+
+A turn starts with a user message and includes the replies and tool messages that
+follow it, so truncation never separates a tool call from its result. Token counts are
+computed once per message, when first needed, and kept as running totals, so a turn
+does not re-tokenize the whole history.
+
+Conversation ties a History and a policy to a client and model:
+
+    chat = Conversation(client, "openai:gpt-4o", policy=TokenBudget(8000))
+    chat.send("Hello!")
+"""
+
+from . import tokens
+
+SUMMARY_PROMPT = (
+    "You maintain the summary of a conversation between a user and an assistant. "
+    "Update the summary with the new messages. Keep every fact, decision, name and "
+    "open question the assistant may need later, and drop pleasantries. Reply with "
+    "the updated summary only."
+)
+
+
+def _role(message):
+    return tokens._field(message, "role")
+
+
+class History:
+    """
+    The messages of a conversation, with their token counts. Messages are only ever
+    appended; policies read the history and never modify its messages.
+    """
+
+    def __init__(self, messages=None, model=None):
+        """
+        Args:
+            messages (list): Initial messages, e.g. a system message.
+            model (str): The 'provider:model' whose tokenizer counts the tokens (see
+                aisuite.tokens). Without it, tokens are counted approximately.
+        """
+        self.messages = []
+        self.model = model
+        if model and ":" in model:
+            self.provider_key, self.model_name = model.split(":", 1)
+        else:
+            self.provider_key, self.model_name = None, model
+        self._totals = [0]  # _totals[i] is the token count of messages[:i]
+        self.summary = None
+        self.summary_tokens = 0
+        self.summary_end = None  # index of the first message not in the summary
+        self.extend(messages or [])
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def append(self, message):
+        self.messages.append(message)
+
+    def extend(self, messages):
+        self.messages.extend(messages)
+
+    def pop(self):
+        """Remove and return the last message."""
+        message = self.messages.pop()
+        del self._totals[len(self.messages) + 1 :]
+        return message
+
+    @property
+    def tokenizer(self):
+        return tokens.get_tokenizer(self.provider_key, self.model_name)
+
+    def count_tokens(self, start=0, end=None):
+        """Return the token count of messages[start:end], counting new messages once."""
+        end = len(self.messages) if end is None else end
+        if end >= len(self._totals):
+            tokenizer = self.tokenizer
+            for message in self.messages[len(self._totals) - 1 : end]:
+                self._totals.append(
+                    self._totals[-1] + tokens.count_message_tokens(tokenizer, message)
+                )
+        return self._totals[end] - self._totals[start]
+
+    @property
+    def total_tokens(self):
+        """Prompt tokens of the whole history, as sent without a policy."""
+        return tokens.TOKENS_PER_REPLY + self.count_tokens()
+
+    @property
+    def system_end(self):
+        """Index of the first message after the leading system messages."""
+        index = 0
+        while index < len(self.messages) and _role(self.messages[index]) == "system":
+            index += 1
+        return index
+
+    def turn_starts(self, start=None):
+        """Return the index where each turn begins, from start (the system end)."""
+        start = self.system_end if start is None else start
+        starts = [
+            index
+            for index in range(start, len(self.messages))
+            if _role(self.messages[index]) == "user"
+        ]
+        if start < len(self.messages) and (not starts or starts[0] != start):
+            # Messages before the first user message belong to the first turn.
+            starts.insert(0, start)
+        return starts
+
+    def window(self, start):
+        """Return the leading system messages, the summary and messages[start:]."""
+        system = self.messages[: self.system_end]
+        if self.summary:
+            system = _with_summary(system, self.summary)
+        return system + self.messages[start:]
+
+    def window_tokens(self, start):
+        """Return the prompt tokens of window(start), without re-tokenizing it."""
+        return (
+            tokens.TOKENS_PER_REPLY
+            + self.count_tokens(0, self.system_end)
+            + self.summary_tokens
+            + (tokens.TOKENS_PER_MESSAGE if self.summary and not self.system_end else 0)
+            + self.count_tokens(start)
+        )
+
+
+def _with_summary(system, summary):
+    """Return the system messages with the summary appended to the first one."""
+    text = f"Summary of the earlier conversation:\n{summary}"
+    if not system:
+        return [{"role": "system", "content": text}]
+    first = dict(system[0])
+    content = first.get("content")
+    if isinstance(content, list):
+        first["content"] = content + [{"type": "text", "text": text}]
+    else:
+        first["content"] = f"{content}\n\n{text}" if content else text
+    return [first] + system[1:]
+
+
+class LastTurns:
+    """Send the leading system messages and the last n turns."""
+
+    def __init__(self, n):
+        self.n = n
+
+    def apply(self, history):
+        starts = history.turn_starts()
+        if len(starts) <= self.n:
+            return list(history.messages)
+        return history.window(starts[-self.n] if self.n else len(history))
+
+
+class TokenBudget:
+    """
+    Send the leading system messages and as many of the latest turns as fit in
+    max_tokens. The last turn is always sent, even when it alone exceeds the budget.
+    """
+
+    def __init__(self, max_tokens=None, reserve=1024):
+        """
+        Args:
+            max_tokens (int): Prompt token budget. Defaults to the model's context
+                window (see aisuite.tokens.CONTEXT_WINDOWS) minus reserve.
+            reserve (int): Tokens left for the reply when max_tokens is not given.
+        """
+        self.max_tokens = max_tokens
+        self.reserve = reserve
+
+    def budget(self, history):
+        if self.max_tokens is not None:
+            return self.max_tokens
+        window = tokens.context_window(history.provider_key, history.model_name)
+        return None if window is None else window - self.reserve
+
+    def apply(self, history):
+        budget = self.budget(history)
+        if budget is None:
+            return list(history.messages)
+        starts = history.turn_starts()
+        for start in starts[:-1]:
+            if history.window_tokens(start) <= budget:
+                return history.window(start)
+        return history.window(starts[-1] if starts else len(history))
+
+
+class Summarize:
+    """
+    When the prompt exceeds max_tokens, fold all but the last keep_turns turns into a
+    running summary written by model, and send the summary in their place. Each fold
+    only summarizes the previous summary and the newly folded turns, and happens only
+    when the budget is exceeded again, so most turns make no summarization call.
+    """
+
+    def __init__(
+        self, client, model, max_tokens, keep_turns=2, prompt=SUMMARY_PROMPT, **kwargs
+    ):
+        """
+        Args:
+            client (aisuite.Client): Client used for the summarization calls.
+            model (str): The 'provider:model' writing the summaries, typically a small,
+                cheap model.
+            max_tokens (int): Prompt token budget that triggers a fold.
+            keep_turns (int): Latest turns always sent verbatim.
+            prompt (str): System prompt of the summarization calls.
+            **kwargs: Extra arguments of the summarization calls, e.g. max_tokens.
+        """
+        self.client = client
+        self.model = model
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.prompt = prompt
+        self.kwargs = kwargs
+
+    def apply(self, history):
+        if history.summary_end is None:
+            history.summary_end = history.system_end
+        if history.window_tokens(history.summary_end) > self.max_tokens:
+            starts = history.turn_starts(history.summary_end)
+            if len(starts) > self.keep_turns:
+                end = starts[-self.keep_turns] if self.keep_turns else len(history)
+                self.fold(history, end)
+        return history.window(history.summary_end)
+
+    def fold(self, history, end):
+        """Summarize the previous summary and messages[summary_end:end]."""
+        transcript = "\n".join(
+            f"{_role(message)}: {tokens._message_text(message)}"
+            for message in history.messages[history.summary_end : end]
+        )
+        if history.summary:
+            transcript = (
+                f"Summary so far:\n{history.summary}\n\nNew messages:\n{transcript}"
+            )
+        response = self.client.chat.completions.create(
+            self.model,
+            [
+                {"role": "system", "content": self.prompt},
+                {"role": "user", "content": transcript},
+            ],
+            **self.kwargs,
+        )
+        history.summary = response.choices[0].message.content
+        history.summary_tokens = history.tokenizer.count(history.summary)
+        history.summary_end = end
+
+
+class Conversation:
+    """
+    A chat session: keeps the history, applies the policy before each request and
+    records the replies.
+    """
+
+    def __init__(self, client, model, policy=None, system=None, messages=None):
+        """
+        Args:
+            client (aisuite.Client): Client used for the requests.
+            model (str): The 'provider:model' of the conversation.
+            policy: LastTurns, TokenBudget, Summarize or any object with an
+                apply(history) method returning the messages to send. Without one,
+                the whole history is sent.
+            system (str): Optional system message.
+            messages (list): Optional earlier messages to resume from.
+        """
+        self.client = client
+        self.model = model
+        self.policy = policy
+        initial = [{"role": "system", "content": system}] if system else []
+        self.history = History(initial + list(messages or []), model=model)
+
+    @property
+    def messages(self):
+        """The full history."""
+        return self.history.messages
+
+    def prepare(self):
+        """Return the messages the next request will send."""
+        if self.policy is None:
+            return list(self.history.messages)
+        return self.policy.apply(self.history)
+
+    def send(self, content, **kwargs):
+        """
+        Append a user message (a string, or a message dict), send the conversation
+        and append the reply. Returns the ChatCompletionResponse.
+        """
+        if isinstance(content, str):
+            content = {"role": "user", "content": content}
+        self.history.append(content)
+        try:
+            response = self.client.chat.completions.create(
+                self.model, self.prepare(), **kwargs
+            )
+        except Exception:
+            self.history.pop()
+            raise
+        self.history.append(response.choices[0].message.to_dict())
+        return response
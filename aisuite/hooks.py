@@ -0,0 +1,147 @@
+"""Instrumentation hooks called around every provider request made by a Client."""
+
+import time
+
+from .framework import CompletionUsage
+
+
+class RequestContext:
+    """
+    State of one provider request, shared by all the hook calls about it.
+
+    Hooks may attach their own attributes to it, e.g. to carry a tracing span from
+    before_request to after_response.
+    """
+
+    def __init__(self, provider_key, model_name, messages, kwargs):
+        self.provider_key = provider_key
+        self.model_name = model_name
+        self.messages = messages
+        self.kwargs = kwargs
+        self.stream = bool(kwargs.get("stream"))
+        self.started_at = time.monotonic()
+        self.first_chunk_at = None
+        self.finished_at = None
+        self.usage = None
+
+    @property
+    def latency(self):
+        """Seconds from sending the request to the full response (or the error)."""
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def time_to_first_token(self):
+        """Seconds from sending a streamed request to its first chunk."""
+        if self.first_chunk_at is None:
+            return None
+        return self.first_chunk_at - self.started_at
+
+
+class Hook:
+    """
+    Base class for instrumentation hooks; override the methods of interest.
+
+    before_request is called before a request is sent to the provider (cache hits
+    are not sent, so they are not observed), then either after_response or on_error.
+    For streams, on_chunk is called for every chunk and after_response with
+    response=None once the stream is exhausted, or closed before its end. Retries of
+    one request are not reported separately. Requests coalesced into an identical
+    request in flight are not sent either; on_coalesced is called for them instead.
+    Exceptions raised by hooks propagate to the caller.
+    """
+
+    def before_request(self, context):
+        pass
+
+    def after_response(self, context, response):
+        pass
+
+    def on_error(self, context, error):
+        pass
+
+    def on_chunk(self, context, chunk):
+        pass
+
+    def on_coalesced(self, context):
+        pass
+
+
+def _merge_usage(current, usage):
+    """Stream chunks report running totals: keep the largest counts seen."""
+    if current is None:
+        current = CompletionUsage()
+    return CompletionUsage(
+        max(current.prompt_tokens, usage.prompt_tokens),
+        max(current.completion_tokens, usage.completion_tokens),
+        max(current.cache_read_tokens, usage.cache_read_tokens),
+        max(current.cache_write_tokens, usage.cache_write_tokens),
+    )
+
+
+def start_request(hooks, provider_key, model_name, messages, kwargs):
+    context = RequestContext(provider_key, model_name, messages, kwargs)
+    for hook in hooks:
+        hook.before_request(context)
+    return context
+
+
+def join_request(hooks, provider_key, model_name, messages, kwargs):
+    context = RequestContext(provider_key, model_name, messages, kwargs)
+    for hook in hooks:
+        hook.on_coalesced(context)
+
+
+def finish_request(hooks, context, response):
+    context.finished_at = time.monotonic()
+    if response is not None:
+        context.usage = getattr(response, "usage", None)
+    for hook in hooks:
+        hook.after_response(context, response)
+
+
+def fail_request(hooks, context, error):
+    context.finished_at = time.monotonic()
+    for hook in hooks:
+        hook.on_error(context, error)
+
+
+def _observe_chunk(hooks, context, chunk):
+    if context.first_chunk_at is None:
+        context.first_chunk_at = time.monotonic()
+    if getattr(chunk, "usage", None) is not None:
+        context.usage = _merge_usage(context.usage, chunk.usage)
+    for hook in hooks:
+        hook.on_chunk(context, chunk)
+
+
+def observe_stream(hooks, context, stream):
+    """
+    Pass a stream through, reporting its chunks, end and failure to the hooks. A
+    stream the caller stops reading is reported as finished when it is closed.
+    """
+    try:
+        for chunk in stream:
+            _observe_chunk(hooks, context, chunk)
+            yield chunk
+    except Exception as e:
+        fail_request(hooks, context, e)
+        raise
+    finally:
+        if context.finished_at is None:
+            finish_request(hooks, context, None)
+
+
+async def aobserve_stream(hooks, context, stream):
+    """Async variant of observe_stream()."""
+    try:
+        async for chunk in stream:
+            _observe_chunk(hooks, context, chunk)
+            yield chunk
+    except Exception as e:
+        fail_request(hooks, context, e)
+        raise
+    finally:
+        if context.finished_at is None:
+            finish_request(hooks, context, None)
@@ -0,0 +1,264 @@
+import asyncio
+from contextlib import contextmanager
+import threading
+import weakref
+
+import httpx
+
+from aisuite import codec
+from aisuite.provider import (
+    LLMError,
+    APITimeoutError,
+    APIConnectionError,
+    error_from_status,
+)
+
+# Provider config keys that tune the connection pool rather than the provider itself.
+HTTP_CONFIG_KEYS = (
+    "timeout",
+    "max_connections",
+    "max_keepalive_connections",
+    "keepalive_expiry",
+    "http2",
+)
+
+
+class HttpClient:
+    """
+    Long-lived httpx clients shared by all calls made through one provider instance,
+    so TCP/TLS connections are kept alive and reused instead of being set up per request.
+
+    The sync client is created on first use. httpx connections cannot be shared across
+    event loops, so one async client is created per event loop, on first use within
+    it; the clients of closed loops are dropped.
+    """
+
+    def __init__(
+        self,
+        timeout=30,
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=5.0,
+        http2=False,
+    ):
+        """
+        Args:
+            timeout (float): Request timeout in seconds.
+            max_connections (int): Maximum number of concurrent connections.
+            max_keepalive_connections (int): Maximum number of idle connections kept in the pool.
+            keepalive_expiry (float): Seconds an idle connection is kept before being closed.
+            http2 (bool): Enable HTTP/2. Requires the `h2` package (`pip install httpx[http2]`).
+        """
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self._client = None
+        self._async_clients = weakref.WeakKeyDictionary()  # by event loop
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """Create an HttpClient from the pool-related keys of a provider config."""
+        return cls(**{key: config[key] for key in HTTP_CONFIG_KEYS if key in config})
+
+    @property
+    def client(self) -> httpx.Client:
+        """Return the pooled sync client, creating it on first use."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        timeout=self.timeout, limits=self.limits, http2=self.http2
+                    )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            with self._lock:
+                client = self._async_clients.get(loop)
+                if client is None:
+                    # The clients of closed loops can neither be used nor closed.
+                    for closed in [l for l in self._async_clients if l.is_closed()]:
+                        del self._async_clients[closed]
+                    client = self._async_clients[loop] = httpx.AsyncClient(
+                        timeout=self.timeout, limits=self.limits, http2=self.http2
+                    )
+        return client
+
+    def post_json(self, url, data, **kwargs):
+        """
+        POST data as JSON and return the decoded JSON body, raising on error statuses.
+        Both directions go through the codec module, so orjson or msgspec is used when
+        installed.
+        """
+        response = self.client.post(url, **_encode_json(data, kwargs))
+        response.raise_for_status()
+        return codec.loads(response.content)
+
+    def get_json(self, url, **kwargs):
+        """GET url and return the decoded JSON body, raising on error statuses."""
+        response = self.client.get(url, **kwargs)
+        response.raise_for_status()
+        return codec.loads(response.content)
+
+    async def apost_json(self, url, data, **kwargs):
+        """Async variant of post_json()."""
+        response = await self.async_client.post(url, **_encode_json(data, kwargs))
+        response.raise_for_status()
+        return codec.loads(response.content)
+
+    def open_stream(self, url, **kwargs):
+        """
+        POST a request and return the response with its body left unread, for streaming.
+        Error responses are read and closed here so the status error is raised immediately,
+        before the caller starts iterating.
+        """
+        if "json" in kwargs:
+            kwargs = _encode_json(kwargs.pop("json"), kwargs)
+        request = self.client.build_request("POST", url, **kwargs)
+        response = self.client.send(request, stream=True)
+        if response.is_error:
+            response.read()
+            response.close()
+            response.raise_for_status()
+        return response
+
+    async def aopen_stream(self, url, **kwargs):
+        """Async variant of open_stream()."""
+        if "json" in kwargs:
+            kwargs = _encode_json(kwargs.pop("json"), kwargs)
+        client = self.async_client
+        request = client.build_request("POST", url, **kwargs)
+        response = await client.send(request, stream=True)
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+        return response
+
+    def close(self):
+        """Close the sync connection pool."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self):
+        """
+        Close the sync and async connection pools. The async clients of other running
+        event loops are closed on their loops.
+        """
+        self.close()
+        with self._lock:
+            clients = dict(self._async_clients)
+            self._async_clients.clear()
+        running = asyncio.get_running_loop()
+        for loop, client in clients.items():
+            if loop is running:
+                await client.aclose()
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+
+def _encode_json(data, kwargs):
+    """Return the request kwargs with data encoded as the JSON body."""
+    headers = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+    return {**kwargs, "content": codec.dumps(data), "headers": headers}
+
+
+@contextmanager
+def translate_httpx_errors(label, provider, connect_error_message=None):
+    """
+    Re-raise httpx errors as the matching LLMError subclass, so callers can tell
+    retryable failures (429, 5xx, timeouts, connection errors) from fatal ones.
+
+    Args:
+        label (str): Human readable provider name used in error messages.
+        provider (str): Provider key recorded on the raised error.
+        connect_error_message (str): Optional hint appended to connection errors.
+    """
+    try:
+        yield
+    except LLMError:
+        raise
+    except httpx.HTTPStatusError as http_err:
+        response = http_err.response
+        message = f"{label} request failed: {http_err}"
+        if response.is_stream_consumed and response.text:
+            message += f"\n{response.text}"
+        raise error_from_status(
+            response.status_code, message, response.headers, provider
+        ) from http_err
+    except httpx.TimeoutException as e:
+        raise APITimeoutError(
+            f"{label} request timed out: {e}", provider=provider
+        ) from e
+    except httpx.TransportError as e:
+        message = connect_error_message or f"{label} connection failed: {e}"
+        raise APIConnectionError(message, provider=provider) from e
+    except Exception as e:
+        raise LLMError(f"An error occurred: {e}", provider=provider) from e
+
+
+def _parse_sse_line(line):
+    """Return the JSON payload of an SSE data line, None for other lines, or False at [DONE]."""
+    if not line.startswith("data:"):
+        return None
+    data = line[len("data:") :].strip()
+    if data == "[DONE]":
+        return False
+    return codec.loads(data)
+
+
+def iter_sse(response: httpx.Response):
+    """Yield the decoded JSON payloads of a Server-Sent Events response, then close it."""
+    try:
+        for line in response.iter_lines():
+            payload = _parse_sse_line(line)
+            if payload is False:
+                break
+            if payload is not None:
+                yield payload
+    finally:
+        response.close()
+
+
+async def aiter_sse(response: httpx.Response):
+    """Async variant of iter_sse()."""
+    try:
+        async for line in response.aiter_lines():
+            payload = _parse_sse_line(line)
+            if payload is False:
+                break
+            if payload is not None:
+                yield payload
+    finally:
+        await response.aclose()
+
+
+def iter_ndjson(response: httpx.Response):
+    """Yield the decoded objects of a newline-delimited JSON response, then close it."""
+    try:
+        for line in response.iter_lines():
+            if line.strip():
+                yield codec.loads(line)
+    finally:
+        response.close()
+
+
+async def aiter_ndjson(response: httpx.Response):
+    """Async variant of iter_ndjson()."""
+    try:
+        async for line in response.aiter_lines():
+            if line.strip():
+                yield codec.loads(line)
+    finally:
+        await response.aclose()
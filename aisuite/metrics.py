@@ -0,0 +1,307 @@
+"""Built-in metrics hook with Prometheus and OpenTelemetry-style exports."""
+
+import threading
+import time
+
+from .hooks import Hook
+
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as used by Prometheus and OTLP."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Series:
+    """Everything recorded for one provider:model pair."""
+
+    def __init__(self, buckets):
+        self.requests = 0
+        self.latency = Histogram(buckets)
+        self.time_to_first_token = Histogram(buckets)
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.errors = {}  # error class name -> count
+        self.coalesced = 0
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _format_bound(bound):
+    return repr(float(bound))
+
+
+class MetricsCollector(Hook):
+    """
+    Records per provider and model: request count, latency and time-to-first-token
+    histograms, prompt/completion and prompt cache read/write token counts, error
+    counts by error type and the number of requests coalesced into identical ones in
+    flight (which are not counted as requests).
+
+        metrics = MetricsCollector()
+        client = ai.Client(hooks=[metrics])
+        ...
+        print(metrics.to_prometheus())
+
+    Latency covers the whole request (retries included, the full stream for streamed
+    requests) and is recorded for successful requests only. Token counts are recorded
+    when the provider reports usage.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        Args:
+            buckets (tuple): Upper bounds in seconds of the histogram buckets.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # (provider, model) -> _Series
+        self._lock = threading.Lock()
+
+    def _get_series(self, context):
+        key = (context.provider_key, context.model_name)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series(self.buckets)
+        return series
+
+    def after_response(self, context, response):
+        with self._lock:
+            series = self._get_series(context)
+            series.requests += 1
+            series.latency.observe(context.latency)
+            if context.time_to_first_token is not None:
+                series.time_to_first_token.observe(context.time_to_first_token)
+            if context.usage is not None:
+                series.prompt_tokens += context.usage.prompt_tokens
+                series.completion_tokens += context.usage.completion_tokens
+                series.cache_read_tokens += context.usage.cache_read_tokens
+                series.cache_write_tokens += context.usage.cache_write_tokens
+
+    def on_error(self, context, error):
+        with self._lock:
+            series = self._get_series(context)
+            series.requests += 1
+            name = type(error).__name__
+            series.errors[name] = series.errors.get(name, 0) + 1
+
+    def on_coalesced(self, context):
+        with self._lock:
+            self._get_series(context).coalesced += 1
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+    def to_prometheus(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        with self._lock:
+            series = sorted(self._series.items())
+            lines = []
+
+            def header(name, kind, help_text):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+            header("aisuite_requests_total", "counter", "Provider requests.")
+            for (provider, model), s in series:
+                labels = _labels(provider=provider, model=model)
+                lines.append(f"aisuite_requests_total{{{labels}}} {s.requests}")
+
+            header("aisuite_errors_total", "counter", "Failed provider requests.")
+            for (provider, model), s in series:
+                for error, count in sorted(s.errors.items()):
+                    labels = _labels(provider=provider, model=model, error=error)
+                    lines.append(f"aisuite_errors_total{{{labels}}} {count}")
+
+            for name, attribute, help_text in (
+                ("aisuite_prompt_tokens_total", "prompt_tokens", "Prompt tokens."),
+                (
+                    "aisuite_completion_tokens_total",
+                    "completion_tokens",
+                    "Completion tokens.",
+                ),
+                (
+                    "aisuite_cache_read_tokens_total",
+                    "cache_read_tokens",
+                    "Prompt tokens read from the provider's prompt cache.",
+                ),
+                (
+                    "aisuite_cache_write_tokens_total",
+                    "cache_write_tokens",
+                    "Prompt tokens written to the provider's prompt cache.",
+                ),
+                (
+                    "aisuite_coalesced_requests_total",
+                    "coalesced",
+                    "Requests coalesced into an identical request in flight.",
+                ),
+            ):
+                header(name, "counter", help_text)
+                for (provider, model), s in series:
+                    labels = _labels(provider=provider, model=model)
+                    lines.append(f"{name}{{{labels}}} {getattr(s, attribute)}")
+
+            for name, attribute, help_text in (
+                (
+                    "aisuite_request_duration_seconds",
+                    "latency",
+                    "Latency of successful requests.",
+                ),
+                (
+                    "aisuite_time_to_first_token_seconds",
+                    "time_to_first_token",
+                    "Time to the first chunk of streamed requests.",
+                ),
+            ):
+                header(name, "histogram", help_text)
+                for (provider, model), s in series:
+                    histogram = getattr(s, attribute)
+                    cumulative = 0
+                    for bound, count in zip(
+                        histogram.buckets + ("+Inf",), histogram.counts
+                    ):
+                        cumulative += count
+                        le = bound if bound == "+Inf" else _format_bound(bound)
+                        labels = _labels(provider=provider, model=model, le=le)
+                        lines.append(f"{name}_bucket{{{labels}}} {cumulative}")
+                    labels = _labels(provider=provider, model=model)
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """
+        Return the metrics as a dict following the OTLP JSON metrics data model
+        (cumulative sums and explicit-bucket histograms), ready to be serialized or
+        handed to an OpenTelemetry exporter.
+        """
+        now = time.time_ns()
+
+        def sum_metric(name, unit, points):
+            return {
+                "name": name,
+                "unit": unit,
+                "sum": {
+                    "dataPoints": points,
+                    "aggregationTemporality": "AGGREGATION_TEMPORALITY_CUMULATIVE",
+                    "isMonotonic": True,
+                },
+            }
+
+        def attributes(**labels):
+            return [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in labels.items()
+            ]
+
+        def histogram_points(attribute):
+            points = []
+            for (provider, model), s in series:
+                histogram = getattr(s, attribute)
+                points.append(
+                    {
+                        "attributes": attributes(provider=provider, model=model),
+                        "timeUnixNano": now,
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "bucketCounts": list(histogram.counts),
+                        "explicitBounds": list(histogram.buckets),
+                    }
+                )
+            return points
+
+        def counter_points(attribute):
+            return [
+                {
+                    "attributes": attributes(provider=provider, model=model),
+                    "timeUnixNano": now,
+                    "asInt": getattr(s, attribute),
+                }
+                for (provider, model), s in series
+            ]
+
+        with self._lock:
+            series = sorted(self._series.items())
+            error_points = [
+                {
+                    "attributes": attributes(
+                        provider=provider, model=model, error=error
+                    ),
+                    "timeUnixNano": now,
+                    "asInt": count,
+                }
+                for (provider, model), s in series
+                for error, count in sorted(s.errors.items())
+            ]
+            metrics = [
+                sum_metric("aisuite.requests", "{request}", counter_points("requests")),
+                sum_metric("aisuite.errors", "{request}", error_points),
+                sum_metric(
+                    "aisuite.prompt_tokens", "{token}", counter_points("prompt_tokens")
+                ),
+                sum_metric(
+                    "aisuite.completion_tokens",
+                    "{token}",
+                    counter_points("completion_tokens"),
+                ),
+                sum_metric(
+                    "aisuite.cache_read_tokens",
+                    "{token}",
+                    counter_points("cache_read_tokens"),
+                ),
+                sum_metric(
+                    "aisuite.cache_write_tokens",
+                    "{token}",
+                    counter_points("cache_write_tokens"),
+                ),
+                sum_metric(
+                    "aisuite.coalesced_requests",
+                    "{request}",
+                    counter_points("coalesced"),
+                ),
+                {
+                    "name": "aisuite.request.duration",
+                    "unit": "s",
+                    "histogram": {
+                        "dataPoints": histogram_points("latency"),
+                        "aggregationTemporality": "AGGREGATION_TEMPORALITY_CUMULATIVE",
+                    },
+                },
+                {
+                    "name": "aisuite.time_to_first_token",
+                    "unit": "s",
+                    "histogram": {
+                        "dataPoints": histogram_points("time_to_first_token"),
+                        "aggregationTemporality": "AGGREGATION_TEMPORALITY_CUMULATIVE",
+                    },
+                },
+            ]
+        return {
+            "resourceMetrics": [
+                {"scopeMetrics": [{"scope": {"name": "aisuite"}, "metrics": metrics}]}
+            ]
+        }
@@ -0,0 +1,39 @@
+"""
+Provider-neutral prompt caching breakpoints.
+
+Mark a message with "cache": True to let providers with prompt caching cache the
+prompt prefix ending with that message, e.g. a long system prompt or document:
+
+    messages = [
+        {"role": "system", "content": long_instructions, "cache": True},
+        {"role": "user", "content": question},
+    ]
+
+Anthropic receives the mark as a cache_control breakpoint and Bedrock as a cache
+point. The mark is removed for other providers. Tokens read from and written to
+the cache are reported as usage.cache_read_tokens and usage.cache_write_tokens.
+"""
+
+CACHE_MARKER = "cache"
+
+
+def is_cache_breakpoint(message):
+    return bool(message.get(CACHE_MARKER))
+
+
+def has_cache_markers(messages):
+    return any(CACHE_MARKER in message for message in messages)
+
+
+def strip_cache_markers(messages):
+    """Return the messages without their cache marks, for providers without caching."""
+    if not has_cache_markers(messages):
+        return messages
+    return [
+        (
+            {k: v for k, v in message.items() if k != CACHE_MARKER}
+            if CACHE_MARKER in message
+            else message
+        )
+        for message in messages
+    ]
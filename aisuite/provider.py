@@ -1,53 +1,392 @@
 from abc import ABC, abstractmethod
-from pathlib import Path
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
 import importlib
+import asyncio
 import os
 import functools
+import json
+import threading
+import time
 
 
 class LLMError(Exception):
     """Custom exception for LLM errors."""
 
-    def __init__(self, message):
+    # Whether repeating the same request may succeed.
+    retryable = False
+
+    def __init__(self, message, status_code=None, retry_after=None, provider=None):
         super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.provider = provider
+
+
+class RateLimitError(LLMError):
+    """The provider rejected the request because a rate limit or quota was hit (429)."""
+
+    retryable = True
+
+
+class OverloadedError(LLMError):
+    """The provider is temporarily unavailable or overloaded (5xx, Anthropic 529)."""
+
+    retryable = True
+
+
+class APITimeoutError(LLMError):
+    """The request timed out before the provider responded."""
+
+    retryable = True
+
+
+class APIConnectionError(LLMError):
+    """The provider could not be reached."""
+
+    retryable = True
+
+
+class AuthenticationError(LLMError):
+    """The credentials were missing, invalid or lack permission (401, 403)."""
+
+
+class BadRequestError(LLMError):
+    """The request was rejected as invalid (400, 404, 413, 422); retrying will not help."""
+
+
+class ContextWindowExceededError(BadRequestError):
+    """The prompt and max_tokens do not fit the model's context window."""
+
+
+def parse_retry_after(headers):
+    """
+    Return the delay in seconds requested by Retry-After / retry-after-ms headers, or None.
+    Retry-After may be a number of seconds or an HTTP date.
+    """
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def error_from_status(status_code, message, headers=None, provider=None):
+    """Build the LLMError subclass matching an HTTP status code."""
+    if status_code == 429:
+        error_class = RateLimitError
+    elif status_code in (401, 403):
+        error_class = AuthenticationError
+    elif status_code in (408, 504):
+        error_class = APITimeoutError
+    elif status_code >= 500:
+        error_class = OverloadedError
+    elif status_code >= 400:
+        error_class = BadRequestError
+    else:
+        error_class = LLMError
+    return error_class(
+        message,
+        status_code=status_code,
+        retry_after=parse_retry_after(headers),
+        provider=provider,
+    )
+
+
+@contextmanager
+def translate_sdk_errors(sdk, provider):
+    """
+    Re-raise exceptions from OpenAI-style SDKs (openai, anthropic, groq share the same
+    exception classes) as LLMError subclasses. The original exception is chained.
+    """
+    try:
+        yield
+    except sdk.APITimeoutError as e:
+        raise APITimeoutError(str(e), provider=provider) from e
+    except sdk.APIConnectionError as e:
+        raise APIConnectionError(str(e), provider=provider) from e
+    except sdk.APIStatusError as e:
+        raise error_from_status(
+            e.status_code, str(e), e.response.headers, provider
+        ) from e
+
+
+def normalize_stream(stream, normalize, errors):
+    """
+    Yield normalize(item) for the items of an SDK stream, skipping the items normalized
+    to None. Errors raised while iterating are translated by the errors context manager
+    (e.g. translate_sdk_errors(...)), like those of the request that opened the stream.
+    """
+    with errors:
+        for item in stream:
+            chunk = normalize(item)
+            if chunk is not None:
+                yield chunk
+
+
+async def anormalize_stream(stream, normalize, errors):
+    """Async variant of normalize_stream(), for the streams of async SDK clients."""
+    with errors:
+        async for item in stream:
+            chunk = normalize(item)
+            if chunk is not None:
+                yield chunk
+
+
+async def iterate_in_thread(iterator):
+    """Expose a blocking iterator (e.g. a sync stream of chunks) as an async iterator."""
+    sentinel = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, sentinel)
+        if item is sentinel:
+            break
+        yield item
+
+
+_MISSING = object()
+
+
+class locked_cached_property(functools.cached_property):
+    """
+    cached_property computed at most once per instance even when first accessed from
+    several threads at once (functools.cached_property stopped locking in Python
+    3.12), so an SDK client or connection pool is never built twice and leaked.
+    """
+
+    def __init__(self, func):
+        super().__init__(func)
+        self.lock = threading.Lock()
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        cache = instance.__dict__
+        value = cache.get(self.attrname, _MISSING)
+        if value is _MISSING:
+            with self.lock:
+                value = cache.get(self.attrname, _MISSING)
+                if value is _MISSING:
+                    value = cache[self.attrname] = self.func(instance)
+        return value
+
+
+class KeyedLocks:
+    """One lock per key, so work on one key does not wait for work on the others."""
+
+    def __init__(self):
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, key):
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
 
 
 class Provider(ABC):
+    # Whether the provider returns n choices for n > 1 itself. When it does not, the
+    # client makes n concurrent calls and merges their choices.
+    supports_n = False
+    # Whether the provider understands the message marks of aisuite.prompt_caching.
+    # They are removed from the messages sent to the other providers.
+    supports_cache_markers = False
+
     @abstractmethod
     def chat_completions_create(self, model, messages):
         """Abstract method for chat completion calls, to be implemented by each provider."""
         pass
 
+    async def achat_completions_create(self, model, messages, **kwargs):
+        """
+        Async chat completion call. Providers with a native async transport override this;
+        the default runs the blocking implementation in a worker thread.
+        """
+        response = await asyncio.to_thread(
+            self.chat_completions_create, model, messages, **kwargs
+        )
+        if kwargs.get("stream"):
+            return iterate_in_thread(response)
+        return response
+
+    def close(self):
+        """Release network resources (connection pools, SDK clients) held by the provider."""
+        pass
+
+    async def aclose(self):
+        """Async variant of close(), for providers holding async connection pools."""
+        self.close()
+
+
+# Built-in providers, keyed by the provider part of "provider:model". Kept static so
+# that resolving a provider needs neither a directory scan nor importing its module.
+BUILTIN_PROVIDERS = {
+    "anthropic": "aisuite.providers.anthropic_provider:AnthropicProvider",
+    "aws": "aisuite.providers.aws_provider:AwsProvider",
+    "azure": "aisuite.providers.azure_provider:AzureProvider",
+    "fireworks": "aisuite.providers.fireworks_provider:FireworksProvider",
+    "google": "aisuite.providers.google_provider:GoogleProvider",
+    "groq": "aisuite.providers.groq_provider:GroqProvider",
+    "huggingface": "aisuite.providers.huggingface_provider:HuggingfaceProvider",
+    "mistral": "aisuite.providers.mistral_provider:MistralProvider",
+    "ollama": "aisuite.providers.ollama_provider:OllamaProvider",
+    "openai": "aisuite.providers.openai_provider:OpenaiProvider",
+    "openai_compatible": "aisuite.providers.openai_compatible_provider:OpenaiCompatibleProvider",
+    "together": "aisuite.providers.together_provider:TogetherProvider",
+}
+
+# Entry point group through which installed packages can add providers, e.g. in
+# pyproject.toml: [project.entry-points."aisuite.providers"] acme = "acme_ai:AcmeProvider"
+ENTRY_POINT_GROUP = "aisuite.providers"
+
 
 class ProviderFactory:
-    """Factory to dynamically load provider instances based on naming conventions."""
+    """
+    Factory to lazily load provider instances.
 
-    PROVIDERS_DIR = Path(__file__).parent / "providers"
+    Providers are resolved from the built-in registry, then from providers registered
+    with register_provider(), then from the "aisuite.providers" entry points of the
+    installed packages. Provider modules (and the SDKs they use) are only imported
+    when a provider is first created.
+    """
+
+    _registry = dict(BUILTIN_PROVIDERS)
+    # Providers shared by all clients, keyed by provider type and normalized config.
+    _shared = {}
+    _shared_locks = KeyedLocks()
 
     @classmethod
-    def create_provider(cls, provider_key, config):
-        """Dynamically load and create an instance of a provider based on the naming convention."""
-        # Convert provider_key to the expected module and class names
-        provider_class_name = f"{provider_key.capitalize()}Provider"
-        provider_module_name = f"{provider_key}_provider"
+    def register_provider(cls, provider_key, provider_class):
+        """
+        Register a provider under provider_key, given as a class or as a
+        "module:ClassName" string that is imported on first use.
+        """
+        cls._registry[provider_key] = provider_class
+        cls.get_supported_providers.cache_clear()
 
-        module_path = f"aisuite.providers.{provider_module_name}"
+    @classmethod
+    def unregister_provider(cls, provider_key):
+        """
+        Remove a provider registered with register_provider(). A built-in provider
+        registered over is restored.
+        """
+        if provider_key in BUILTIN_PROVIDERS:
+            cls._registry[provider_key] = BUILTIN_PROVIDERS[provider_key]
+        else:
+            cls._registry.pop(provider_key, None)
+        cls.get_supported_providers.cache_clear()
 
-        # Lazily load the module
-        try:
-            module = importlib.import_module(module_path)
-        except ImportError as e:
-            raise ImportError(
-                f"Could not import module {module_path}: {str(e)}. Please ensure the provider is supported by doing ProviderFactory.get_supported_providers()"
+    @classmethod
+    @functools.cache
+    def _entry_points(cls):
+        """Providers advertised by installed packages, read once per process."""
+        from importlib.metadata import entry_points
+
+        return {ep.name: ep.value for ep in entry_points(group=ENTRY_POINT_GROUP)}
+
+    @classmethod
+    def _resolve(cls, provider_key):
+        target = cls._registry.get(provider_key)
+        if target is None:
+            target = cls._entry_points().get(provider_key)
+        return target
+
+    @classmethod
+    def create_provider(cls, provider_key, config):
+        """Import (on first use) and create an instance of the provider for provider_key."""
+        target = cls._resolve(provider_key)
+        if target is None:
+            raise ValueError(
+                f"Invalid provider key '{provider_key}'. Supported providers: "
+                f"{cls.get_supported_providers()}."
             )
+        if isinstance(target, str):
+            module_path, _, class_name = target.partition(":")
+            try:
+                module = importlib.import_module(module_path)
+            except ImportError as e:
+                raise ImportError(
+                    f"Could not import module {module_path}: {str(e)}. Please ensure the provider is supported by doing ProviderFactory.get_supported_providers()"
+                )
+            target = getattr(module, class_name)
+
+        return target(**config)
 
-        # Instantiate the provider class
-        provider_class = getattr(module, provider_class_name)
-        return provider_class(**config)
+    @classmethod
+    def shared_provider(cls, provider_key, config):
+        """
+        Return the process-wide instance of the provider for provider_key and config,
+        creating it on first use. Clients with equal configs thus share the provider's
+        SDK clients and connection pools.
+        """
+        key = (provider_key, _config_key(config))
+        provider = cls._shared.get(key)
+        if provider is None:
+            with cls._shared_locks(key):
+                provider = cls._shared.get(key)
+                if provider is None:
+                    provider = cls._shared[key] = cls.create_provider(
+                        provider_key, config
+                    )
+        return provider
+
+    @classmethod
+    def close_shared_providers(cls):
+        """
+        Close and forget the shared providers, e.g. at application shutdown. Only
+        their sync clients are closed; asyncio applications should await
+        aclose_shared_providers() instead.
+        """
+        shared, cls._shared = cls._shared, {}
+        for provider in shared.values():
+            if hasattr(provider, "close"):
+                provider.close()
+
+    @classmethod
+    async def aclose_shared_providers(cls):
+        """Close and forget the shared providers, including their async clients."""
+        shared, cls._shared = cls._shared, {}
+        for provider in shared.values():
+            if hasattr(provider, "aclose"):
+                await provider.aclose()
+            elif hasattr(provider, "close"):
+                provider.close()
+
+    @classmethod
+    def is_supported(cls, provider_key):
+        """Cheaper than get_supported_providers(): built-ins need no metadata lookup."""
+        return cls._resolve(provider_key) is not None
 
     @classmethod
     @functools.cache
     def get_supported_providers(cls):
-        """List all supported provider names based on files present in the providers directory."""
-        provider_files = Path(cls.PROVIDERS_DIR).glob("*_provider.py")
-        return {file.stem.replace("_provider", "") for file in provider_files}
+        """List all supported provider names: built-in, registered and plugin providers."""
+        return set(cls._registry) | set(cls._entry_points())
+
+
+def _config_key(config):
+    """
+    Normalize a provider config for use as a dict key. Values that are not JSON (e.g.
+    a credentials object) are compared by identity.
+    """
+    return json.dumps(
+        config,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=lambda value: f"<{type(value).__qualname__} {id(value):#x}>",
+    )
@@ -1,40 +1,336 @@
-import anthropic
-from aisuite.provider import Provider
-from aisuite.framework import ChatCompletionResponse
+import functools
+import json
+
+from aisuite.provider import (
+    Provider,
+    anormalize_stream,
+    locked_cached_property,
+    normalize_stream,
+    translate_sdk_errors,
+)
+from aisuite.prompt_caching import CACHE_MARKER, is_cache_breakpoint
+from aisuite.framework import (
+    ChatCompletionResponse,
+    ChatCompletionChunk,
+    ChoiceDeltaToolCall,
+    CompletionUsage,
+    Choice,
+    Message,
+    ToolCall,
+    Function,
+)
 
 # Define a constant for the default max_tokens value
 DEFAULT_MAX_TOKENS = 4096
 
+# Map Anthropic stop reasons to OpenAI finish reasons.
+FINISH_REASONS = {
+    "end_turn": "stop",
+    "stop_sequence": "stop",
+    "max_tokens": "length",
+    "tool_use": "tool_calls",
+}
+
+
+def _cache_control(content):
+    """Return message content as blocks, the last one marked as a cache breakpoint."""
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content}]
+    else:
+        blocks = [dict(block) for block in content]
+    blocks[-1]["cache_control"] = {"type": "ephemeral"}
+    return blocks
+
+
+def _tool_use_message(message):
+    """An assistant message with OpenAI-style tool_calls, as tool_use content blocks."""
+    content = message.get("content")
+    blocks = [{"type": "text", "text": content}] if content else []
+    for call in message["tool_calls"]:
+        blocks.append(
+            {
+                "type": "tool_use",
+                "id": call["id"],
+                "name": call["function"]["name"],
+                "input": json.loads(call["function"]["arguments"] or "{}"),
+            }
+        )
+    return {"role": "assistant", "content": blocks}
+
+
+def _tool_result(message):
+    return {
+        "type": "tool_result",
+        "tool_use_id": message["tool_call_id"],
+        "content": message["content"],
+    }
+
+
+def _format_messages(messages):
+    """
+    Map OpenAI-style tool calls and tool messages to Anthropic content blocks; the
+    results of one turn's tool calls go together in a single user message.
+    """
+    formatted, results = [], None
+    for message in messages:
+        if message["role"] == "tool":
+            if results is None:
+                results = []
+                formatted.append({"role": "user", "content": results})
+            results.append(_tool_result(message))
+            continue
+        results = None
+        if message.get("tool_calls"):
+            formatted.append(_tool_use_message(message))
+        else:
+            formatted.append(_format_message(message))
+    return formatted
+
+
+def _format_tools(tools):
+    """Map OpenAI-style function tools to Anthropic tools (others pass through)."""
+    return [
+        (
+            {
+                "name": tool["function"]["name"],
+                "description": tool["function"].get("description", ""),
+                "input_schema": tool["function"].get("parameters")
+                or {"type": "object", "properties": {}},
+            }
+            if tool.get("type") == "function"
+            else tool
+        )
+        for tool in tools
+    ]
+
+
+def _format_tool_choice(tool_choice):
+    """Map an OpenAI-style tool_choice to Anthropic's."""
+    if tool_choice == "required":
+        return {"type": "any"}
+    if isinstance(tool_choice, str):
+        return {"type": tool_choice}
+    if tool_choice.get("type") == "function":
+        return {"type": "tool", "name": tool_choice["function"]["name"]}
+    return tool_choice
+
+
+def _format_message(message):
+    if CACHE_MARKER not in message:
+        return message
+    formatted = {k: v for k, v in message.items() if k != CACHE_MARKER}
+    if is_cache_breakpoint(message):
+        formatted["content"] = _cache_control(message["content"])
+    return formatted
+
+
+def normalize_usage(usage):
+    """Anthropic counts cached prompt tokens apart from input_tokens."""
+    cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    return CompletionUsage(
+        usage.input_tokens + cache_read + cache_write,
+        usage.output_tokens,
+        cache_read,
+        cache_write,
+    )
+
+
+def normalize_message_dict(data, model=None):
+    """
+    Normalize an Anthropic message given as decoded JSON rather than an SDK object,
+    as found in batch results (Message Batches and Bedrock batch inference).
+    """
+    content = data.get("content") or ()
+    texts = [block["text"] for block in content if block.get("type") == "text"]
+    tool_calls = [
+        ToolCall(
+            id=block["id"], function=Function(block["name"], json.dumps(block["input"]))
+        )
+        for block in content
+        if block.get("type") == "tool_use"
+    ]
+    usage = data.get("usage")
+    if usage:
+        cache_read = usage.get("cache_read_input_tokens") or 0
+        cache_write = usage.get("cache_creation_input_tokens") or 0
+        usage = CompletionUsage(
+            (usage.get("input_tokens") or 0) + cache_read + cache_write,
+            usage.get("output_tokens"),
+            cache_read,
+            cache_write,
+        )
+    stop_reason = data.get("stop_reason")
+    return ChatCompletionResponse(
+        choices=[
+            Choice(
+                message=Message(
+                    content="".join(texts) if texts else None,
+                    tool_calls=tool_calls or None,
+                ),
+                finish_reason=FINISH_REASONS.get(stop_reason, stop_reason),
+            )
+        ],
+        usage=usage or None,
+        model=data.get("model") or model,
+        raw=data,
+    )
+
+
+def build_request(model, messages, **kwargs):
+    """Build the Anthropic messages API arguments, for calls and batch jobs alike."""
+    # Check if the fist message is a system message
+    if messages[0]["role"] == "system":
+        system_message = messages[0]["content"]
+        if is_cache_breakpoint(messages[0]):
+            system_message = _cache_control(system_message)
+        messages = messages[1:]
+    else:
+        system_message = []
+    messages = _format_messages(messages)
+    if kwargs.get("tools"):
+        kwargs["tools"] = _format_tools(kwargs["tools"])
+    if kwargs.get("tool_choice") is not None:
+        kwargs["tool_choice"] = _format_tool_choice(kwargs["tool_choice"])
+
+    # kwargs.setdefault('max_tokens', DEFAULT_MAX_TOKENS)
+    if "max_tokens" not in kwargs:
+        kwargs["max_tokens"] = DEFAULT_MAX_TOKENS
+
+    return dict(model=model, system=system_message, messages=messages, **kwargs)
+
 
 class AnthropicProvider(Provider):
+    # Messages marked with aisuite.prompt_caching markers become cache breakpoints.
+    supports_cache_markers = True
+
     def __init__(self, **config):
         """
         Initialize the Anthropic provider with the given configuration.
         Pass the entire configuration dictionary to the Anthropic client constructor.
+        The SDK is only imported, and the clients built, when they are first used.
         """
+        self.config = config
+
+    @locked_cached_property
+    def client(self):
+        import anthropic
 
-        self.client = anthropic.Anthropic(**config)
+        return anthropic.Anthropic(**self.config)
+
+    @locked_cached_property
+    def async_client(self):
+        import anthropic
+
+        return anthropic.AsyncAnthropic(**self.config)
 
     def chat_completions_create(self, model, messages, **kwargs):
-        # Check if the fist message is a system message
-        if messages[0]["role"] == "system":
-            system_message = messages[0]["content"]
-            messages = messages[1:]
-        else:
-            system_message = []
+        import anthropic
 
-        # kwargs.setdefault('max_tokens', DEFAULT_MAX_TOKENS)
-        if "max_tokens" not in kwargs:
-            kwargs["max_tokens"] = DEFAULT_MAX_TOKENS
+        request = build_request(model, messages, **kwargs)
+        with translate_sdk_errors(anthropic, "anthropic"):
+            response = self.client.messages.create(**request)
+        if request.get("stream"):
+            return normalize_stream(
+                response,
+                functools.partial(self.normalize_stream_event, tool_indexes={}),
+                translate_sdk_errors(anthropic, "anthropic"),
+            )
+        return self.normalize_response(response)
+
+    async def achat_completions_create(self, model, messages, **kwargs):
+        import anthropic
 
-        return self.normalize_response(
-            self.client.messages.create(
-                model=model, system=system_message, messages=messages, **kwargs
+        request = build_request(model, messages, **kwargs)
+        with translate_sdk_errors(anthropic, "anthropic"):
+            response = await self.async_client.messages.create(**request)
+        if request.get("stream"):
+            return anormalize_stream(
+                response,
+                functools.partial(self.normalize_stream_event, tool_indexes={}),
+                translate_sdk_errors(anthropic, "anthropic"),
             )
-        )
+        return self.normalize_response(response)
 
     def normalize_response(self, response):
         """Normalize the response from the Anthropic API to match OpenAI's response format."""
-        normalized_response = ChatCompletionResponse()
-        normalized_response.choices[0].message.content = response.content[0].text
-        return normalized_response
+        texts = [block.text for block in response.content if block.type == "text"]
+        tool_calls = [
+            ToolCall(
+                id=block.id, function=Function(block.name, json.dumps(block.input))
+            )
+            for block in response.content
+            if block.type == "tool_use"
+        ]
+        return ChatCompletionResponse(
+            choices=[
+                Choice(
+                    message=Message(
+                        content="".join(texts) if texts else None,
+                        tool_calls=tool_calls or None,
+                    ),
+                    finish_reason=FINISH_REASONS.get(
+                        response.stop_reason, response.stop_reason
+                    ),
+                )
+            ],
+            usage=normalize_usage(response.usage),
+            model=response.model,
+            raw=response,
+        )
+
+    def normalize_stream_event(self, event, tool_indexes=None):
+        """
+        Normalize a streamed Anthropic event to a ChatCompletionChunk.
+        Events that carry neither text, tool calls nor a stop reason are skipped (None
+        is returned).
+
+        tool_indexes maps the content block index of each tool_use block of a stream
+        to the index of its tool call; pass the same dict for all the events of one
+        stream. Without it, tool calls are indexed by content block.
+        """
+        if event.type == "message_start":
+            return ChatCompletionChunk(
+                role="assistant", usage=normalize_usage(event.message.usage)
+            )
+        if event.type == "content_block_delta" and event.delta.type == "text_delta":
+            return ChatCompletionChunk(content=event.delta.text)
+        if (
+            event.type == "content_block_start"
+            and event.content_block.type == "tool_use"
+        ):
+            index = event.index
+            if tool_indexes is not None:
+                index = tool_indexes.setdefault(event.index, len(tool_indexes))
+            call = ChoiceDeltaToolCall(
+                index,
+                id=event.content_block.id,
+                function=Function(event.content_block.name, ""),
+            )
+            return ChatCompletionChunk(tool_calls=[call])
+        if (
+            event.type == "content_block_delta"
+            and event.delta.type == "input_json_delta"
+        ):
+            index = event.index if tool_indexes is None else tool_indexes[event.index]
+            call = ChoiceDeltaToolCall(
+                index, function=Function(arguments=event.delta.partial_json)
+            )
+            return ChatCompletionChunk(tool_calls=[call])
+        if event.type == "message_delta" and event.delta.stop_reason:
+            return ChatCompletionChunk(
+                finish_reason=FINISH_REASONS.get(
+                    event.delta.stop_reason, event.delta.stop_reason
+                ),
+                usage=CompletionUsage(completion_tokens=event.usage.output_tokens),
+            )
+        return None
+
+    def close(self):
+        if "client" in self.__dict__:
+            self.client.close()
+
+    async def aclose(self):
+        self.close()
+        if "async_client" in self.__dict__:
+            await self.async_client.close()
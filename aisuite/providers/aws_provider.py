@@ -1,11 +1,152 @@
+import functools
 import os
+from contextlib import contextmanager
+import json
 
-import boto3
-from aisuite.provider import Provider, LLMError
-from aisuite.framework import ChatCompletionResponse
+from aisuite.provider import (
+    Provider,
+    locked_cached_property,
+    normalize_stream,
+    RateLimitError,
+    OverloadedError,
+    APITimeoutError,
+    APIConnectionError,
+    AuthenticationError,
+    BadRequestError,
+    error_from_status,
+)
+from aisuite.prompt_caching import is_cache_breakpoint
+from aisuite.framework import (
+    ChatCompletionResponse,
+    ChatCompletionChunk,
+    ChoiceDeltaToolCall,
+    CompletionUsage,
+    Choice,
+    Message,
+    ToolCall,
+    Function,
+)
+
+
+# Map Bedrock stop reasons to OpenAI finish reasons.
+FINISH_REASONS = {
+    "end_turn": "stop",
+    "stop_sequence": "stop",
+    "max_tokens": "length",
+    "tool_use": "tool_calls",
+    "content_filtered": "content_filter",
+    "guardrail_intervened": "content_filter",
+}
+
+
+# Appended to a content list to cache the prompt prefix ending there.
+CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+
+def _content(message):
+    """Format message content as Bedrock content blocks."""
+    blocks = [{"text": message["content"]}]
+    if is_cache_breakpoint(message):
+        blocks.append(CACHE_POINT)
+    return blocks
+
+
+def _tool_use_content(message):
+    """An assistant message with OpenAI-style tool_calls, as Bedrock content blocks."""
+    blocks = [{"text": message["content"]}] if message.get("content") else []
+    for call in message["tool_calls"]:
+        blocks.append(
+            {
+                "toolUse": {
+                    "toolUseId": call["id"],
+                    "name": call["function"]["name"],
+                    "input": json.loads(call["function"]["arguments"] or "{}"),
+                }
+            }
+        )
+    return blocks
+
+
+def _tool_result(message):
+    return {
+        "toolResult": {
+            "toolUseId": message["tool_call_id"],
+            "content": [{"text": message["content"]}],
+        }
+    }
+
+
+def _tool_config(tools, tool_choice=None):
+    """Map OpenAI-style tools and tool_choice to a Bedrock toolConfig."""
+    config = {
+        "tools": [
+            {
+                "toolSpec": {
+                    "name": tool["function"]["name"],
+                    "description": tool["function"].get("description", ""),
+                    "inputSchema": {
+                        "json": tool["function"].get("parameters")
+                        or {"type": "object", "properties": {}}
+                    },
+                }
+            }
+            for tool in tools
+        ]
+    }
+    if tool_choice == "required":
+        config["toolChoice"] = {"any": {}}
+    elif tool_choice == "auto":
+        config["toolChoice"] = {"auto": {}}
+    elif isinstance(tool_choice, dict):
+        config["toolChoice"] = {"tool": {"name": tool_choice["function"]["name"]}}
+    return config
+
+
+# Map Bedrock error codes to LLMError subclasses.
+ERROR_CLASSES = {
+    "ThrottlingException": RateLimitError,
+    "TooManyRequestsException": RateLimitError,
+    "ServiceQuotaExceededException": RateLimitError,
+    "ServiceUnavailableException": OverloadedError,
+    "ModelNotReadyException": OverloadedError,
+    "InternalServerException": OverloadedError,
+    "ModelTimeoutException": APITimeoutError,
+    "AccessDeniedException": AuthenticationError,
+    "UnrecognizedClientException": AuthenticationError,
+    "ExpiredTokenException": AuthenticationError,
+    "ValidationException": BadRequestError,
+    "ResourceNotFoundException": BadRequestError,
+    "ModelErrorException": BadRequestError,
+}
+
+
+@contextmanager
+def translate_bedrock_errors():
+    """Re-raise botocore errors as LLMError subclasses."""
+    import botocore.exceptions
+
+    try:
+        yield
+    except botocore.exceptions.ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        status_code = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        error_class = ERROR_CLASSES.get(code)
+        if error_class is None:
+            raise error_from_status(status_code or 0, str(e), provider="aws") from e
+        raise error_class(str(e), status_code=status_code, provider="aws") from e
+    except (
+        botocore.exceptions.ReadTimeoutError,
+        botocore.exceptions.ConnectTimeoutError,
+    ) as e:
+        raise APITimeoutError(str(e), provider="aws") from e
+    except botocore.exceptions.EndpointConnectionError as e:
+        raise APIConnectionError(str(e), provider="aws") from e
 
 
 class AwsProvider(Provider):
+    # Messages marked with aisuite.prompt_caching markers get a cache point.
+    supports_cache_markers = True
+
     def __init__(self, **config):
         """
         Initialize the AWS Bedrock provider with the given configuration.
@@ -36,7 +177,6 @@ class AwsProvider(Provider):
         self.region_name = config.get(
             "region_name", os.getenv("AWS_REGION_NAME", "us-west-2")
         )
-        self.client = boto3.client("bedrock-runtime", region_name=self.region_name)
         self.inference_parameters = [
             "maxTokens",
             "temperature",
@@ -44,31 +184,146 @@ class AwsProvider(Provider):
             "stopSequences",
         ]
 
-    def normalize_response(self, response):
+    @locked_cached_property
+    def client(self):
+        # boto3 is slow to import, so it is only loaded when the first request is made.
+        import boto3
+
+        return boto3.client("bedrock-runtime", region_name=self.region_name)
+
+    def normalize_response(self, response, model=None):
         """Normalize the response from the Bedrock API to match OpenAI's response format."""
-        norm_response = ChatCompletionResponse()
-        norm_response.choices[0].message.content = response["output"]["message"][
-            "content"
-        ][0]["text"]
-        return norm_response
+        content = response["output"]["message"]["content"]
+        texts = [block["text"] for block in content if "text" in block]
+        tool_calls = [
+            ToolCall(
+                id=block["toolUse"]["toolUseId"],
+                function=Function(
+                    block["toolUse"]["name"], json.dumps(block["toolUse"]["input"])
+                ),
+            )
+            for block in content
+            if "toolUse" in block
+        ]
+        stop_reason = response.get("stopReason")
+        return ChatCompletionResponse(
+            choices=[
+                Choice(
+                    message=Message(
+                        content="".join(texts) if texts else None,
+                        tool_calls=tool_calls or None,
+                    ),
+                    finish_reason=FINISH_REASONS.get(stop_reason, stop_reason),
+                )
+            ],
+            usage=self.normalize_usage(response.get("usage")),
+            model=model,
+            raw=response,
+        )
+
+    def normalize_usage(self, usage):
+        """Bedrock counts cached prompt tokens apart from inputTokens."""
+        if not usage:
+            return None
+        cache_read = usage.get("cacheReadInputTokens") or 0
+        cache_write = usage.get("cacheWriteInputTokens") or 0
+        return CompletionUsage(
+            (usage.get("inputTokens") or 0) + cache_read + cache_write,
+            usage.get("outputTokens"),
+            cache_read,
+            cache_write,
+        )
+
+    def normalize_stream_event(self, event, tool_indexes=None):
+        """
+        Normalize a ConverseStream event to a ChatCompletionChunk.
+        Events that carry neither text, tool calls nor a stop reason are skipped (None
+        is returned).
+
+        tool_indexes maps the content block index of each toolUse block of a stream to
+        the index of its tool call; pass the same dict for all the events of one
+        stream. Without it, tool calls are indexed by content block.
+        """
+        if "messageStart" in event:
+            return ChatCompletionChunk(role=event["messageStart"]["role"])
+        if "contentBlockStart" in event:
+            block = event["contentBlockStart"]
+            tool_use = block.get("start", {}).get("toolUse")
+            if tool_use is not None:
+                index = block["contentBlockIndex"]
+                if tool_indexes is not None:
+                    index = tool_indexes.setdefault(index, len(tool_indexes))
+                call = ChoiceDeltaToolCall(
+                    index,
+                    id=tool_use["toolUseId"],
+                    function=Function(tool_use["name"], ""),
+                )
+                return ChatCompletionChunk(tool_calls=[call])
+        if "contentBlockDelta" in event:
+            block = event["contentBlockDelta"]
+            text = block["delta"].get("text")
+            if text is not None:
+                return ChatCompletionChunk(content=text)
+            tool_use = block["delta"].get("toolUse")
+            if tool_use is not None:
+                index = block["contentBlockIndex"]
+                if tool_indexes is not None:
+                    index = tool_indexes[index]
+                call = ChoiceDeltaToolCall(
+                    index, function=Function(arguments=tool_use.get("input", ""))
+                )
+                return ChatCompletionChunk(tool_calls=[call])
+        if "messageStop" in event:
+            stop_reason = event["messageStop"]["stopReason"]
+            return ChatCompletionChunk(
+                finish_reason=FINISH_REASONS.get(stop_reason, stop_reason)
+            )
+        if "metadata" in event and "usage" in event["metadata"]:
+            return ChatCompletionChunk(
+                usage=self.normalize_usage(event["metadata"]["usage"])
+            )
+        return None
 
     def chat_completions_create(self, model, messages, **kwargs):
-        # Any exception raised by Anthropic will be returned to the caller.
-        # Maybe we should catch them and raise a custom LLMError.
+        # Errors raised by botocore are re-raised as LLMError subclasses.
         # https://docs.aws.amazon.com/bedrock/latest/userguide/conversation-inference.html
         system_message = []
         if messages[0]["role"] == "system":
-            system_message = [{"text": messages[0]["content"]}]
+            system_message = _content(messages[0])
             messages = messages[1:]
 
-        formatted_messages = []
+        formatted_messages, results = [], None
         for message in messages:
+            # The results of one turn's tool calls go together in a single user message.
+            if message["role"] == "tool":
+                if results is None:
+                    results = []
+                    formatted_messages.append({"role": "user", "content": results})
+                results.append(_tool_result(message))
+                continue
+            results = None
+            if message.get("tool_calls"):
+                formatted_messages.append(
+                    {"role": "assistant", "content": _tool_use_content(message)}
+                )
             # QUIETLY Ignore any "system" messages except the first system message.
-            if message["role"] != "system":
+            elif message["role"] != "system":
                 formatted_messages.append(
-                    {"role": message["role"], "content": [{"text": message["content"]}]}
+                    {"role": message["role"], "content": _content(message)}
                 )
 
+        # Use the ConverseStream API when streaming is requested; the flag itself is
+        # not a Bedrock model parameter.
+        stream = kwargs.pop("stream", False)
+
+        # Tools are passed as toolConfig. tool_choice="none" is expressed by sending
+        # no tools.
+        tools = kwargs.pop("tools", None)
+        tool_choice = kwargs.pop("tool_choice", None)
+        extra = {}
+        if tools and tool_choice != "none":
+            extra["toolConfig"] = _tool_config(tools, tool_choice)
+
         # Maintain a list of Inference Parameters which Bedrock supports.
         # These fields need to be passed using inferenceConfig.
         # Rest all other fields are passed as additionalModelRequestFields.
@@ -83,11 +338,20 @@ class AwsProvider(Provider):
                 additional_model_request_fields[key] = value
 
         # Call the Bedrock Converse API.
-        response = self.client.converse(
-            modelId=model,  # baseModelId or provisionedModelArn
-            messages=formatted_messages,
-            system=system_message,
-            inferenceConfig=inference_config,
-            additionalModelRequestFields=additional_model_request_fields,
-        )
-        return self.normalize_response(response)
+        converse = self.client.converse_stream if stream else self.client.converse
+        with translate_bedrock_errors():
+            response = converse(
+                modelId=model,  # baseModelId or provisionedModelArn
+                messages=formatted_messages,
+                system=system_message,
+                inferenceConfig=inference_config,
+                additionalModelRequestFields=additional_model_request_fields,
+                **extra,
+            )
+        if stream:
+            return normalize_stream(
+                response["stream"],
+                functools.partial(self.normalize_stream_event, tool_indexes={}),
+                translate_bedrock_errors(),
+            )
+        return self.normalize_response(response, model)
@@ -1,19 +1,107 @@
 """The interface to Google's Vertex AI."""
 
+from collections import OrderedDict
+from contextlib import contextmanager
+import json
 import os
+import threading
 
-import vertexai
-from vertexai.generative_models import GenerativeModel, GenerationConfig
-
-from aisuite.framework import ProviderInterface, ChatCompletionResponse
+from aisuite.provider import error_from_status, normalize_stream
+from aisuite.framework import (
+    ProviderInterface,
+    ChatCompletionResponse,
+    ChatCompletionChunk,
+    ChoiceDeltaToolCall,
+    CompletionUsage,
+    Choice,
+    Message,
+    ToolCall,
+    Function,
+)
 
 
 DEFAULT_TEMPERATURE = 0.7
 
+# Number of GenerativeModel handles kept per provider instance.
+MODEL_CACHE_SIZE = 32
+
+# Map OpenAI-style arguments to Vertex AI GenerationConfig fields.
+GENERATION_CONFIG_FIELDS = {
+    "temperature": "temperature",
+    "max_tokens": "max_output_tokens",
+    "top_p": "top_p",
+    "top_k": "top_k",
+    "stop": "stop_sequences",
+    "presence_penalty": "presence_penalty",
+    "frequency_penalty": "frequency_penalty",
+    "seed": "seed",
+    "n": "candidate_count",
+}
+
+# Map Vertex AI finish reasons to OpenAI finish reasons.
+FINISH_REASONS = {
+    "STOP": "stop",
+    "MAX_TOKENS": "length",
+    "SAFETY": "content_filter",
+    "RECITATION": "content_filter",
+    "BLOCKLIST": "content_filter",
+    "PROHIBITED_CONTENT": "content_filter",
+    "SPII": "content_filter",
+}
+
+
+_vertexai_lock = threading.Lock()
+_vertexai_initialized_for = None
+
+
+def _init_vertexai(project, location):
+    """
+    Run vertexai.init, which configures process-wide state, once per process (and
+    again only if another provider instance targets a different project or region).
+    """
+    global _vertexai_initialized_for
+    with _vertexai_lock:
+        if _vertexai_initialized_for != (project, location):
+            import vertexai
+
+            vertexai.init(project=project, location=location)
+            _vertexai_initialized_for = (project, location)
+
+
+@contextmanager
+def translate_google_errors():
+    """Re-raise Google API errors as LLMError subclasses, based on their HTTP status code."""
+    from google.api_core import exceptions as google_exceptions
+
+    try:
+        yield
+    except google_exceptions.GoogleAPICallError as e:
+        raise error_from_status(e.code or 0, str(e), provider="google") from e
+
+
+def _split_parts(parts):
+    """Return the texts and the tool calls (as ToolCall) of a candidate's parts."""
+    texts, tool_calls = [], []
+    for part in parts:
+        if part.function_call is not None:
+            call = part.function_call.to_dict()
+            tool_calls.append(
+                ToolCall(
+                    id=f"call_{len(tool_calls)}",
+                    function=Function(call["name"], json.dumps(call.get("args") or {})),
+                )
+            )
+        else:
+            texts.append(part.text)
+    return texts, tool_calls
+
 
 class GoogleProvider(ProviderInterface):
     """Implements the ProviderInterface for interacting with Google's Vertex AI."""
 
+    # n is sent as candidate_count.
+    supports_n = True
+
     def __init__(self, **config):
         """Set up the Google AI client with a project ID."""
         self.project_id = config.get("project_id") or os.getenv("GOOGLE_PROJECT_ID")
@@ -29,7 +117,50 @@ class GoogleProvider(ProviderInterface):
                 "Please refer to the setup guide: /guides/google.md."
             )
 
-        vertexai.init(project=self.project_id, location=self.location)
+        # GenerativeModel handles, keyed by (model, generation config), most recently
+        # used last.
+        self._models = OrderedDict()
+        self._models_lock = threading.Lock()
+
+    def _get_model(self, model, generation_config):
+        """Return a cached GenerativeModel for the model and generation config."""
+        key = (model, tuple(sorted(generation_config.items())))
+        with self._models_lock:
+            handle = self._models.get(key)
+            if handle is not None:
+                self._models.move_to_end(key)
+                return handle
+
+        from vertexai.generative_models import GenerativeModel, GenerationConfig
+
+        _init_vertexai(self.project_id, self.location)
+        # Sequences are kept as tuples in the config so that it can be hashed.
+        handle = GenerativeModel(
+            model,
+            generation_config=GenerationConfig(
+                **{
+                    name: list(value) if isinstance(value, tuple) else value
+                    for name, value in generation_config.items()
+                }
+            ),
+        )
+        with self._models_lock:
+            self._models[key] = handle
+            while len(self._models) > MODEL_CACHE_SIZE:
+                self._models.popitem(last=False)
+        return handle
+
+    def generation_config(self, kwargs):
+        """Map OpenAI-style arguments to Vertex AI GenerationConfig fields."""
+        config = {"temperature": kwargs.get("temperature", DEFAULT_TEMPERATURE)}
+        for name, value in kwargs.items():
+            field = GENERATION_CONFIG_FIELDS.get(name)
+            if field is None or value is None:
+                continue
+            if field == "stop_sequences":
+                value = (value,) if isinstance(value, str) else tuple(value)
+            config[field] = value
+        return config
 
     def chat_completions_create(self, model, messages, **kwargs):
         """Request chat completions from the Google AI API.
@@ -38,68 +169,187 @@ class GoogleProvider(ProviderInterface):
         ----
             model (str): Identifies the specific provider/model to use.
             messages (list of dict): A list of message objects in chat history.
-            kwargs (dict): Optional arguments for the Google AI API.
+            kwargs (dict): Optional arguments for the Google AI API: temperature,
+                max_tokens, top_p, top_k, stop, presence_penalty, frequency_penalty,
+                seed, n, stream, and OpenAI-style tools and tool_choice.
 
         Returns:
         -------
             The ChatCompletionResponse with the completion result.
 
         """
+        generative_model = self._get_model(model, self.generation_config(kwargs))
 
-        # Set the temperature if provided, otherwise use the default
-        temperature = kwargs.get("temperature", DEFAULT_TEMPERATURE)
+        # The whole conversation is sent in one stateless request; no chat session
+        # needs to be built around it.
+        contents = self.convert_openai_to_vertex_ai(self.transform_roles(messages))
+        tool_kwargs = self.convert_tools(kwargs.get("tools"), kwargs.get("tool_choice"))
+        with translate_google_errors():
+            if kwargs.get("stream"):
+                return normalize_stream(
+                    generative_model.generate_content(
+                        contents, stream=True, **tool_kwargs
+                    ),
+                    self.normalize_chunk,
+                    translate_google_errors(),
+                )
+            response = generative_model.generate_content(contents, **tool_kwargs)
 
-        # Transform the roles in the messages
-        transformed_messages = self.transform_roles(messages)
-
-        # Convert the messages to the format expected Google
-        final_message_history = self.convert_openai_to_vertex_ai(
-            transformed_messages[:-1]
-        )
-
-        # Get the last message from the transformed messages
-        last_message = transformed_messages[-1]["content"]
-
-        # Create the GenerativeModel with the specified model and generation configuration
-        model = GenerativeModel(
-            model, generation_config=GenerationConfig(temperature=temperature)
-        )
+        # Convert the response to the format expected by the OpenAI API
+        return self.normalize_response(response, model)
 
-        # Start a chat with the GenerativeModel and send the last message
-        chat = model.start_chat(history=final_message_history)
-        response = chat.send_message(last_message)
+    def convert_tools(self, tools, tool_choice=None):
+        """
+        Map OpenAI-style tools and tool_choice to the Vertex AI tools and tool_config
+        arguments of generate_content (an empty dict without tools).
+        """
+        if not tools:
+            return {}
+        from vertexai.generative_models import FunctionDeclaration, Tool, ToolConfig
 
-        # Convert the response to the format expected by the OpenAI API
-        return self.normalize_response(response)
+        declarations = [
+            FunctionDeclaration(
+                name=tool["function"]["name"],
+                description=tool["function"].get("description", ""),
+                parameters=tool["function"].get("parameters")
+                or {"type": "object", "properties": {}},
+            )
+            for tool in tools
+        ]
+        converted = {"tools": [Tool(function_declarations=declarations)]}
+        if tool_choice is not None:
+            config = ToolConfig.FunctionCallingConfig
+            if isinstance(tool_choice, dict):
+                mode = config.Mode.ANY
+                names = [tool_choice["function"]["name"]]
+            else:
+                mode = {
+                    "auto": config.Mode.AUTO,
+                    "required": config.Mode.ANY,
+                    "none": config.Mode.NONE,
+                }[tool_choice]
+                names = None
+            converted["tool_config"] = ToolConfig(
+                function_calling_config=config(mode=mode, allowed_function_names=names)
+            )
+        return converted
 
     def convert_openai_to_vertex_ai(self, messages):
-        """Convert OpenAI messages to Google AI messages."""
+        """
+        Convert OpenAI messages to Google AI messages. Assistant tool calls become
+        function_call parts, and the tool messages answering them function_response
+        parts, grouped in one message per turn.
+        """
         from vertexai.generative_models import Content, Part
 
-        history = []
+        history, results = [], None
+        # Tool messages only carry the id of the call they answer; Vertex AI wants
+        # the function's name.
+        names = {}
         for message in messages:
             role = message["role"]
             content = message["content"]
-            parts = [Part.from_text(content)]
-            history.append(Content(role=role, parts=parts))
-        return history
+            if role == "tool":
+                if results is None:
+                    results = []
+                    history.append(("user", results))
+                results.append(
+                    Part.from_function_response(
+                        name=names.get(message["tool_call_id"], ""),
+                        response={"content": content},
+                    )
+                )
+                continue
+            results = None
+            parts = (
+                [Part.from_text(content)]
+                if content or not message.get("tool_calls")
+                else []
+            )
+            for call in message.get("tool_calls") or ():
+                names[call["id"]] = call["function"]["name"]
+                parts.append(
+                    Part.from_dict(
+                        {
+                            "function_call": {
+                                "name": call["function"]["name"],
+                                "args": json.loads(
+                                    call["function"]["arguments"] or "{}"
+                                ),
+                            }
+                        }
+                    )
+                )
+            history.append((role, parts))
+        # Content copies its parts, so it is only built once they are all known.
+        return [Content(role=role, parts=parts) for role, parts in history]
 
     def transform_roles(self, messages):
-        """Transform the roles in the messages based on the provided transformations."""
+        """
+        Return copies of the messages with their roles mapped to Google's; the
+        caller's messages are left untouched.
+        """
         openai_roles_to_google_roles = {
             "system": "user",
             "assistant": "model",
         }
 
-        for message in messages:
-            if role := openai_roles_to_google_roles.get(message["role"], None):
-                message["role"] = role
-        return messages
+        return [
+            {
+                **message,
+                "role": openai_roles_to_google_roles.get(
+                    message["role"], message["role"]
+                ),
+            }
+            for message in messages
+        ]
 
-    def normalize_response(self, response):
+    def normalize_response(self, response, model=None):
         """Normalize the response from Google AI to match OpenAI's response format."""
-        openai_response = ChatCompletionResponse()
-        openai_response.choices[0].message.content = (
-            response.candidates[0].content.parts[0].text
+        choices = []
+        for index, candidate in enumerate(response.candidates):
+            texts, tool_calls = _split_parts(candidate.content.parts)
+            finish_reason = None
+            if candidate.finish_reason:
+                finish_reason = FINISH_REASONS.get(candidate.finish_reason.name, "stop")
+            choices.append(
+                Choice(
+                    index=index,
+                    message=Message(
+                        content="".join(texts) if texts else None,
+                        tool_calls=tool_calls or None,
+                    ),
+                    finish_reason="tool_calls" if tool_calls else finish_reason,
+                )
+            )
+        return ChatCompletionResponse(
+            choices=choices or None,
+            usage=self.normalize_usage(response),
+            model=model,
+            raw=response,
+        )
+
+    def normalize_usage(self, response):
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return None
+        return CompletionUsage(usage.prompt_token_count, usage.candidates_token_count)
+
+    def normalize_chunk(self, response):
+        """Normalize a streamed Google AI response to a ChatCompletionChunk."""
+        candidate = response.candidates[0]
+        finish_reason = None
+        if candidate.finish_reason:
+            finish_reason = FINISH_REASONS.get(candidate.finish_reason.name, "stop")
+        # Function calls are streamed whole, each in a single chunk.
+        texts, tool_calls = _split_parts(candidate.content.parts)
+        return ChatCompletionChunk(
+            content="".join(texts) if texts else None,
+            finish_reason="tool_calls" if tool_calls else finish_reason,
+            usage=self.normalize_usage(response),
+            tool_calls=[
+                ChoiceDeltaToolCall(index=index, id=call.id, function=call.function)
+                for index, call in enumerate(tool_calls)
+            ]
+            or None,
         )
-        return openai_response
@@ -1,7 +1,16 @@
 import os
 
-import groq
-from aisuite.provider import Provider
+from aisuite.provider import (
+    Provider,
+    anormalize_stream,
+    locked_cached_property,
+    normalize_stream,
+    translate_sdk_errors,
+)
+from aisuite.framework import (
+    ChatCompletionResponse,
+    ChatCompletionChunk,
+)
 
 
 class GroqProvider(Provider):
@@ -16,11 +25,60 @@ class GroqProvider(Provider):
             raise ValueError(
                 " API key is missing. Please provide it in the config or set the GROQ_API_KEY environment variable."
             )
-        self.client = groq.Groq(**config)
+        # The SDK is only imported, and the clients built, when they are first used.
+        self.config = config
+
+    @locked_cached_property
+    def client(self):
+        import groq
+
+        return groq.Groq(**self.config)
+
+    @locked_cached_property
+    def async_client(self):
+        import groq
+
+        return groq.AsyncGroq(**self.config)
 
     def chat_completions_create(self, model, messages, **kwargs):
-        return self.client.chat.completions.create(
-            model=model,
-            messages=messages,
-            **kwargs  # Pass any additional arguments to the Groq API
-        )
+        import groq
+
+        with translate_sdk_errors(groq, "groq"):
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                **kwargs  # Pass any additional arguments to the Groq API
+            )
+        if kwargs.get("stream"):
+            return normalize_stream(
+                response,
+                ChatCompletionChunk.from_openai_object,
+                translate_sdk_errors(groq, "groq"),
+            )
+        return ChatCompletionResponse.from_openai_object(response, model)
+
+    async def achat_completions_create(self, model, messages, **kwargs):
+        import groq
+
+        with translate_sdk_errors(groq, "groq"):
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                **kwargs  # Pass any additional arguments to the Groq API
+            )
+        if kwargs.get("stream"):
+            return anormalize_stream(
+                response,
+                ChatCompletionChunk.from_openai_object,
+                translate_sdk_errors(groq, "groq"),
+            )
+        return ChatCompletionResponse.from_openai_object(response, model)
+
+    def close(self):
+        if "client" in self.__dict__:
+            self.client.close()
+
+    async def aclose(self):
+        self.close()
+        if "async_client" in self.__dict__:
+            await self.async_client.close()
@@ -1,11 +1,56 @@
 import os
+from contextlib import contextmanager
 
-from mistralai import Mistral
+from aisuite.provider import (
+    Provider,
+    anormalize_stream,
+    locked_cached_property,
+    normalize_stream,
+    APITimeoutError,
+    APIConnectionError,
+    BadRequestError,
+    error_from_status,
+)
+from aisuite.framework import (
+    ChatCompletionResponse,
+    ChatCompletionChunk,
+)
 
-from aisuite.provider import Provider
+
+@contextmanager
+def translate_mistral_errors():
+    """Re-raise Mistral SDK (and underlying httpx) errors as LLMError subclasses."""
+    import httpx
+    from mistralai import models
+
+    try:
+        yield
+    except models.HTTPValidationError as e:
+        raise BadRequestError(str(e), status_code=422, provider="mistral") from e
+    except models.SDKError as e:
+        # Not every SDKError carries the HTTP response.
+        raw_response = getattr(e, "raw_response", None)
+        status_code = (
+            getattr(e, "status_code", None)
+            or getattr(raw_response, "status_code", None)
+            or 0
+        )
+        headers = getattr(raw_response, "headers", None)
+        raise error_from_status(status_code, str(e), headers, "mistral") from e
+    except httpx.TimeoutException as e:
+        raise APITimeoutError(str(e), provider="mistral") from e
+    except httpx.TransportError as e:
+        raise APIConnectionError(str(e), provider="mistral") from e
+
+
+def _normalize_event(event):
+    """Stream events wrap an OpenAI-shaped chunk in their data field."""
+    return ChatCompletionChunk.from_openai_object(event.data)
 
 
 class MistralProvider(Provider):
+    supports_n = True
+
     def __init__(self, **config):
         """
         Initialize the Mistral provider with the given configuration.
@@ -17,7 +62,40 @@ class MistralProvider(Provider):
             raise ValueError(
                 " API key is missing. Please provide it in the config or set the MISTRAL_API_KEY environment variable."
             )
-        self.client = Mistral(**config)
+        # The SDK is only imported, and the client built, when it is first used.
+        self.config = config
+
+    @locked_cached_property
+    def client(self):
+        from mistralai import Mistral
+
+        return Mistral(**self.config)
 
     def chat_completions_create(self, model, messages, **kwargs):
-        return self.client.chat.complete(model=model, messages=messages, **kwargs)
+        # The Mistral SDK exposes streaming as a separate method rather than a flag.
+        with translate_mistral_errors():
+            if kwargs.pop("stream", False):
+                return normalize_stream(
+                    self.client.chat.stream(model=model, messages=messages, **kwargs),
+                    _normalize_event,
+                    translate_mistral_errors(),
+                )
+            response = self.client.chat.complete(
+                model=model, messages=messages, **kwargs
+            )
+        return ChatCompletionResponse.from_openai_object(response, model)
+
+    async def achat_completions_create(self, model, messages, **kwargs):
+        with translate_mistral_errors():
+            if kwargs.pop("stream", False):
+                return anormalize_stream(
+                    await self.client.chat.stream_async(
+                        model=model, messages=messages, **kwargs
+                    ),
+                    _normalize_event,
+                    translate_mistral_errors(),
+                )
+            response = await self.client.chat.complete_async(
+                model=model, messages=messages, **kwargs
+            )
+        return ChatCompletionResponse.from_openai_object(response, model)
@@ -1,7 +1,40 @@
+import json
 import os
-import httpx
-from aisuite.provider import Provider, LLMError
-from aisuite.framework import ChatCompletionResponse
+from aisuite.provider import Provider
+from aisuite.http_client import (
+    HttpClient,
+    iter_ndjson,
+    aiter_ndjson,
+    translate_httpx_errors,
+)
+from aisuite.framework import (
+    ChatCompletionResponse,
+    ChatCompletionChunk,
+    ChoiceDeltaToolCall,
+    CompletionUsage,
+    Choice,
+    Message,
+    ToolCall,
+    Function,
+)
+
+
+def _format_message(message):
+    """Ollama takes tool call arguments as objects rather than JSON strings."""
+    if not message.get("tool_calls"):
+        return message
+    return {
+        **message,
+        "tool_calls": [
+            {
+                "function": {
+                    "name": call["function"]["name"],
+                    "arguments": json.loads(call["function"]["arguments"] or "{}"),
+                }
+            }
+            for call in message["tool_calls"]
+        ],
+    }
 
 
 class OllamaProvider(Provider):
@@ -23,43 +56,149 @@ class OllamaProvider(Provider):
             "OLLAMA_API_URL", "http://localhost:11434"
         )
 
-        # Optionally set a custom timeout (default to 30s)
-        self.timeout = config.get("timeout", 30)
+        # Connections are pooled and kept alive across calls.
+        self.http = HttpClient.from_config(config)
 
     def chat_completions_create(self, model, messages, **kwargs):
         """
         Makes a request to the chat completions endpoint using httpx.
         """
-        kwargs["stream"] = False
-        data = {
-            "model": model,
-            "messages": messages,
-            **kwargs,  # Pass any additional arguments to the API
-        }
+        data = self._prepare_request(model, messages, **kwargs)
 
-        try:
-            response = httpx.post(
-                self.url.rstrip("/") + self._CHAT_COMPLETION_ENDPOINT,
-                json=data,
-                timeout=self.timeout,
+        with translate_httpx_errors(
+            "Ollama",
+            "ollama",
+            connect_error_message=f"Connection failed: {self._CONNECT_ERROR_MESSAGE}",
+        ):
+            if data["stream"]:
+                return self._stream(
+                    self.http.open_stream(
+                        self.url.rstrip("/") + self._CHAT_COMPLETION_ENDPOINT, json=data
+                    )
+                )
+
+            response_data = self.http.post_json(
+                self.url.rstrip("/") + self._CHAT_COMPLETION_ENDPOINT, data
             )
-            response.raise_for_status()
-        except httpx.ConnectError:  # Handle connection errors
-            raise LLMError(f"Connection failed: {self._CONNECT_ERROR_MESSAGE}")
-        except httpx.HTTPStatusError as http_err:
-            raise LLMError(f"Ollama request failed: {http_err}")
-        except Exception as e:
-            raise LLMError(f"An error occurred: {e}")
 
         # Return the normalized response
-        return self._normalize_response(response.json())
+        return self._normalize_response(response_data)
+
+    async def achat_completions_create(self, model, messages, **kwargs):
+        """
+        Makes an async request to the chat completions endpoint using httpx.
+        """
+        data = self._prepare_request(model, messages, **kwargs)
+
+        with translate_httpx_errors(
+            "Ollama",
+            "ollama",
+            connect_error_message=f"Connection failed: {self._CONNECT_ERROR_MESSAGE}",
+        ):
+            if data["stream"]:
+                return self._astream(
+                    await self.http.aopen_stream(
+                        self.url.rstrip("/") + self._CHAT_COMPLETION_ENDPOINT, json=data
+                    )
+                )
+
+            response_data = await self.http.apost_json(
+                self.url.rstrip("/") + self._CHAT_COMPLETION_ENDPOINT, data
+            )
+
+        # Return the normalized response
+        return self._normalize_response(response_data)
+
+    def _stream(self, response):
+        for chunk_data in iter_ndjson(response):
+            yield self._normalize_chunk(chunk_data)
+
+    async def _astream(self, response):
+        async for chunk_data in aiter_ndjson(response):
+            yield self._normalize_chunk(chunk_data)
+
+    def close(self):
+        self.http.close()
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    def _prepare_request(self, model, messages, **kwargs):
+        """
+        Build the JSON payload for a chat request.
+        Ollama streams by default, so streaming is only enabled when explicitly requested.
+        """
+        kwargs["stream"] = bool(kwargs.get("stream", False))
+        return {
+            "model": model,
+            "messages": [_format_message(message) for message in messages],
+            **kwargs,  # Pass any additional arguments to the API
+        }
 
     def _normalize_response(self, response_data):
         """
         Normalize the API response to a common format (ChatCompletionResponse).
         """
-        normalized_response = ChatCompletionResponse()
-        normalized_response.choices[0].message.content = response_data["message"][
-            "content"
+        message = response_data["message"]
+        tool_calls = [
+            ToolCall(
+                id=f"call_{index}",
+                function=Function(
+                    call["function"]["name"],
+                    json.dumps(call["function"].get("arguments") or {}),
+                ),
+            )
+            for index, call in enumerate(message.get("tool_calls") or ())
+        ]
+        return ChatCompletionResponse(
+            choices=[
+                Choice(
+                    message=Message(
+                        content=message.get("content"),
+                        role=message.get("role") or "assistant",
+                        tool_calls=tool_calls or None,
+                    ),
+                    finish_reason=(
+                        "tool_calls"
+                        if tool_calls
+                        else response_data.get("done_reason") or "stop"
+                    ),
+                )
+            ],
+            usage=self._usage(response_data),
+            model=response_data.get("model"),
+            raw=response_data,
+        )
+
+    def _usage(self, data):
+        """Token counts, reported by Ollama on the response or the final chunk."""
+        if "prompt_eval_count" not in data and "eval_count" not in data:
+            return None
+        return CompletionUsage(data.get("prompt_eval_count"), data.get("eval_count"))
+
+    def _normalize_chunk(self, chunk_data):
+        """
+        Normalize a streamed NDJSON object to a common format (ChatCompletionChunk).
+        """
+        message = chunk_data.get("message") or {}
+        # Ollama streams each tool call whole, in a single chunk.
+        tool_calls = [
+            ChoiceDeltaToolCall(
+                index=index,
+                id=f"call_{index}",
+                function=Function(
+                    call["function"]["name"],
+                    json.dumps(call["function"].get("arguments") or {}),
+                ),
+            )
+            for index, call in enumerate(message.get("tool_calls") or ())
         ]
-        return normalized_response
+        return ChatCompletionChunk(
+            content=message.get("content"),
+            role=message.get("role"),
+            finish_reason=(
+                chunk_data.get("done_reason") if chunk_data.get("done") else None
+            ),
+            usage=self._usage(chunk_data),
+            tool_calls=tool_calls or None,
+        )
@@ -0,0 +1,154 @@
+import os
+
+from aisuite.provider import Provider
+from aisuite.http_client import (
+    HttpClient,
+    iter_sse,
+    aiter_sse,
+    translate_httpx_errors,
+)
+from aisuite.framework import (
+    ChatCompletionResponse,
+    ChatCompletionChunk,
+)
+
+
+class OpenaiCompatibleProvider(Provider):
+    """
+    Provider for any server exposing the OpenAI chat completions API over HTTP
+    (vLLM, llama.cpp server, LM Studio, ...), using pooled httpx clients.
+
+    It is also the base class of the hosted OpenAI-compatible providers (Fireworks,
+    Together, Hugging Face, Azure), which only set the class attributes below and
+    override _url() when the endpoint depends on the model.
+
+    Any endpoint can be added by config alone, under a provider key of your choice:
+
+        client = ai.Client({
+            "vllm": {
+                "type": "openai_compatible",
+                "base_url": "http://localhost:8000/v1",
+            },
+        })
+        client.chat.completions.create("vllm:meta-llama/Llama-3.1-8B-Instruct", ...)
+    """
+
+    # Human readable name and provider key used in error messages.
+    label = "OpenAI-compatible endpoint"
+    name = "openai_compatible"
+    # Endpoint root; "/chat/completions" is appended to it.
+    base_url = None
+    # Environment variable holding the API key, if any.
+    api_key_env = None
+    # The API key is sent as "<auth_header>: <auth_scheme> <api_key>", or without
+    # the scheme when auth_scheme is None.
+    auth_header = "Authorization"
+    auth_scheme = "Bearer"
+    # Whether the model name is sent in the payload.
+    send_model = True
+    # Servers such as llama.cpp ignore n, so n > 1 is emulated unless enabled.
+    supports_n = False
+
+    def __init__(self, **config):
+        """
+        Args:
+            base_url (str): Endpoint root, e.g. "http://localhost:8000/v1".
+            api_key (str): Optional API key.
+            auth_header (str): Header carrying the API key. Defaults to "Authorization".
+            auth_scheme (str): Prefix of the API key in that header, None for none.
+                Defaults to "Bearer".
+            headers (dict): Extra headers sent with every request.
+            supports_n (bool): Whether the server returns n choices itself (vLLM
+                does); otherwise the client makes n calls. Defaults to False.
+            name (str): Name used in error messages.
+            The connection pool options of HttpClient are accepted as well.
+        """
+        self.base_url = config.get("base_url") or self.base_url
+        if not self.base_url:
+            raise ValueError(f"For {self.label}, base_url is required.")
+        self.api_key = config.get("api_key") or (
+            os.getenv(self.api_key_env) if self.api_key_env else None
+        )
+        self.auth_header = config.get("auth_header", self.auth_header)
+        self.auth_scheme = config.get("auth_scheme", self.auth_scheme)
+        self.extra_headers = dict(config.get("headers") or {})
+        self.supports_n = config.get("supports_n", self.supports_n)
+        if "name" in config:
+            self.name = self.label = config["name"]
+
+        # Connections are pooled and kept alive across calls.
+        self.http = HttpClient.from_config(config)
+
+    def chat_completions_create(self, model, messages, **kwargs):
+        url, headers, data = self._prepare_request(model, messages, **kwargs)
+
+        with translate_httpx_errors(self.label, self.name):
+            if data.get("stream"):
+                return self._stream(
+                    self.http.open_stream(url, json=data, headers=headers)
+                )
+
+            response_data = self.http.post_json(url, data, headers=headers)
+
+        return self._normalize_response(response_data)
+
+    async def achat_completions_create(self, model, messages, **kwargs):
+        url, headers, data = self._prepare_request(model, messages, **kwargs)
+
+        with translate_httpx_errors(self.label, self.name):
+            if data.get("stream"):
+                return self._astream(
+                    await self.http.aopen_stream(url, json=data, headers=headers)
+                )
+
+            response_data = await self.http.apost_json(url, data, headers=headers)
+
+        return self._normalize_response(response_data)
+
+    def _stream(self, response):
+        for chunk_data in iter_sse(response):
+            yield self._normalize_chunk(chunk_data)
+
+    async def _astream(self, response):
+        async for chunk_data in aiter_sse(response):
+            yield self._normalize_chunk(chunk_data)
+
+    def close(self):
+        self.http.close()
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    def _url(self, model):
+        return self.base_url.rstrip("/") + "/chat/completions"
+
+    def _headers(self):
+        headers = {"Content-Type": "application/json", **self.extra_headers}
+        if self.api_key:
+            headers[self.auth_header] = (
+                f"{self.auth_scheme} {self.api_key}"
+                if self.auth_scheme
+                else self.api_key
+            )
+        return headers
+
+    def _prepare_request(self, model, messages, **kwargs):
+        """
+        Build the URL, headers and JSON payload for a chat completions request.
+        """
+        data = {"model": model} if self.send_model else {}
+        data["messages"] = messages
+        data.update(kwargs)  # Pass any additional arguments to the API
+        return self._url(model), self._headers(), data
+
+    def _normalize_response(self, response_data):
+        """
+        Normalize the response to a common format (ChatCompletionResponse).
+        """
+        return ChatCompletionResponse.from_openai_dict(response_data)
+
+    def _normalize_chunk(self, chunk_data):
+        """
+        Normalize a streamed chunk to a common format (ChatCompletionChunk).
+        """
+        return ChatCompletionChunk.from_openai_dict(chunk_data)
@@ -1,9 +1,21 @@
-import openai
 import os
-from aisuite.provider import Provider, LLMError
+
+from aisuite.provider import (
+    Provider,
+    anormalize_stream,
+    locked_cached_property,
+    normalize_stream,
+    translate_sdk_errors,
+)
+from aisuite.framework import (
+    ChatCompletionResponse,
+    ChatCompletionChunk,
+)
 
 
 class OpenaiProvider(Provider):
+    supports_n = True
+
     def __init__(self, **config):
         """
         Initialize the OpenAI provider with the given configuration.
@@ -20,14 +32,62 @@ class OpenaiProvider(Provider):
         # infer certain values from the environment variables.
         # Eg: OPENAI_API_KEY, OPENAI_ORG_ID, OPENAI_PROJECT_ID, OPENAI_BASE_URL, etc.
 
-        # Pass the entire config to the OpenAI client constructor
-        self.client = openai.OpenAI(**config)
+        # The entire config is passed to the OpenAI client constructor. The SDK is only
+        # imported, and the clients built, when they are first used.
+        self.config = config
+
+    @locked_cached_property
+    def client(self):
+        import openai
+
+        return openai.OpenAI(**self.config)
+
+    @locked_cached_property
+    def async_client(self):
+        import openai
+
+        return openai.AsyncOpenAI(**self.config)
 
     def chat_completions_create(self, model, messages, **kwargs):
-        # Any exception raised by OpenAI will be returned to the caller.
-        # Maybe we should catch them and raise a custom LLMError.
-        return self.client.chat.completions.create(
-            model=model,
-            messages=messages,
-            **kwargs  # Pass any additional arguments to the OpenAI API
-        )
+        import openai
+
+        # Errors raised by the OpenAI SDK are re-raised as LLMError subclasses.
+        with translate_sdk_errors(openai, "openai"):
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                **kwargs  # Pass any additional arguments to the OpenAI API
+            )
+        if kwargs.get("stream"):
+            return normalize_stream(
+                response,
+                ChatCompletionChunk.from_openai_object,
+                translate_sdk_errors(openai, "openai"),
+            )
+        return ChatCompletionResponse.from_openai_object(response, model)
+
+    async def achat_completions_create(self, model, messages, **kwargs):
+        import openai
+
+        with translate_sdk_errors(openai, "openai"):
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                **kwargs  # Pass any additional arguments to the OpenAI API
+            )
+        if kwargs.get("stream"):
+            return anormalize_stream(
+                response,
+                ChatCompletionChunk.from_openai_object,
+                translate_sdk_errors(openai, "openai"),
+            )
+        return ChatCompletionResponse.from_openai_object(response, model)
+
+    def close(self):
+        if "client" in self.__dict__:
+            self.client.close()
+
+    async def aclose(self):
+        self.close()
+        if "async_client" in self.__dict__:
+            await self.async_client.close()
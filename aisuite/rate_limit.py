@@ -0,0 +1,108 @@
+"""Client-side request and token rate limiting per provider and per model."""
+
+import asyncio
+import threading
+import time
+
+
+def estimate_tokens(messages, kwargs):
+    """
+    Cheap estimate of the tokens a request will consume against a tokens-per-minute
+    limit: roughly four characters per prompt token, plus the requested max_tokens.
+    """
+    characters = 0
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str):
+            characters += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                if isinstance(part, dict) and isinstance(part.get("text"), str):
+                    characters += len(part["text"])
+    return characters // 4 + 1 + (kwargs.get("max_tokens") or 0)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `per_minute / 60` units per second, holding
+    at most `burst` units.
+
+    Callers reserve capacity up front: the amount is debited immediately (the level may
+    go negative) and the caller is told how long to wait before using it. Reservations
+    are therefore served in arrival order, and no lock is held while waiting, so the
+    same bucket can be shared by threads and asyncio tasks.
+    """
+
+    def __init__(self, per_minute, burst=None):
+        self.rate = per_minute / 60.0
+        self.burst = burst if burst is not None else per_minute
+        self.level = self.burst
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount=1):
+        """Debit `amount` units and return the number of seconds to wait before proceeding."""
+        with self._lock:
+            now = time.monotonic()
+            self.level = min(
+                self.burst, self.level + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.level -= amount
+            if self.level >= 0:
+                return 0.0
+            return -self.level / self.rate
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits for one provider, with optional
+    tighter limits for individual models.
+
+    Configured through the "rate_limit" entry of a provider config, e.g.:
+        {
+            "requests_per_minute": 30,
+            "tokens_per_minute": 6000,
+            "models": {"llama3-70b-8192": {"requests_per_minute": 10}},
+        }
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, models=None):
+        self._buckets = self._make_buckets(requests_per_minute, tokens_per_minute)
+        self._model_buckets = {
+            model: self._make_buckets(
+                limits.get("requests_per_minute"), limits.get("tokens_per_minute")
+            )
+            for model, limits in (models or {}).items()
+        }
+
+    @staticmethod
+    def _make_buckets(requests_per_minute, tokens_per_minute):
+        return (
+            TokenBucket(requests_per_minute) if requests_per_minute else None,
+            TokenBucket(tokens_per_minute) if tokens_per_minute else None,
+        )
+
+    def _reserve(self, model_name, tokens):
+        wait = 0.0
+        for requests_bucket, tokens_bucket in (
+            self._buckets,
+            self._model_buckets.get(model_name, (None, None)),
+        ):
+            if requests_bucket is not None:
+                wait = max(wait, requests_bucket.reserve(1))
+            if tokens_bucket is not None:
+                wait = max(wait, tokens_bucket.reserve(tokens))
+        return wait
+
+    def acquire(self, model_name, messages, kwargs):
+        """Block the calling thread until the request fits within the limits."""
+        wait = self._reserve(model_name, estimate_tokens(messages, kwargs))
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, model_name, messages, kwargs):
+        """Wait on the event loop until the request fits within the limits."""
+        wait = self._reserve(model_name, estimate_tokens(messages, kwargs))
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,111 @@
+"""Retry policy with jittered exponential backoff, Retry-After support and deadlines."""
+
+import asyncio
+import random
+import time
+
+from .provider import LLMError, APITimeoutError
+
+
+class RetryPolicy:
+    """
+    Retries calls that fail with a retryable LLMError (rate limits, overload, timeouts,
+    connection failures) and re-raises everything else immediately.
+
+    The wait before retry n is drawn uniformly from [0, min(max_backoff,
+    initial_backoff * multiplier ** n)] ("full jitter"), so concurrent callers that
+    fail together do not retry in lockstep. When the provider sent Retry-After, that
+    delay is used instead, capped at max_backoff.
+
+    With a deadline, the whole call (all attempts and waits) is bounded: no retry is
+    started if its wait would cross the deadline. In async calls every attempt is
+    additionally cancelled once the deadline passes, raising APITimeoutError. Blocking
+    provider calls cannot be interrupted, so in sync calls the deadline is only checked
+    between attempts.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        initial_backoff=0.5,
+        max_backoff=30.0,
+        multiplier=2.0,
+        deadline=None,
+    ):
+        """
+        Args:
+            max_attempts (int): Total number of attempts, including the first one.
+            initial_backoff (float): Upper bound in seconds of the first jittered wait.
+            max_backoff (float): Upper bound in seconds of any single wait.
+            multiplier (float): Growth factor of the backoff bound per attempt.
+            deadline (float): Overall time budget in seconds for one call, or None.
+                Async attempts are cancelled when it passes. Sync attempts are not
+                interrupted: one slow attempt can overrun it by up to the provider's
+                own request timeout, so set that timeout too for a hard bound.
+        """
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.deadline = deadline
+
+    def is_retryable(self, error):
+        return isinstance(error, LLMError) and error.retryable
+
+    def backoff(self, retry_number, error=None):
+        """Return the number of seconds to wait before the given retry (0-based)."""
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        bound = min(
+            self.max_backoff, self.initial_backoff * self.multiplier**retry_number
+        )
+        return random.uniform(0, bound)
+
+    def _next_wait(self, attempt, error, expires_at):
+        """Return the wait before the next attempt, or None if the error must be raised."""
+        if attempt + 1 >= self.max_attempts or not self.is_retryable(error):
+            return None
+        wait = self.backoff(attempt, error)
+        if expires_at is not None and time.monotonic() + wait >= expires_at:
+            return None
+        return wait
+
+    def _expires_at(self):
+        return time.monotonic() + self.deadline if self.deadline is not None else None
+
+    def call(self, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs), retrying retryable failures."""
+        expires_at = self._expires_at()
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                wait = self._next_wait(attempt, e, expires_at)
+                if wait is None:
+                    raise
+            time.sleep(wait)
+            attempt += 1
+
+    async def acall(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs), retrying retryable failures within the deadline."""
+        expires_at = self._expires_at()
+        attempt = 0
+        while True:
+            try:
+                if expires_at is None:
+                    return await fn(*args, **kwargs)
+                remaining = expires_at - time.monotonic()
+                try:
+                    return await asyncio.wait_for(fn(*args, **kwargs), remaining)
+                except asyncio.TimeoutError as e:
+                    raise APITimeoutError(
+                        f"Deadline of {self.deadline}s exceeded."
+                    ) from e
+            except Exception as e:
+                wait = self._next_wait(attempt, e, expires_at)
+                if wait is None:
+                    raise
+            await asyncio.sleep(wait)
+            attempt += 1
@@ -0,0 +1,272 @@
+"""Routing one logical request across several equivalent provider:model targets."""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import threading
+import time
+
+from .provider import LLMError
+
+
+def should_failover(error):
+    """Failover is attempted for retryable provider errors (rate limits, overload, timeouts)."""
+    return isinstance(error, LLMError) and error.retryable
+
+
+class Route:
+    """
+    An ordered list of equivalent "provider:model" targets.
+
+    Targets are tried in order; a target failing with a retryable error hands the
+    request to the next one. Optionally the request is hedged: if the current target
+    has not answered after a delay, a duplicate is sent to the next target and whichever
+    answers first wins, the other being cancelled.
+
+    The hedge delay is either fixed (hedge_after) or the hedge_percentile of the
+    latencies recently observed for the target, e.g. 0.95 to hedge only the slowest 5%.
+    Until min_samples latencies are recorded for a target, hedge_after (if any) is used.
+    """
+
+    def __init__(
+        self,
+        targets,
+        hedge_after=None,
+        hedge_percentile=None,
+        min_samples=20,
+        window=200,
+    ):
+        """
+        Args:
+            targets (list): "provider:model" strings in order of preference.
+            hedge_after (float): Fixed hedge delay in seconds.
+            hedge_percentile (float): Latency percentile (0-1) used as the hedge delay.
+            min_samples (int): Latencies needed before the percentile is trusted.
+            window (int): Number of recent latencies kept per target.
+        """
+        if not targets:
+            raise ValueError("A route needs at least one 'provider:model' target.")
+        self.targets = list(targets)
+        self.hedge_after = hedge_after
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.window = window
+        self._latencies = {target: deque(maxlen=window) for target in self.targets}
+        self._lock = threading.Lock()
+
+    @property
+    def hedging(self):
+        return self.hedge_after is not None or self.hedge_percentile is not None
+
+    def ordered_targets(self):
+        """Return the targets to try for one request, most preferred first."""
+        return list(self.targets)
+
+    def hedge_delay(self, target):
+        """Seconds to wait on target before sending a hedged duplicate, or None."""
+        if self.hedge_percentile is not None:
+            with self._lock:
+                samples = sorted(self._latencies.get(target, ()))
+            if len(samples) >= self.min_samples:
+                index = min(len(samples) - 1, int(self.hedge_percentile * len(samples)))
+                return samples[index]
+        return self.hedge_after
+
+    def on_start(self, target):
+        """Called when a request is sent to target."""
+
+    def on_success(self, target, latency):
+        """Called when target answered successfully after latency seconds."""
+        with self._lock:
+            self._latencies.setdefault(target, deque(maxlen=self.window)).append(
+                latency
+            )
+
+    def on_failure(self, target, latency, error):
+        """Called when target failed (or was cancelled, with error=None)."""
+
+
+def as_route(model):
+    """Accept a Route-like object or a list of "provider:model" strings."""
+    if hasattr(model, "ordered_targets"):
+        return model
+    if isinstance(model, (list, tuple)):
+        return Route(model)
+    raise ValueError(
+        f"Invalid model. Expected 'provider:model', a list of them or a Route, got {model!r}"
+    )
+
+
+def _close_quietly(response):
+    """Release a response nobody will consume (e.g. the losing stream of a hedge)."""
+    close = getattr(response, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
+
+
+def _close_result(future):
+    """Done callback closing the response of a future that lost a hedge."""
+    if not future.cancelled() and future.exception() is None:
+        _close_quietly(future.result())
+
+
+async def _aclose_quietly(response):
+    """Async variant of _close_quietly()."""
+    aclose = getattr(response, "aclose", None)
+    if not callable(aclose):
+        return _close_quietly(response)
+    try:
+        await aclose()
+    except Exception:
+        pass
+
+
+# Pending _aclose_quietly() tasks, referenced until done as the loop only holds weak ones.
+_closing_tasks = set()
+
+
+def _aclose_result(task):
+    """Done callback closing the response of a task that lost a hedge."""
+    if not task.cancelled() and task.exception() is None:
+        closing = asyncio.ensure_future(_aclose_quietly(task.result()))
+        _closing_tasks.add(closing)
+        closing.add_done_callback(_closing_tasks.discard)
+
+
+def _timed_call(route, call, target):
+    route.on_start(target)
+    start = time.monotonic()
+    try:
+        response = call(target)
+    except BaseException as e:
+        route.on_failure(target, time.monotonic() - start, e)
+        raise
+    route.on_success(target, time.monotonic() - start)
+    return response
+
+
+def route_call(route, call):
+    """
+    Run call(target) over the route's targets with failover and optional hedging,
+    returning the first successful response.
+    """
+    targets = route.ordered_targets()
+    last_error = None
+    index = 0
+    while index < len(targets):
+        target = targets[index]
+        delay = route.hedge_delay(target) if index + 1 < len(targets) else None
+        try:
+            if delay is None:
+                return _timed_call(route, call, target)
+            return _hedged_call(route, call, target, targets[index + 1], delay)
+        except Exception as e:
+            if not should_failover(e):
+                raise
+            last_error = e
+        index += 1 if delay is None else 2
+    raise last_error
+
+
+def _hedged_call(route, call, primary, backup, delay):
+    """
+    Call primary; if it has not answered within delay seconds (or fails with a
+    retryable error before that), also call backup. The first success wins.
+    """
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        pending = {executor.submit(_timed_call, route, call, primary)}
+        backup_sent = False
+        error = None
+        while pending:
+            timeout = None if backup_sent else delay
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            winner = next((f for f in done if f.exception() is None), None)
+            if winner is not None:
+                # Threads cannot be interrupted: the losers are left to finish, and the
+                # responses of those that succeed, even at the same time, are closed.
+                for loser in (done | pending) - {winner}:
+                    loser.add_done_callback(_close_result)
+                return winner.result()
+            for future in done:
+                error = future.exception()
+                if not should_failover(error):
+                    raise error
+            if not backup_sent:
+                pending.add(executor.submit(_timed_call, route, call, backup))
+                backup_sent = True
+        raise error
+    finally:
+        executor.shutdown(wait=False)
+
+
+async def _atimed_call(route, call, target):
+    route.on_start(target)
+    start = time.monotonic()
+    try:
+        response = await call(target)
+    except asyncio.CancelledError:
+        route.on_failure(target, time.monotonic() - start, None)
+        raise
+    except BaseException as e:
+        route.on_failure(target, time.monotonic() - start, e)
+        raise
+    route.on_success(target, time.monotonic() - start)
+    return response
+
+
+async def aroute_call(route, call):
+    """Async variant of route_call(); the losing request of a hedge is cancelled."""
+    targets = route.ordered_targets()
+    last_error = None
+    index = 0
+    while index < len(targets):
+        target = targets[index]
+        delay = route.hedge_delay(target) if index + 1 < len(targets) else None
+        try:
+            if delay is None:
+                return await _atimed_call(route, call, target)
+            return await _ahedged_call(route, call, target, targets[index + 1], delay)
+        except Exception as e:
+            if not should_failover(e):
+                raise
+            last_error = e
+        index += 1 if delay is None else 2
+    raise last_error
+
+
+async def _ahedged_call(route, call, primary, backup, delay):
+    """Async variant of _hedged_call(); the losing request is cancelled."""
+    pending = {asyncio.ensure_future(_atimed_call(route, call, primary))}
+    tasks = set(pending)
+    winner = None
+    try:
+        backup_sent = False
+        error = None
+        while pending:
+            timeout = None if backup_sent else delay
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            winner = next((t for t in done if t.exception() is None), None)
+            if winner is not None:
+                return winner.result()
+            for task in done:
+                error = task.exception()
+                if not should_failover(error):
+                    raise error
+            if not backup_sent:
+                task = asyncio.ensure_future(_atimed_call(route, call, backup))
+                pending.add(task)
+                tasks.add(task)
+                backup_sent = True
+        raise error
+    finally:
+        # A loser that finished too, or before its cancellation took effect, has its
+        # response closed.
+        for task in tasks - {winner}:
+            task.cancel()
+            task.add_done_callback(_aclose_result)
@@ -0,0 +1,100 @@
+"""Request coalescing: identical requests in flight at the same time share one call."""
+
+import asyncio
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key: the first caller (the leader) makes
+    the call, and callers arriving before it completes wait for it and receive the same
+    result or exception instead of making their own. Once the call completes, the next
+    caller starts a new one; for reuse across time, use a response cache.
+
+    Sync callers (threads) and async callers (tasks) are coalesced separately, async
+    callers per event loop. An async leader's call runs as its own task, so cancelling
+    one waiting caller, the leader included, does not cancel the others.
+
+    Every caller of a collapsed call receives the same response object.
+    """
+
+    def __init__(self):
+        self._calls = {}  # key -> _Call
+        self._tasks = {}  # (event loop, key) -> asyncio.Task
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.collapsed = 0
+
+    def do(self, key, fn, on_join=None):
+        """
+        Return fn(), or the result of the identical call already in flight. on_join is
+        called when this caller joins another's call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.collapsed += 1
+        if not leader:
+            if on_join is not None:
+                on_join()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key, fn, on_join=None):
+        """Async variant of do(); fn returns an awaitable."""
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            leader = task is None
+            if leader:
+                task = self._tasks[task_key] = loop.create_task(fn())
+                task.add_done_callback(lambda task: self._forget(task_key, task))
+                self.calls += 1
+            else:
+                self.collapsed += 1
+        if not leader and on_join is not None:
+            on_join()
+        return await asyncio.shield(task)
+
+    def _forget(self, task_key, task):
+        with self._lock:
+            self._tasks.pop(task_key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved in case every waiter was cancelled.
+            task.exception()
+
+    def stats(self):
+        """Return the number of calls made and of calls collapsed into them."""
+        total = self.calls + self.collapsed
+        return {
+            "calls": self.calls,
+            "collapsed": self.collapsed,
+            "collapse_rate": self.collapsed / total if total else 0.0,
+        }
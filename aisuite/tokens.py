@@ -0,0 +1,213 @@
+"""
+Local token counting and context windows, to check a prompt fits a model before
+sending it.
+
+OpenAI models are counted exactly with tiktoken when it is installed (`pip install
+tiktoken`). Other providers do not publish their tokenizers, so their prompts are
+counted with an approximation of BPE tokenization, which is usually within 10-20%.
+"""
+
+import functools
+import math
+import re
+
+from .provider import ContextWindowExceededError
+
+# Tokens added by the chat format around every message, and to prime the reply.
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+# Context windows in tokens, by "provider:model" or by "provider:model-prefix".
+# The longest matching entry wins, so dated versions (gpt-4o-2024-08-06) are covered.
+CONTEXT_WINDOWS = {
+    "openai:gpt-4o": 128_000,
+    "openai:gpt-4o-mini": 128_000,
+    "openai:gpt-4-turbo": 128_000,
+    "openai:gpt-4": 8_192,
+    "openai:gpt-4-32k": 32_768,
+    "openai:gpt-3.5-turbo": 16_385,
+    "openai:o1": 200_000,
+    "openai:o1-mini": 128_000,
+    "openai:o1-preview": 128_000,
+    "anthropic:claude-3": 200_000,
+    "anthropic:claude-3-5": 200_000,
+    "aws:anthropic.claude-3": 200_000,
+    "aws:anthropic.claude-3-5": 200_000,
+    "aws:meta.llama3-1": 128_000,
+    "aws:meta.llama3-8b-instruct": 8_192,
+    "aws:meta.llama3-70b-instruct": 8_192,
+    "google:gemini-1.5-pro": 2_097_152,
+    "google:gemini-1.5-flash": 1_048_576,
+    "google:gemini-1.0-pro": 32_760,
+    "groq:llama3-8b-8192": 8_192,
+    "groq:llama3-70b-8192": 8_192,
+    "groq:llama-3.1": 131_072,
+    "groq:mixtral-8x7b-32768": 32_768,
+    "groq:gemma2-9b-it": 8_192,
+    "mistral:mistral-large": 128_000,
+    "mistral:mistral-small": 32_000,
+    "mistral:open-mistral-nemo": 128_000,
+    "mistral:codestral": 32_000,
+}
+
+
+class ApproximateTokenizer:
+    """
+    Approximates BPE tokenization: a word is one token per started `chars_per_token`
+    characters (common words are single tokens), and every punctuation character is
+    one token. The leading space of a word is merged into it, as BPE vocabularies do.
+    """
+
+    _pieces = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+    def __init__(self, chars_per_token=6):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text):
+        return sum(
+            math.ceil(len(piece) / self.chars_per_token)
+            for piece in self._pieces.findall(text)
+        )
+
+
+class TiktokenTokenizer:
+    """Exact counts for OpenAI models, with tiktoken."""
+
+    def __init__(self, model_name):
+        import tiktoken
+
+        try:
+            self.encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            # Model names tiktoken does not know yet use the latest encoding.
+            self.encoding = tiktoken.get_encoding("o200k_base")
+
+    def count(self, text):
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+def _tiktoken_or_approximate(model_name):
+    try:
+        return TiktokenTokenizer(model_name)
+    except ImportError:
+        return ApproximateTokenizer()
+
+
+# Tokenizer factories by provider key, called with the model name. Providers that are
+# not listed use ApproximateTokenizer.
+TOKENIZERS = {
+    "openai": _tiktoken_or_approximate,
+    "azure": _tiktoken_or_approximate,
+}
+
+
+def register_tokenizer(provider_key, factory):
+    """
+    Use factory(model_name) to build the tokenizers of provider_key's models. A
+    tokenizer is any object with a count(text) method returning a number of tokens.
+    """
+    TOKENIZERS[provider_key] = factory
+    get_tokenizer.cache_clear()
+
+
+def register_context_window(model, tokens):
+    """Set the context window of a "provider:model" (or "provider:model-prefix")."""
+    CONTEXT_WINDOWS[model] = tokens
+    context_window.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def get_tokenizer(provider_key, model_name):
+    """Return the tokenizer of a model. Tokenizers are built once and reused."""
+    factory = TOKENIZERS.get(provider_key, lambda model_name: ApproximateTokenizer())
+    return factory(model_name)
+
+
+@functools.lru_cache(maxsize=1024)
+def context_window(provider_key, model_name):
+    """Return the context window of a model in tokens, or None if it is not known."""
+    model = f"{provider_key}:{model_name}"
+    best = None
+    for key, tokens in CONTEXT_WINDOWS.items():
+        if model.startswith(key) and (best is None or len(key) > len(best[0])):
+            best = (key, tokens)
+    return best[1] if best else None
+
+
+def _field(message, name):
+    if isinstance(message, dict):
+        return message.get(name)
+    return getattr(message, name, None)
+
+
+def _message_text(message):
+    content = _field(message, "content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part["text"]
+            for part in content
+            if isinstance(part, dict) and isinstance(part.get("text"), str)
+        )
+    return ""
+
+
+def count_message_tokens(tokenizer, message):
+    tokens = TOKENS_PER_MESSAGE + tokenizer.count(_message_text(message))
+    for call in _field(message, "tool_calls") or ():
+        function = _field(call, "function") or {}
+        tokens += tokenizer.count(_field(function, "name") or "")
+        tokens += tokenizer.count(_field(function, "arguments") or "")
+    return tokens
+
+
+def count_tokens(provider_key, model_name, messages):
+    """Count the prompt tokens of messages for a model."""
+    tokenizer = get_tokenizer(provider_key, model_name)
+    return TOKENS_PER_REPLY + sum(
+        count_message_tokens(tokenizer, message) for message in messages
+    )
+
+
+def preflight(provider_key, model_name, messages, kwargs, mode):
+    """
+    Check that a request fits the model's context window, counting the prompt and the
+    requested max_tokens. Models with an unknown context window are not checked.
+
+    With mode "error", a ContextWindowExceededError is raised when it does not fit.
+    With mode "truncate", the oldest turns (a user message and the replies and tool
+    messages following it) are dropped until it fits, keeping leading system messages
+    and the last turn; the error is raised if that is not enough. Returns the messages
+    to send.
+    """
+    window = context_window(provider_key, model_name)
+    if window is None:
+        return messages
+    budget = window - (kwargs.get("max_tokens") or 0)
+    tokenizer = get_tokenizer(provider_key, model_name)
+    counts = [count_message_tokens(tokenizer, message) for message in messages]
+    total = TOKENS_PER_REPLY + sum(counts)
+    if total <= budget:
+        return messages
+
+    if mode == "truncate":
+        start = 0
+        while start < len(messages) - 1 and _field(messages[start], "role") == "system":
+            start += 1
+        # Only whole turns are dropped: the kept messages start at a user message, so
+        # that no tool result is separated from the call it answers.
+        remaining = total
+        for end in range(start + 1, len(messages)):
+            remaining -= counts[end - 1]
+            if _field(messages[end], "role") == "user" and remaining <= budget:
+                return messages[:start] + messages[end:]
+    elif mode != "error":
+        raise ValueError(f"Unknown preflight mode {mode!r}; use 'error' or 'truncate'.")
+
+    raise ContextWindowExceededError(
+        f"The request needs {total} prompt tokens plus {kwargs.get('max_tokens') or 0} "
+        f"completion tokens, more than the {window}-token context window of "
+        f"{provider_key}:{model_name}.",
+        provider=provider_key,
+    )
@@ -0,0 +1,443 @@
+"""
+Provider-neutral tool definitions, and a loop that runs the tools a model calls.
+
+Tools are described to providers in the OpenAI format,
+
+    {"type": "function", "function": {"name": ..., "description": ..., "parameters": {...}}}
+
+which every provider maps to its own (Anthropic tools, Bedrock toolConfig, Vertex AI
+function declarations); `tool_choice` is accepted in the OpenAI format as well. Plain
+Python functions can be turned into tools with the `tool` decorator, which derives
+the JSON schema of their parameters from their signature:
+
+    @tool(timeout=10, pure=True)
+    def get_weather(city: str, unit: Literal["C", "F"] = "C"):
+        "Return the current weather in a city."
+
+    result = client.chat.completions.run_tools("openai:gpt-4o", messages, [get_weather])
+
+run_tools() sends the conversation, runs the tool calls of each reply concurrently
+(on threads, or as asyncio tasks with AsyncClient) and sends their results back, until
+the model answers without calling a tool or max_turns model calls have been made.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import functools
+import inspect
+import json
+import threading
+import time
+import types
+import typing
+
+from .cache import MemoryCache
+
+DEFAULT_MAX_TURNS = 10
+DEFAULT_MAX_WORKERS = 8
+
+# JSON schema types of the Python annotations understood by the tool decorator.
+JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    tuple: "array",
+    dict: "object",
+}
+
+
+def _json_schema(annotation):
+    """Return the JSON schema of a parameter annotation ({} when unknown)."""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Literal:
+        return {"enum": list(args)}
+    if origin in (typing.Union, types.UnionType):
+        # Optional[X] is described as X; the parameter then has a default anyway.
+        args = [arg for arg in args if arg is not type(None)]
+        return _json_schema(args[0]) if len(args) == 1 else {}
+    if origin in (list, tuple):
+        schema = {"type": "array"}
+        if args and args[-1] is not Ellipsis:
+            schema["items"] = _json_schema(args[0])
+        return schema
+    if origin is dict:
+        return {"type": "object"}
+    if annotation in JSON_TYPES:
+        return {"type": JSON_TYPES[annotation]}
+    return {}
+
+
+def function_parameters(function):
+    """Return the JSON schema of a function's keyword parameters."""
+    try:
+        hints = typing.get_type_hints(function)
+    except NameError:
+        # Annotations referring to names that cannot be resolved are left out.
+        hints = {}
+    properties, required = {}, []
+    for name, parameter in inspect.signature(function).parameters.items():
+        if parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            continue
+        properties[name] = _json_schema(hints.get(name, parameter.annotation))
+        if parameter.default is parameter.empty:
+            required.append(name)
+    return {"type": "object", "properties": properties, "required": required}
+
+
+class Tool:
+    """
+    A function the model can call.
+
+    Args:
+        function: The callable (or coroutine function) run for the model's calls,
+            with the call's arguments as keyword arguments.
+        name (str): Defaults to the function's name.
+        description (str): Defaults to the function's docstring.
+        parameters (dict): JSON schema of the arguments. Defaults to one derived from
+            the function's signature and annotations.
+        timeout (float): Seconds a call may take before the model is told it timed
+            out. A timed out call running on a thread cannot be stopped; it is left
+            to finish in the background.
+        pure (bool): The function's result only depends on its arguments, so results
+            are cached and reused for calls with the same arguments.
+    """
+
+    def __init__(
+        self,
+        function,
+        name=None,
+        description=None,
+        parameters=None,
+        timeout=None,
+        pure=False,
+    ):
+        self.function = function
+        self.name = name or function.__name__
+        self.description = description or inspect.getdoc(function) or ""
+        self.parameters = parameters or function_parameters(function)
+        self.timeout = timeout
+        self.pure = pure
+        self.is_async = inspect.iscoroutinefunction(function)
+        functools.update_wrapper(self, function)
+
+    def __call__(self, *args, **kwargs):
+        return self.function(*args, **kwargs)
+
+    @property
+    def spec(self):
+        """The tool's definition, in the OpenAI format."""
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": self.parameters,
+            },
+        }
+
+    def __repr__(self):
+        return f"Tool({self.name!r})"
+
+
+def tool(function=None, **options):
+    """
+    Decorator turning a function into a Tool; use it bare (@tool) or with the Tool
+    options (@tool(timeout=5, pure=True)).
+    """
+    if function is None:
+        return lambda function: Tool(function, **options)
+    return Tool(function, **options)
+
+
+def as_tool(value):
+    """Return a Tool for a Tool or a plain function."""
+    return value if isinstance(value, Tool) else Tool(value)
+
+
+def tool_specs(tools):
+    """
+    Return tool definitions in the OpenAI format, for a list of Tools, functions and
+    definitions already given as dicts (which are passed through unchanged).
+    """
+    return [
+        value if isinstance(value, dict) else as_tool(value).spec for value in tools
+    ]
+
+
+def tool_message(tool_call_id, content):
+    return {"role": "tool", "tool_call_id": tool_call_id, "content": content}
+
+
+def _result_content(result):
+    """Tool results are sent to the model as text: strings as is, other values as JSON."""
+    if isinstance(result, str):
+        return result
+    return json.dumps(result, ensure_ascii=False, default=str)
+
+
+def _error_content(error):
+    return f"Error: {type(error).__name__}: {error}"
+
+
+class ToolRunner:
+    """
+    Runs the tool calls of a model reply, concurrently, and returns the tool messages
+    answering them, in the order of the calls.
+
+    A call to an unknown tool, with invalid arguments, that raises or that times out
+    is answered with an "Error: ..." message, so that the model can recover from it.
+    Calls of pure tools are answered from the result cache when possible, and
+    identical calls made in one reply only run once.
+
+    Args:
+        tools (list): Tools or plain functions.
+        timeout (float): Default timeout of every tool call, in seconds.
+        max_workers (int): Threads running sync tool calls.
+        cache (aisuite.cache.Cache): Cache of the results of pure tools. Defaults to a
+            MemoryCache; pass one to share it between runners.
+    """
+
+    def __init__(
+        self, tools, timeout=None, max_workers=DEFAULT_MAX_WORKERS, cache=None
+    ):
+        self.tools = {}
+        for value in tools:
+            value = as_tool(value)
+            self.tools[value.name] = value
+        self.specs = [value.spec for value in self.tools.values()]
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else MemoryCache()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="aisuite-tool"
+                )
+            return self._executor
+
+    def close(self):
+        """Shut down the tool threads, without waiting for timed out calls."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _parse(self, call):
+        """Return (tool, arguments, cache key) for a call; raises ValueError if invalid."""
+        tool = self.tools.get(call.function.name)
+        if tool is None:
+            raise ValueError(f"Unknown tool {call.function.name!r}.")
+        try:
+            arguments = json.loads(call.function.arguments or "{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON arguments: {e}") from e
+        if not isinstance(arguments, dict):
+            raise ValueError("Tool arguments must be a JSON object.")
+        key = None
+        if tool.pure:
+            key = json.dumps([tool.name, arguments], sort_keys=True, default=repr)
+        return tool, arguments, key
+
+    def _plan(self, tool_calls):
+        """
+        Return the contents already known (errors and cached results) by call index,
+        and the distinct calls left to run as {run key: (tool, arguments, cache key)}
+        with the run key of each remaining call index.
+        """
+        contents, runs, run_keys = {}, {}, {}
+        for index, call in enumerate(tool_calls):
+            try:
+                tool, arguments, key = self._parse(call)
+            except ValueError as e:
+                contents[index] = _error_content(e)
+                continue
+            if key is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    contents[index] = cached[0]
+                    continue
+            run_key = key if key is not None else index
+            runs.setdefault(run_key, (tool, arguments, key))
+            run_keys[index] = run_key
+        return contents, runs, run_keys
+
+    def _finish(self, tool_calls, contents, results, run_keys, runs):
+        """Store the new pure results and build the tool messages."""
+        for run_key, (ok, content) in results.items():
+            key = runs[run_key][2]
+            if ok and key is not None:
+                self.cache.set(key, (content,))
+        for index, run_key in run_keys.items():
+            contents[index] = results[run_key][1]
+        return [
+            tool_message(call.id, contents[index])
+            for index, call in enumerate(tool_calls)
+        ]
+
+    def _timeout(self, tool):
+        return tool.timeout if tool.timeout is not None else self.timeout
+
+    @staticmethod
+    def _run(tool, arguments):
+        """Run a tool on the current thread, returning (ok, content)."""
+        try:
+            result = tool.function(**arguments)
+            if tool.is_async:
+                result = asyncio.run(result)
+            return True, _result_content(result)
+        except Exception as e:
+            return False, _error_content(e)
+
+    def execute(self, tool_calls):
+        """Run tool calls (ToolCall objects) on threads and return their tool messages."""
+        contents, runs, run_keys = self._plan(tool_calls)
+        if len(runs) == 1:
+            [(run_key, (tool, arguments, _))] = runs.items()
+            if self._timeout(tool) is None and not tool.is_async:
+                # A single call without a timeout runs on the caller's thread.
+                results = {run_key: self._run(tool, arguments)}
+                return self._finish(tool_calls, contents, results, run_keys, runs)
+
+        start = time.monotonic()
+        futures = {
+            run_key: self._get_executor().submit(self._run, tool, arguments)
+            for run_key, (tool, arguments, _) in runs.items()
+        }
+        results = {}
+        for run_key, future in futures.items():
+            tool = runs[run_key][0]
+            timeout = self._timeout(tool)
+            remaining = None
+            if timeout is not None:
+                remaining = max(0.0, start + timeout - time.monotonic())
+            try:
+                results[run_key] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                results[run_key] = (False, _timeout_content(tool, timeout))
+        return self._finish(tool_calls, contents, results, run_keys, runs)
+
+    async def aexecute(self, tool_calls):
+        """
+        Async variant of execute(): coroutine tools run as tasks, sync tools on the
+        runner's threads.
+        """
+        contents, runs, run_keys = self._plan(tool_calls)
+        loop = asyncio.get_running_loop()
+
+        async def run(tool, arguments):
+            timeout = self._timeout(tool)
+            try:
+                # Calling a coroutine function with bad arguments raises right away.
+                if tool.is_async:
+                    call = tool.function(**arguments)
+                else:
+                    call = loop.run_in_executor(
+                        self._get_executor(),
+                        functools.partial(tool.function, **arguments),
+                    )
+                return True, _result_content(await asyncio.wait_for(call, timeout))
+            except asyncio.TimeoutError:
+                return False, _timeout_content(tool, timeout)
+            except Exception as e:
+                return False, _error_content(e)
+
+        outcomes = await asyncio.gather(
+            *(run(tool, arguments) for tool, arguments, _ in runs.values())
+        )
+        results = dict(zip(runs, outcomes))
+        return self._finish(tool_calls, contents, results, run_keys, runs)
+
+
+def _timeout_content(tool, timeout):
+    return f"Error: tool {tool.name!r} timed out after {timeout} seconds."
+
+
+class ToolRunResult:
+    """
+    Outcome of run_tools(): the last response, the whole conversation (the messages
+    given, then every assistant reply and tool message) and the number of model
+    calls made. If the model still called tools after max_turns calls, the last
+    response's finish_reason is "tool_calls" and its calls were not run.
+    """
+
+    def __init__(self, response, messages, turns):
+        self.response = response
+        self.messages = messages
+        self.turns = turns
+
+    @property
+    def content(self):
+        return self.response.choices[0].message.content
+
+    def __repr__(self):
+        return f"ToolRunResult(turns={self.turns}, content={self.content!r})"
+
+
+def _runner(tools, timeout):
+    if isinstance(tools, ToolRunner):
+        return tools, False
+    return ToolRunner(tools, timeout=timeout), True
+
+
+def run_tools(
+    create,
+    model,
+    messages,
+    tools,
+    max_turns=DEFAULT_MAX_TURNS,
+    timeout=None,
+    **kwargs,
+):
+    """
+    Call `create(model, messages, tools=..., **kwargs)` and run the tools called in
+    each reply until the model answers without calling one. tools is a list of Tools
+    and functions, or a ToolRunner to reuse its threads and result cache across runs;
+    timeout is the default timeout of every tool call. Returns a ToolRunResult.
+    """
+    if max_turns < 1:
+        raise ValueError("max_turns must be at least 1.")
+    runner, owned = _runner(tools, timeout)
+    messages = list(messages)
+    try:
+        for turn in range(1, max_turns + 1):
+            response = create(model, messages, tools=runner.specs, **kwargs)
+            message = response.choices[0].message
+            messages.append(message.to_dict())
+            if not message.tool_calls or turn == max_turns:
+                return ToolRunResult(response, messages, turn)
+            messages.extend(runner.execute(message.tool_calls))
+    finally:
+        if owned:
+            runner.close()
+
+
+async def arun_tools(
+    create,
+    model,
+    messages,
+    tools,
+    max_turns=DEFAULT_MAX_TURNS,
+    timeout=None,
+    **kwargs,
+):
+    """Async variant of run_tools(); create is a coroutine function."""
+    if max_turns < 1:
+        raise ValueError("max_turns must be at least 1.")
+    runner, owned = _runner(tools, timeout)
+    messages = list(messages)
+    try:
+        for turn in range(1, max_turns + 1):
+            response = await create(model, messages, tools=runner.specs, **kwargs)
+            message = response.choices[0].message
+            messages.append(message.to_dict())
+            if not message.tool_calls or turn == max_turns:
+                return ToolRunResult(response, messages, turn)
+            messages.extend(await runner.aexecute(message.tool_calls))
+    finally:
+        if owned:
+            runner.close()
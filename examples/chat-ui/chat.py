@@ -7,6 +7,7 @@ from dotenv import load_dotenv, find_dotenv
 
 sys.path.append("../../../aisuite")
 from aisuite.client import Client
+from aisuite.history import Conversation, TokenBudget
 
 # Configure Streamlit to use wide mode and hide the top streamlit menu
 st.set_page_config(layout="wide", menu_items={})
@@ -88,6 +89,8 @@ with open("config.yaml", "r") as file:
 configured_llms = config["llms"]
 load_dotenv(find_dotenv())
 client = Client()
+# Prompt token budget of each request: only the latest turns that fit are sent.
+HISTORY_MAX_TOKENS = 8000
 
 
 # Function to display chat history
@@ -103,26 +106,44 @@ def display_chat_history(chat_history, model_name):
                 st.write(message["content"])
 
 
+# Return the conversation of a chat pane, kept across reruns so that token counts are
+# computed once per message. Switching the pane's model keeps the conversation going;
+# its messages are only recounted for the new model.
+def get_conversation(pane, model_name):
+    model_config = next(llm for llm in configured_llms if llm["name"] == model_name)
+    model = model_config["provider"] + ":" + model_config["model"]
+    conversation = st.session_state.conversations.get(pane)
+    if conversation is None or conversation.model != model:
+        st.session_state.conversations[pane] = Conversation(
+            client,
+            model,
+            policy=TokenBudget(max_tokens=HISTORY_MAX_TOKENS),
+            messages=conversation.messages if conversation else None,
+        )
+    return st.session_state.conversations[pane]
+
+
 # Helper function to query each LLM
-def query_llm(model_config, chat_history):
-    print(f"Querying {model_config['name']} with {chat_history}")
+def query_llm(conversation, model_name, user_query):
+    print(f"Querying {model_name} with {user_query}")
     try:
-        model = model_config["provider"] + ":" + model_config["model"]
-        response = client.chat.completions.create(model=model, messages=chat_history)
-        print(
-            f"Response from {model_config['name']}: {response.choices[0].message.content}"
-        )
-        return response.choices[0].message.content
+        response = conversation.send(user_query)
+        print(f"Response from {model_name}: {response.choices[0].message.content}")
     except Exception as e:
-        st.error(f"Error querying {model_config['name']}: {e}")
-        return "Error with LLM response."
+        st.error(f"Error querying {model_name}: {e}")
+        conversation.history.extend(
+            [
+                {"role": "user", "content": user_query},
+                {"role": "assistant", "content": "Error with LLM response."},
+            ]
+        )
 
 
 # Initialize session states
-if "chat_history_1" not in st.session_state:
-    st.session_state.chat_history_1 = []
-if "chat_history_2" not in st.session_state:
-    st.session_state.chat_history_2 = []
+if "conversations" not in st.session_state:
+    st.session_state.conversations = {}
+if "pending_query" not in st.session_state:
+    st.session_state.pending_query = None
 if "is_processing" not in st.session_state:
     st.session_state.is_processing = False
 if "use_comparison_mode" not in st.session_state:
@@ -151,6 +172,19 @@ with llm_col2:
             index=1 if len(configured_llms) > 1 else 0,
         )
 
+conversation_1 = get_conversation(1, selected_model_1)
+if st.session_state.use_comparison_mode:
+    conversation_2 = get_conversation(2, selected_model_2)
+
+
+# The messages of a pane, with the query being processed.
+def chat_history(conversation):
+    pending = st.session_state.pending_query
+    if pending is None:
+        return conversation.messages
+    return conversation.messages + [{"role": "user", "content": pending}]
+
+
 # Display Chat Histories first, always
 # Middle Section - Display Chat Histories
 if st.session_state.use_comparison_mode:
@@ -158,15 +192,15 @@ if st.session_state.use_comparison_mode:
     with col1:
         chat_container = st.container(height=500)
         with chat_container:
-            display_chat_history(st.session_state.chat_history_1, selected_model_1)
+            display_chat_history(chat_history(conversation_1), selected_model_1)
     with col2:
         chat_container = st.container(height=500)
         with chat_container:
-            display_chat_history(st.session_state.chat_history_2, selected_model_2)
+            display_chat_history(chat_history(conversation_2), selected_model_2)
 else:
     chat_container = st.container(height=500)
     with chat_container:
-        display_chat_history(st.session_state.chat_history_1, selected_model_1)
+        display_chat_history(chat_history(conversation_1), selected_model_1)
 
 # Bottom Section - User Input
 st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
@@ -213,8 +247,7 @@ with col2:
 
 with col3:
     if st.button("Reset Chat", use_container_width=True):
-        st.session_state.chat_history_1 = []
-        st.session_state.chat_history_2 = []
+        st.session_state.conversations = {}
         st.rerun()
 
 # Handle send button click and processing
@@ -222,31 +255,20 @@ if send_button and user_query and not st.session_state.is_processing:
     # Set processing state
     st.session_state.is_processing = True
 
-    # Append user's message to chat histories first
-    st.session_state.chat_history_1.append({"role": "user", "content": user_query})
-    if st.session_state.use_comparison_mode:
-        st.session_state.chat_history_2.append({"role": "user", "content": user_query})
+    # Show the user's message in the chat histories first
+    st.session_state.pending_query = user_query
 
     st.rerun()
 
 # Handle the actual processing
-if st.session_state.is_processing and user_query:
+if st.session_state.is_processing and st.session_state.pending_query:
     # Query the selected LLM(s)
-    model_config_1 = next(
-        llm for llm in configured_llms if llm["name"] == selected_model_1
-    )
-    response_1 = query_llm(model_config_1, st.session_state.chat_history_1)
-    st.session_state.chat_history_1.append({"role": "assistant", "content": response_1})
-
+    query = st.session_state.pending_query
+    query_llm(conversation_1, selected_model_1, query)
     if st.session_state.use_comparison_mode:
-        model_config_2 = next(
-            llm for llm in configured_llms if llm["name"] == selected_model_2
-        )
-        response_2 = query_llm(model_config_2, st.session_state.chat_history_2)
-        st.session_state.chat_history_2.append(
-            {"role": "assistant", "content": response_2}
-        )
+        query_llm(conversation_2, selected_model_2, query)
 
     # Reset processing state
     st.session_state.is_processing = False
+    st.session_state.pending_query = None
     st.rerun()
@@ -0,0 +1,121 @@
+"""
+JSON codec microbenchmark: time to encode a large chat request and to decode and
+normalize a large chat completion response, for every installed codec.
+
+The request carries a long conversation history and the response a long completion
+with tool calls, which is where JSON handling shows up next to network time.
+
+    python -m tests.benchmarks.bench_codec [--messages N] [--repeat N] [--json results.json]
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from aisuite import codec
+from aisuite.framework import ChatCompletionResponse
+
+
+def make_request(messages):
+    return {
+        "model": "model",
+        "messages": [
+            {
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": f"Message {i}: " + "lorem ipsum dolor sit amet é " * 40,
+            }
+            for i in range(messages)
+        ],
+        "temperature": 0.7,
+        "stream": False,
+    }
+
+
+def make_response(messages):
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "model": "model",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "tool_calls",
+                "message": {
+                    "role": "assistant",
+                    "content": "lorem ipsum dolor sit amet é " * 40 * messages,
+                    "tool_calls": [
+                        {
+                            "id": f"call_{i}",
+                            "type": "function",
+                            "function": {
+                                "name": "lookup",
+                                "arguments": json.dumps({"query": "x" * 200, "n": i}),
+                            },
+                        }
+                        for i in range(messages // 10)
+                    ],
+                },
+            }
+        ],
+        "usage": {"prompt_tokens": 1000, "completion_tokens": 1000},
+    }
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples) * 1e6, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    request = make_request(args.messages)
+    body = json.dumps(make_response(args.messages)).encode()
+    print(
+        f"request: {len(json.dumps(request)) // 1024} KiB, "
+        f"response: {len(body) // 1024} KiB"
+    )
+
+    previous = codec.get_codec()
+    results = {}
+    for name in codec.CODECS:
+        try:
+            codec.set_codec(name)
+        except ImportError:
+            results[name] = {"error": "not installed"}
+            continue
+        results[name] = {
+            "encode_us": timed(lambda: codec.dumps(request), args.repeat),
+            "decode_us": timed(lambda: codec.loads(body), args.repeat),
+            "decode_normalize_us": timed(
+                lambda: ChatCompletionResponse.from_openai_dict(codec.loads(body)),
+                args.repeat,
+            ),
+        }
+    codec.set_codec(previous)
+
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:8} {result['error']}")
+        else:
+            print(
+                f"{name:8} encode {result['encode_us']:10.1f} us  "
+                f"decode {result['decode_us']:10.1f} us  "
+                f"decode+normalize {result['decode_normalize_us']:10.1f} us"
+            )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
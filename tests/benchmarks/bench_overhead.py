@@ -0,0 +1,332 @@
+"""
+Library overhead benchmark: what aisuite (and the provider SDK under it) adds on top of
+the network, for every provider, against the local fake servers of fake_servers.py.
+
+Per provider:
+
+- call_us / raw_us / overhead_us: median time of a completion through the client,
+  of the same HTTP exchange made with a bare keep-alive httpx client, and their
+  difference.
+- throughput_rps / athroughput_rps: completed calls per second with --concurrency
+  threads (Client) or tasks (AsyncClient), against a server answering after
+  --latency seconds.
+- memory_per_request_kib: Python memory held per in-flight async request, measured
+  with tracemalloc while --concurrency requests wait for the server.
+- ttft_us / raw_ttft_us: median time to the first streamed content chunk, through
+  the client and with bare httpx.
+
+Results can be written as JSON and compared with a previous run:
+
+    python -m tests.benchmarks.bench_overhead [--json new.json] [--compare old.json] [providers...]
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+import aisuite
+from aisuite import codec
+
+from .fake_servers import FakeProviderServer
+
+GOOGLE_PROJECT = "bench"
+GOOGLE_REGION = "us-central1"
+MESSAGES = [
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "content": "Tell me about benchmarks. " * 20},
+]
+
+
+def provider_setups(url):
+    """
+    Return {provider: (config, model, raw_path)}: the provider config pointing at the
+    fake server, the model to ask for, and the path the same request is sent to with
+    bare httpx.
+    """
+    openai_path = "/v1/chat/completions"
+    return {
+        "openai": ({"api_key": "x", "base_url": f"{url}/v1", "max_retries": 0}, "model", openai_path),
+        "groq": ({"api_key": "x", "base_url": url, "max_retries": 0}, "model", "/openai/v1/chat/completions"),
+        "mistral": ({"api_key": "x", "server_url": url}, "model", openai_path),
+        "fireworks": ({"api_key": "x", "base_url": f"{url}/v1"}, "model", openai_path),
+        "together": ({"api_key": "x", "base_url": f"{url}/v1"}, "model", openai_path),
+        "huggingface": ({"token": "x", "base_url": f"{url}/models"}, "model", "/models/model/v1/chat/completions"),
+        "azure": ({"api_key": "x", "base_url": f"{url}/v1"}, "model", openai_path),
+        "openai_compatible": ({"base_url": f"{url}/v1"}, "model", openai_path),
+        "anthropic": ({"api_key": "x", "base_url": url, "max_retries": 0}, "model", "/v1/messages"),
+        "ollama": ({"api_url": url}, "model", "/api/chat"),
+        "aws": ({"region_name": "us-west-2"}, "anthropic.claude-3-haiku", "/model/anthropic.claude-3-haiku/converse"),
+        "google": (
+            {"project_id": GOOGLE_PROJECT, "region": GOOGLE_REGION, "application_credentials": "unused"},
+            "gemini-1.5-flash",
+            f"/v1/projects/{GOOGLE_PROJECT}/locations/{GOOGLE_REGION}/publishers/google/models/gemini-1.5-flash:generateContent",
+        ),
+    }  # fmt: skip
+
+
+def point_sdks_at(url):
+    """Send the Bedrock and Vertex AI SDK requests to the fake server."""
+    os.environ.update(
+        AWS_ENDPOINT_URL=url,
+        AWS_ACCESS_KEY_ID="x",
+        AWS_SECRET_ACCESS_KEY="x",
+        AWS_MAX_ATTEMPTS="1",
+        NO_PROXY="127.0.0.1",
+    )
+    try:
+        import vertexai
+        from google.auth.credentials import AnonymousCredentials
+    except ImportError:
+        return
+    from aisuite.providers import google_provider
+
+    # The provider initializes Vertex AI only once per project and region, so this
+    # REST configuration is the one its requests use.
+    vertexai.init(
+        project=GOOGLE_PROJECT,
+        location=GOOGLE_REGION,
+        api_transport="rest",
+        api_endpoint=url,
+        credentials=AnonymousCredentials(),
+    )
+    google_provider._vertexai_initialized_for = (GOOGLE_PROJECT, GOOGLE_REGION)
+
+
+def median_us(samples):
+    return round(statistics.median(samples) * 1e6, 1)
+
+
+def measure_overhead(client, model, raw, repeat):
+    """Alternate client and bare calls, so both see the same server conditions."""
+    calls, raws = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.chat.completions.create(model, MESSAGES, max_tokens=64)
+        calls.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        raw()
+        raws.append(time.perf_counter() - start)
+    return {
+        "call_us": median_us(calls),
+        "raw_us": median_us(raws),
+        "overhead_us": round(median_us(calls) - median_us(raws), 1),
+    }
+
+
+def measure_throughput(client, model, concurrency, calls):
+    def call(_):
+        client.chat.completions.create(model, MESSAGES, max_tokens=64)
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        start = time.perf_counter()
+        list(executor.map(call, range(calls)))
+    return round(calls / (time.perf_counter() - start), 1)
+
+
+async def ameasure_throughput(client, model, concurrency, calls):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with semaphore:
+            await client.chat.completions.create(model, MESSAGES, max_tokens=64)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    return round(calls / (time.perf_counter() - start), 1)
+
+
+async def ameasure_memory(client, model, server, concurrency):
+    """Memory held while `concurrency` requests wait for a slow server."""
+    # One complete call first, so one-time setup is not counted.
+    await client.chat.completions.create(model, MESSAGES, max_tokens=64)
+    latency, server.latency = server.latency, 0.5
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tasks = [
+            asyncio.ensure_future(
+                client.chat.completions.create(model, MESSAGES, max_tokens=64)
+            )
+            for _ in range(concurrency)
+        ]
+        await asyncio.sleep(0.25)
+        during = tracemalloc.get_traced_memory()[0]
+        await asyncio.gather(*tasks)
+    finally:
+        tracemalloc.stop()
+        server.latency = latency
+    return round((during - before) / concurrency / 1024, 1)
+
+
+def measure_ttft(client, model, raw_stream, repeat):
+    ttfts, raws = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stream = iter(
+            client.chat.completions.create(model, MESSAGES, max_tokens=64, stream=True)
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                ttfts.append(time.perf_counter() - start)
+                break
+        for _ in stream:
+            pass
+        raws.append(raw_stream())
+    return {"ttft_us": median_us(ttfts), "raw_ttft_us": median_us(raws)}
+
+
+def bench_provider(key, server, setup, args, http):
+    config, model, raw_path = setup
+    model = f"{key}:{model}"
+    raw_url = server.url + raw_path
+    body = {"model": "model", "messages": MESSAGES, "max_tokens": 64}
+
+    def raw():
+        response = http.post(raw_url, content=codec.dumps(body))
+        response.raise_for_status()
+        return codec.loads(response.content)
+
+    def raw_stream():
+        stream_url = raw_url.replace("/converse", "/converse-stream").replace(
+            ":generateContent", ":streamGenerateContent"
+        )
+        start = time.perf_counter()
+        with http.stream(
+            "POST", stream_url, content=codec.dumps({**body, "stream": True})
+        ) as response:
+            elapsed = None
+            for _ in response.iter_raw():
+                if elapsed is None:
+                    elapsed = time.perf_counter() - start
+        return elapsed
+
+    server.latency, server.chunk_interval = 0.0, 0.0
+    result = {}
+    with aisuite.Client({key: config}) as client:
+        for _ in range(args.warmup):
+            client.chat.completions.create(model, MESSAGES, max_tokens=64)
+            raw()
+        result.update(measure_overhead(client, model, raw, args.repeat))
+        result.update(measure_ttft(client, model, raw_stream, args.repeat))
+        server.latency = args.latency
+        result["throughput_rps"] = measure_throughput(
+            client, model, args.concurrency, args.calls
+        )
+        server.latency = 0.0
+
+    async def run_async():
+        client = aisuite.AsyncClient({key: config})
+        try:
+            server.latency = args.latency
+            result["athroughput_rps"] = await ameasure_throughput(
+                client, model, args.concurrency, args.calls
+            )
+            server.latency = 0.0
+            result["memory_per_request_kib"] = await ameasure_memory(
+                client, model, server, args.concurrency
+            )
+        finally:
+            await client.aclose()
+
+    asyncio.run(run_async())
+    return result
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "codec": codec.get_codec(),
+        "args": {
+            name: getattr(args, name)
+            for name in ("repeat", "latency", "concurrency", "calls")
+        },
+    }
+
+
+def compare(results, baseline):
+    """Print every metric next to the baseline run's, with the relative change."""
+    print(f"\ncompared with {baseline['meta'].get('commit')}:")
+    for key, result in results.items():
+        old = baseline["results"].get(key, {})
+        for metric, value in result.items():
+            if metric == "error" or not isinstance(old.get(metric), (int, float)):
+                continue
+            change = (value - old[metric]) / old[metric] * 100 if old[metric] else 0
+            print(
+                f"{key:18} {metric:24} {old[metric]:12.1f} -> {value:12.1f} ({change:+.1f}%)"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.02,
+        help="Server latency in seconds for the throughput runs.",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--json", help="Also write the results to this file.")
+    parser.add_argument("--compare", help="A previous --json file to compare with.")
+    parser.add_argument("providers", nargs="*")
+    args = parser.parse_args()  # fmt: skip
+
+    results = {}
+    with FakeProviderServer() as server, httpx.Client() as http:
+        setups = provider_setups(server.url)
+        point_sdks_at(server.url)
+        for key in args.providers or list(setups):
+            try:
+                results[key] = bench_provider(key, server, setups[key], args, http)
+            except Exception as e:
+                # Typically the provider's SDK is not installed.
+                results[key] = {"error": f"{type(e).__name__}: {e}"}
+
+    for key, result in results.items():
+        if "error" in result:
+            print(f"{key:18} error: {result['error']}")
+            continue
+        print(
+            f"{key:18} overhead {result['overhead_us']:8.1f} us  "
+            f"ttft {result['ttft_us']:8.1f} us (raw {result['raw_ttft_us']:.1f})  "
+            f"{result['throughput_rps']:7.1f} rps sync  "
+            f"{result['athroughput_rps']:7.1f} rps async  "
+            f"{result['memory_per_request_kib']:6.1f} KiB/request"
+        )
+    output = {"meta": metadata(args), "results": results}
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
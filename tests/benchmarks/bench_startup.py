@@ -0,0 +1,133 @@
+"""
+Cold-start benchmark: time to `import aisuite` and, per provider, time to the first
+completed call.
+
+Every measurement runs in a fresh interpreter, so module imports are not shared
+between runs. Provider calls are pointed at a closed local port (or made without
+credentials), so the first call fails fast without network traffic: what is measured
+is the client-side cost of the first request (importing the provider and its SDK,
+building the SDK client and sending the request), not the provider's latency.
+The google figure also includes Application Default Credentials discovery, which
+probes the GCE metadata server when no real credentials are available.
+
+    python -m tests.benchmarks.bench_startup [--repeat N] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Nothing listens on the discard port, so requests are refused immediately.
+DEAD_URL = "http://127.0.0.1:9"
+
+PROVIDER_CONFIGS = {
+    "openai": {"api_key": "x", "base_url": DEAD_URL, "max_retries": 0},
+    "anthropic": {"api_key": "x", "base_url": DEAD_URL, "max_retries": 0},
+    "groq": {"api_key": "x", "base_url": DEAD_URL, "max_retries": 0},
+    "mistral": {"api_key": "x", "server_url": DEAD_URL},
+    "ollama": {"api_url": DEAD_URL},
+    "openai_compatible": {"base_url": DEAD_URL},
+    "fireworks": {"api_key": "x"},
+    "together": {"api_key": "x"},
+    "huggingface": {"token": "x"},
+    "azure": {"api_key": "x", "base_url": DEAD_URL},
+    "aws": {"region_name": "us-west-2"},
+    "google": {
+        "project_id": "x",
+        "region": "us-central1",
+        "application_credentials": "x",
+    },
+}
+
+# Route every request through a dead proxy and keep SDKs from retrying or looking for
+# real credentials and cloud metadata servers.
+ENVIRONMENT = {
+    "HTTP_PROXY": DEAD_URL,
+    "HTTPS_PROXY": DEAD_URL,
+    "AWS_MAX_ATTEMPTS": "1",
+    "AWS_ACCESS_KEY_ID": "x",
+    "AWS_SECRET_ACCESS_KEY": "x",
+    "AWS_ENDPOINT_URL": DEAD_URL,
+}
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import aisuite
+print(time.perf_counter() - start)
+"""
+
+FIRST_CALL_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import aisuite
+client = aisuite.Client({{{key!r}: json.loads(sys.argv[1])}})
+try:
+    client.chat.completions.create(
+        {key!r} + ":model", messages=[{{"role": "user", "content": "Hi"}}], max_tokens=1
+    )
+except Exception:
+    pass
+print(time.perf_counter() - start)
+"""
+
+
+def run(script, *args):
+    env = dict(os.environ, **ENVIRONMENT)
+    output = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Also write the results to this file.")
+    parser.add_argument("providers", nargs="*", default=sorted(PROVIDER_CONFIGS))
+    args = parser.parse_args()
+
+    results = {
+        "import_aisuite": summarize([run(IMPORT_SCRIPT) for _ in range(args.repeat)])
+    }
+    for key in args.providers:
+        script = FIRST_CALL_SCRIPT.format(key=key)
+        config = json.dumps(PROVIDER_CONFIGS[key])
+        try:
+            samples = [run(script, config) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            # Typically the provider's SDK is not installed.
+            results[f"first_call:{key}"] = {"error": e.stderr.strip().splitlines()[-1]}
+            continue
+        results[f"first_call:{key}"] = summarize(samples)
+
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:28} error: {result['error']}")
+        else:
+            print(
+                f"{name:28} {result['median_ms']:8.1f} ms "
+                f"(min {result['min_ms']:.1f}, max {result['max_ms']:.1f})"
+            )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
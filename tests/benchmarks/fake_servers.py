@@ -0,0 +1,332 @@
+"""
+Local fake provider server for benchmarks: one HTTP server answering the chat
+endpoints of every provider aisuite supports, with configurable latency and
+streaming, so that what is measured is aisuite and the provider SDKs rather than the
+network or the model.
+
+Endpoints, by request path:
+
+- .../chat/completions: OpenAI-compatible (openai, groq, mistral, fireworks, together,
+  huggingface, azure, openai_compatible), JSON or Server-Sent Events.
+- /api/chat: Ollama, JSON or newline-delimited JSON.
+- /v1/messages: Anthropic Messages, JSON or Server-Sent Events.
+- /model/<id>/converse and /model/<id>/converse-stream: Bedrock Converse, JSON or AWS
+  event stream.
+- ...:generateContent and ...:streamGenerateContent: Vertex AI REST, JSON or a
+  streamed JSON array.
+
+Requests are not validated and credentials are ignored.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import binascii
+import json
+import struct
+import threading
+import time
+
+USAGE = {"prompt": 12, "completion": 24}
+
+
+class FakeProviderServer(ThreadingHTTPServer):
+    """
+    Attributes, which may be changed between measurements:
+        latency (float): Seconds before the response (or the first streamed chunk).
+        chunks (int): Number of content chunks in a streamed response.
+        chunk_interval (float): Seconds between streamed chunks.
+        words (int): Words in the completion.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, latency=0.0, chunks=16, chunk_interval=0.0, words=64):
+        super().__init__(("127.0.0.1", 0), FakeProviderHandler)
+        self.latency = latency
+        self.chunks = chunks
+        self.chunk_interval = chunk_interval
+        self.words = words
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def text(self):
+        return " ".join(["token"] * self.words)
+
+    def pieces(self):
+        """Split the completion into `chunks` streamed pieces."""
+        words = ["token "] * self.words
+        size = max(1, -(-len(words) // self.chunks))
+        return ["".join(words[i : i + size]) for i in range(0, len(words), size)]
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without TCP_NODELAY the body waits for
+    # the client's delayed ACK (about 40ms on Linux).
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.split("?")[0]
+        time.sleep(self.server.latency)
+
+        if path.endswith("/chat/completions"):
+            if request.get("stream"):
+                self._stream("text/event-stream", openai_stream(self.server))
+            else:
+                self._json(openai_response(self.server))
+        elif path == "/api/chat":
+            if request.get("stream"):
+                self._stream("application/x-ndjson", ollama_stream(self.server))
+            else:
+                self._json(ollama_response(self.server))
+        elif path == "/v1/messages":
+            if request.get("stream"):
+                self._stream("text/event-stream", anthropic_stream(self.server))
+            else:
+                self._json(anthropic_response(self.server))
+        elif path.endswith("/converse"):
+            self._json(bedrock_response(self.server))
+        elif path.endswith("/converse-stream"):
+            self._stream(
+                "application/vnd.amazon.eventstream", bedrock_stream(self.server)
+            )
+        elif path.endswith(":generateContent"):
+            self._json(vertex_response(self.server, self.server.text()))
+        elif path.endswith(":streamGenerateContent"):
+            self._stream("application/json", vertex_stream(self.server))
+        else:
+            self._json({"error": {"message": f"Unknown path {path}"}}, status=404)
+
+    def _json(self, body, status=200):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, content_type, chunks):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, chunk in enumerate(chunks):
+            if index and self.server.chunk_interval:
+                time.sleep(self.server.chunk_interval)
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def _sse(data, event=None):
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n".encode()
+
+
+def openai_response(server):
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "model",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": server.text()},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": USAGE["prompt"],
+            "completion_tokens": USAGE["completion"],
+            "total_tokens": USAGE["prompt"] + USAGE["completion"],
+        },
+    }
+
+
+def openai_stream(server):
+    def chunk(delta, finish_reason=None):
+        return _sse(
+            {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "model",
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+        )
+
+    yield chunk({"role": "assistant", "content": ""})
+    for piece in server.pieces():
+        yield chunk({"content": piece})
+    yield chunk({}, "stop")
+    yield b"data: [DONE]\n\n"
+
+
+def ollama_response(server):
+    return {
+        "model": "model",
+        "message": {"role": "assistant", "content": server.text()},
+        "done": True,
+        "done_reason": "stop",
+        "prompt_eval_count": USAGE["prompt"],
+        "eval_count": USAGE["completion"],
+    }
+
+
+def ollama_stream(server):
+    for piece in server.pieces():
+        message = {"role": "assistant", "content": piece}
+        yield json.dumps({"model": "model", "message": message, "done": False}).encode()
+        yield b"\n"
+    final = ollama_response(server)
+    final["message"]["content"] = ""
+    yield json.dumps(final).encode() + b"\n"
+
+
+def anthropic_response(server):
+    return {
+        "id": "msg_bench",
+        "type": "message",
+        "role": "assistant",
+        "model": "model",
+        "content": [{"type": "text", "text": server.text()}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": USAGE["prompt"],
+            "output_tokens": USAGE["completion"],
+        },
+    }
+
+
+def anthropic_stream(server):
+    message = anthropic_response(server)
+    message.update(content=[], stop_reason=None)
+    message["usage"]["output_tokens"] = 1
+    yield _sse({"type": "message_start", "message": message}, "message_start")
+    yield _sse(
+        {
+            "type": "content_block_start",
+            "index": 0,
+            "content_block": {"type": "text", "text": ""},
+        },
+        "content_block_start",
+    )
+    for piece in server.pieces():
+        yield _sse(
+            {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": piece},
+            },
+            "content_block_delta",
+        )
+    yield _sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+    yield _sse(
+        {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": USAGE["completion"]},
+        },
+        "message_delta",
+    )
+    yield _sse({"type": "message_stop"}, "message_stop")
+
+
+def bedrock_response(server):
+    return {
+        "output": {
+            "message": {"role": "assistant", "content": [{"text": server.text()}]}
+        },
+        "stopReason": "end_turn",
+        "usage": {
+            "inputTokens": USAGE["prompt"],
+            "outputTokens": USAGE["completion"],
+            "totalTokens": USAGE["prompt"] + USAGE["completion"],
+        },
+        "metrics": {"latencyMs": 1},
+    }
+
+
+def event_stream_message(event_type, payload):
+    """Encode one message of the AWS event stream binary format."""
+    headers = b""
+    for name, value in (
+        (":event-type", event_type),
+        (":content-type", "application/json"),
+        (":message-type", "event"),
+    ):
+        name, value = name.encode(), value.encode()
+        headers += struct.pack("B", len(name)) + name
+        headers += struct.pack("!BH", 7, len(value)) + value  # 7: string header
+    body = json.dumps(payload).encode()
+    total = 12 + len(headers) + len(body) + 4
+    prelude = struct.pack("!II", total, len(headers))
+    prelude += struct.pack("!I", binascii.crc32(prelude))
+    message = prelude + headers + body
+    return message + struct.pack("!I", binascii.crc32(message))
+
+
+def bedrock_stream(server):
+    yield event_stream_message("messageStart", {"role": "assistant"})
+    for piece in server.pieces():
+        yield event_stream_message(
+            "contentBlockDelta", {"contentBlockIndex": 0, "delta": {"text": piece}}
+        )
+    yield event_stream_message("contentBlockStop", {"contentBlockIndex": 0})
+    yield event_stream_message("messageStop", {"stopReason": "end_turn"})
+    response = bedrock_response(server)
+    yield event_stream_message(
+        "metadata", {"usage": response["usage"], "metrics": response["metrics"]}
+    )
+
+
+def vertex_response(server, text, finish_reason="STOP"):
+    candidate = {"content": {"role": "model", "parts": [{"text": text}]}}
+    if finish_reason:
+        candidate["finishReason"] = finish_reason
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {
+            "promptTokenCount": USAGE["prompt"],
+            "candidatesTokenCount": USAGE["completion"],
+            "totalTokenCount": USAGE["prompt"] + USAGE["completion"],
+        },
+    }
+
+
+def vertex_stream(server):
+    pieces = server.pieces()
+    for index, piece in enumerate(pieces):
+        last = index == len(pieces) - 1
+        response = vertex_response(server, piece, "STOP" if last else None)
+        yield (b"[" if index == 0 else b",") + json.dumps(response).encode()
+    yield b"]"
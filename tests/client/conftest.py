@@ -0,0 +1,17 @@
+import pytest
+
+from aisuite.provider import ProviderFactory
+
+
+@pytest.fixture
+def register_provider():
+    """Register providers for the duration of a test."""
+    registered = []
+
+    def register(provider_key, provider_class):
+        ProviderFactory.register_provider(provider_key, provider_class)
+        registered.append(provider_key)
+
+    yield register
+    for provider_key in registered:
+        ProviderFactory.unregister_provider(provider_key)
@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from aisuite import AsyncClient
+
+
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "Who won the world series in 2020?"},
+        ]
+
+    @patch(
+        "aisuite.providers.openai_provider.OpenaiProvider.achat_completions_create",
+        new_callable=AsyncMock,
+    )
+    async def test_async_chat_completions(self, mock_openai):
+        mock_openai.return_value = "OpenAI Response"
+
+        client = AsyncClient({"openai": {"api_key": "test_openai_api_key"}})
+        response = await client.chat.completions.create(
+            "openai:gpt-4o", messages=self.messages, temperature=0.2
+        )
+
+        self.assertEqual(response, "OpenAI Response")
+        mock_openai.assert_awaited_once_with("gpt-4o", self.messages, temperature=0.2)
+
+    @patch("aisuite.providers.aws_provider.AwsProvider.chat_completions_create")
+    async def test_thread_fallback_for_sync_providers(self, mock_bedrock):
+        mock_bedrock.return_value = "AWS Bedrock Response"
+
+        client = AsyncClient({"aws": {"region_name": "us-west-2"}})
+        response = await client.chat.completions.create(
+            "aws:claude-v3", messages=self.messages
+        )
+
+        self.assertEqual(response, "AWS Bedrock Response")
+        mock_bedrock.assert_called_once_with("claude-v3", self.messages)
+
+    @patch("aisuite.providers.aws_provider.AwsProvider.chat_completions_create")
+    async def test_thread_fallback_streaming(self, mock_bedrock):
+        mock_bedrock.return_value = iter(["Hel", "lo"])
+
+        client = AsyncClient({"aws": {"region_name": "us-west-2"}})
+        stream = await client.chat.completions.create(
+            "aws:claude-v3", messages=self.messages, stream=True
+        )
+
+        self.assertEqual([chunk async for chunk in stream], ["Hel", "lo"])
+
+    async def test_invalid_model_format_in_create(self):
+        client = AsyncClient()
+
+        with self.assertRaises(ValueError) as context:
+            await client.chat.completions.create("invalidmodel", messages=self.messages)
+
+        self.assertIn(
+            "Invalid model format. Expected 'provider:model'", str(context.exception)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+from unittest.mock import patch
+
+import pytest
+
+from aisuite import Client
+from aisuite.balancer import LoadBalancer
+from aisuite.provider import OverloadedError, BadRequestError
+
+TARGETS = ["groq:llama3", "ollama:llama3", "together:llama3"]
+
+
+def test_prefers_fastest_target():
+    balancer = LoadBalancer(TARGETS, strategy="least_loaded")
+    balancer.on_start("groq:llama3")
+    balancer.on_success("groq:llama3", 2.0)
+    balancer.on_start("ollama:llama3")
+    balancer.on_success("ollama:llama3", 0.5)
+    balancer.on_start("together:llama3")
+    balancer.on_success("together:llama3", 1.0)
+
+    assert balancer.ordered_targets() == [
+        "ollama:llama3",
+        "together:llama3",
+        "groq:llama3",
+    ]
+
+
+def test_least_loaded_prefers_fewer_in_flight():
+    balancer = LoadBalancer(TARGETS[:2], strategy="least_loaded")
+    balancer.on_start("groq:llama3")
+    assert balancer.ordered_targets()[0] == "ollama:llama3"
+
+
+def test_p2c_compares_two_random_targets():
+    balancer = LoadBalancer(TARGETS)
+    for target, latency in zip(TARGETS, (0.1, 1.0, 2.0)):
+        balancer.on_start(target)
+        balancer.on_success(target, latency)
+
+    with patch("aisuite.balancer.random.sample") as mock_sample:
+        mock_sample.side_effect = lambda population, k: population[1:3]
+        targets = balancer.ordered_targets()
+
+    assert targets == ["ollama:llama3", "groq:llama3", "together:llama3"]
+
+
+def test_ewma_tracks_latency_and_errors():
+    balancer = LoadBalancer(TARGETS[:1], alpha=0.5)
+    balancer.on_start("groq:llama3")
+    balancer.on_success("groq:llama3", 1.0)
+    balancer.on_start("groq:llama3")
+    balancer.on_success("groq:llama3", 3.0)
+    balancer.on_start("groq:llama3")
+    balancer.on_failure("groq:llama3", 0.1, OverloadedError("busy"))
+
+    stats = balancer.stats()["groq:llama3"]
+    assert stats["latency"] == 2.0
+    assert stats["error_rate"] == 0.5
+    assert stats["in_flight"] == 0
+
+
+@patch("aisuite.balancer.time.monotonic")
+def test_circuit_breaker_ejects_and_probes(mock_now):
+    mock_now.return_value = 100.0
+    balancer = LoadBalancer(TARGETS[:2], failure_threshold=2, ejection_time=10)
+    for _ in range(2):
+        balancer.on_start("groq:llama3")
+        balancer.on_failure("groq:llama3", 0.1, OverloadedError("busy"))
+    assert balancer.stats()["groq:llama3"]["state"] == "open"
+    assert balancer.ordered_targets() == ["ollama:llama3"]
+
+    # Half-open: a single probe is let through.
+    mock_now.return_value = 110.0
+    assert "groq:llama3" in balancer.ordered_targets()
+    balancer.on_start("groq:llama3")
+    assert balancer.ordered_targets() == ["ollama:llama3"]
+
+    # A failed probe ejects the target again, a successful one closes the circuit.
+    balancer.on_failure("groq:llama3", 0.1, OverloadedError("busy"))
+    assert balancer.stats()["groq:llama3"]["state"] == "open"
+    mock_now.return_value = 120.0
+    balancer.ordered_targets()
+    balancer.on_start("groq:llama3")
+    balancer.on_success("groq:llama3", 0.1)
+    assert balancer.stats()["groq:llama3"]["state"] == "closed"
+
+
+def test_caller_errors_do_not_eject():
+    balancer = LoadBalancer(TARGETS[:1], failure_threshold=1)
+    balancer.on_start("groq:llama3")
+    balancer.on_failure("groq:llama3", 0.1, BadRequestError("bad"))
+    assert balancer.stats()["groq:llama3"]["state"] == "closed"
+
+
+def test_fails_open_when_all_targets_ejected():
+    balancer = LoadBalancer(TARGETS[:1], failure_threshold=1)
+    balancer.on_start("groq:llama3")
+    balancer.on_failure("groq:llama3", 0.1, OverloadedError("busy"))
+    assert balancer.ordered_targets() == ["groq:llama3"]
+
+
+def test_invalid_strategy():
+    with pytest.raises(ValueError, match="Invalid strategy"):
+        LoadBalancer(TARGETS, strategy="round_robin")
+
+
+@patch("aisuite.providers.ollama_provider.OllamaProvider.chat_completions_create")
+def test_client_observes_balancer(mock_ollama):
+    mock_ollama.side_effect = [OverloadedError("busy"), "Ollama Response"]
+    balancer = LoadBalancer(
+        ["ollama:llama3", "ollama:mistral"], strategy="least_loaded"
+    )
+    client = Client()
+
+    response = client.chat.completions.create(balancer, messages=[])
+
+    assert response == "Ollama Response"
+    stats = balancer.stats()
+    assert stats["ollama:llama3"]["consecutive_failures"] == 1
+    assert stats["ollama:mistral"]["latency"] is not None
+    assert all(s["in_flight"] == 0 for s in stats.values())
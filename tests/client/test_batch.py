@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from aisuite import Client, AsyncClient
+
+
+class ConcurrencyTracker:
+    """Records the peak number of concurrent calls per provider."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = {}
+        self.peak = {}
+
+    def enter(self, key):
+        with self.lock:
+            self.current[key] = self.current.get(key, 0) + 1
+            self.peak[key] = max(self.peak.get(key, 0), self.current[key])
+
+    def exit(self, key):
+        with self.lock:
+            self.current[key] -= 1
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.messages = [{"role": "user", "content": "Hi"}]
+
+    def test_results_in_order_with_errors_captured(self):
+        def fake_create(model, messages, **kwargs):
+            if kwargs.get("fail"):
+                raise RuntimeError("boom")
+            time.sleep(0.01 * kwargs.get("delay", 0))
+            return f"{model}:{messages[0]['content']}"
+
+        requests = [
+            ("openai:gpt-4o", self.messages, {"delay": 3}),
+            {"model": "groq:llama", "messages": self.messages, "fail": True},
+            ("openai:gpt-4o", [{"role": "user", "content": "Bye"}]),
+        ]
+        with patch.object(self.client.chat.completions, "create", fake_create):
+            results = self.client.chat.completions.batch(requests, max_concurrency=3)
+
+        self.assertEqual([r.index for r in results], [0, 1, 2])
+        self.assertEqual(results[0].response, "openai:gpt-4o:Hi")
+        self.assertFalse(results[1].ok)
+        self.assertIsInstance(results[1].error, RuntimeError)
+        self.assertEqual(results[2].response, "openai:gpt-4o:Bye")
+
+    def test_per_provider_concurrency(self):
+        tracker = ConcurrencyTracker()
+
+        def fake_create(model, messages, **kwargs):
+            key = model.split(":")[0]
+            tracker.enter(key)
+            time.sleep(0.02)
+            tracker.exit(key)
+            return model
+
+        requests = [("groq:llama", self.messages)] * 6 + [
+            ("openai:gpt-4o", self.messages)
+        ] * 6
+        with patch.object(self.client.chat.completions, "create", fake_create):
+            results = list(
+                self.client.chat.completions.batch(
+                    requests,
+                    max_concurrency=6,
+                    per_provider_concurrency={"groq": 2},
+                    as_completed=True,
+                )
+            )
+
+        self.assertEqual(len(results), 12)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertLessEqual(tracker.peak["groq"], 2)
+        self.assertGreater(tracker.peak["openai"], 2)
+
+
+class TestAsyncBatch(unittest.IsolatedAsyncioTestCase):
+    async def test_async_batch(self):
+        client = AsyncClient()
+        in_flight = 0
+        peak = 0
+
+        async def fake_create(model, messages, **kwargs):
+            nonlocal in_flight, peak
+            if kwargs.get("fail"):
+                raise ValueError("bad request")
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return model
+
+        requests = [("ollama:llama3", [])] * 5 + [("ollama:llama3", [], {"fail": True})]
+        with patch.object(client.chat.completions, "create", fake_create):
+            results = await client.chat.completions.batch(
+                requests, max_concurrency=4, per_provider_concurrency=2
+            )
+
+        self.assertEqual([r.index for r in results], list(range(6)))
+        self.assertTrue(all(r.ok for r in results[:5]))
+        self.assertIsInstance(results[5].error, ValueError)
+        self.assertLessEqual(peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
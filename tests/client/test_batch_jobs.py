@@ -0,0 +1,460 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import datetime
+import io
+import json
+import threading
+from urllib.parse import urlsplit
+from unittest.mock import MagicMock
+
+import pytest
+
+from aisuite import Client
+from aisuite.batch_jobs import BedrockBatchAdapter
+from aisuite.provider import BadRequestError
+
+
+class FakeBatchServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the OpenAI Batch and Anthropic Message Batches APIs. Jobs
+    complete after `polls` status requests; every request is answered with an echo of
+    its last message, except messages saying "fail", which are rejected.
+    """
+
+    def __init__(self, polls=2):
+        super().__init__(("127.0.0.1", 0), FakeBatchHandler)
+        self.polls = polls
+        self.files = {}  # file id -> bytes
+        self.jobs = {}  # job id -> {"lines": [...], "polls": int, "kind": str}
+        self.downloads = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeBatchHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body, status=200):
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers["Content-Length"]))
+
+    def do_POST(self):
+        server = self.server
+        if self.path == "/v1/files":
+            assert self.headers["Authorization"] == "Bearer sk-test"
+            # Keep the JSONL lines of the multipart upload.
+            lines = [
+                line
+                for line in self._body().split(b"\r\n")
+                if line.startswith(b'{"custom_id"')
+            ]
+            file_id = f"file-{len(server.files)}"
+            server.files[file_id] = b"\n".join(lines)
+            self._reply({"id": file_id})
+        elif self.path == "/v1/batches":
+            request = json.loads(self._body())
+            lines = [
+                json.loads(line)
+                for line in server.files[request["input_file_id"]].splitlines()
+            ]
+            job_id = f"batch_{len(server.jobs)}"
+            server.jobs[job_id] = {
+                "lines": lines,
+                "polls": 0,
+                "kind": "openai",
+                "input_file_id": request["input_file_id"],
+                "metadata": request.get("metadata"),
+            }
+            self._reply({"id": job_id, "status": "validating"})
+        elif self.path == "/v1/messages/batches":
+            assert self.headers["x-api-key"] == "anthropic-test"
+            lines = json.loads(self._body())["requests"]
+            job_id = f"msgbatch_{len(server.jobs)}"
+            server.jobs[job_id] = {
+                "lines": lines,
+                "polls": 0,
+                "kind": "anthropic",
+                "created_at": datetime.datetime.now(datetime.timezone.utc)
+                .isoformat()
+                .replace("+00:00", "Z"),
+            }
+            self._reply({"id": job_id, "processing_status": "in_progress"})
+        else:
+            self._reply({"error": "not found"}, 404)
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        if parts == ["v1", "batches"]:
+            self._reply(
+                {
+                    "data": [
+                        {
+                            "id": job_id,
+                            "input_file_id": job["input_file_id"],
+                            "metadata": job["metadata"],
+                        }
+                        for job_id, job in server.jobs.items()
+                        if job["kind"] == "openai"
+                    ]
+                }
+            )
+        elif parts == ["v1", "messages", "batches"]:
+            self._reply(
+                {
+                    "data": [
+                        {
+                            "id": job_id,
+                            "created_at": job["created_at"],
+                            "request_counts": {
+                                "processing": len(job["lines"]),
+                                "succeeded": 0,
+                            },
+                        }
+                        for job_id, job in server.jobs.items()
+                        if job["kind"] == "anthropic"
+                    ]
+                }
+            )
+        elif parts[:2] == ["v1", "batches"]:
+            job = server.jobs[parts[2]]
+            job["polls"] += 1
+            done = job["polls"] >= server.polls
+            self._reply(
+                {
+                    "id": parts[2],
+                    "status": "completed" if done else "in_progress",
+                    "output_file_id": f"output-{parts[2]}" if done else None,
+                }
+            )
+        elif parts[:2] == ["v1", "files"]:
+            server.downloads += 1
+            job = server.jobs[parts[2][len("output-") :]]
+            self._reply(
+                b"\n".join(
+                    json.dumps(openai_result(line)).encode() for line in job["lines"]
+                )
+            )
+        elif parts[:3] == ["v1", "messages", "batches"] and len(parts) == 4:
+            job = server.jobs[parts[3]]
+            job["polls"] += 1
+            done = job["polls"] >= server.polls
+            self._reply(
+                {
+                    "id": parts[3],
+                    "processing_status": "ended" if done else "in_progress",
+                    "results_url": f"{server.url}/v1/messages/batches/{parts[3]}/results",
+                }
+            )
+        elif parts[:3] == ["v1", "messages", "batches"]:
+            server.downloads += 1
+            job = server.jobs[parts[3]]
+            self._reply(
+                b"\n".join(
+                    json.dumps(anthropic_result(line)).encode() for line in job["lines"]
+                )
+            )
+        else:
+            self._reply({"error": "not found"}, 404)
+
+
+def openai_result(line):
+    last = line["body"]["messages"][-1]["content"]
+    if last == "fail":
+        return {
+            "custom_id": line["custom_id"],
+            "response": {
+                "status_code": 400,
+                "body": {"error": {"message": "Invalid request."}},
+            },
+        }
+    return {
+        "custom_id": line["custom_id"],
+        "response": {
+            "status_code": 200,
+            "body": {
+                "model": line["body"]["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": f"echo: {last}"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 2},
+            },
+        },
+    }
+
+
+def anthropic_result(line):
+    last = line["params"]["messages"][-1]["content"]
+    if last == "fail":
+        return {
+            "custom_id": line["custom_id"],
+            "result": {
+                "type": "errored",
+                "error": {
+                    "type": "error",
+                    "error": {"type": "invalid_request_error", "message": "Bad."},
+                },
+            },
+        }
+    return {
+        "custom_id": line["custom_id"],
+        "result": {
+            "type": "succeeded",
+            "message": {
+                "model": line["params"]["model"],
+                "content": [{"type": "text", "text": f"echo: {last}"}],
+                "stop_reason": "end_turn",
+                "usage": {"input_tokens": 4, "output_tokens": 2},
+            },
+        },
+    }
+
+
+@pytest.fixture
+def server():
+    server = FakeBatchServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server):
+    return Client(
+        {
+            "openai": {"api_key": "sk-test", "base_url": f"{server.url}/v1"},
+            "anthropic": {"api_key": "anthropic-test", "base_url": server.url},
+        }
+    )
+
+
+def user(content):
+    return [{"role": "user", "content": content}]
+
+
+REQUESTS = [
+    {"custom_id": "a", "model": "openai:gpt-4o-mini", "messages": user("one")},
+    {"custom_id": "b", "model": "openai:gpt-4o", "messages": user("two")},
+    {"custom_id": "c", "model": "openai:gpt-4o-mini", "messages": user("fail")},
+    ("anthropic:claude-3-5-haiku-latest", user("three"), {"max_tokens": 50}),
+    ("anthropic:claude-3-5-haiku-latest", user("fail")),
+]
+
+
+def test_batch_job_end_to_end(server, tmp_path):
+    client = make_client(server)
+    job = client.batches.create(REQUESTS, state_dir=str(tmp_path))
+
+    # One shard per provider and model.
+    assert [(s["provider"], s["model"]) for s in job.shards] == [
+        ("openai", "gpt-4o-mini"),
+        ("openai", "gpt-4o"),
+        ("anthropic", "claude-3-5-haiku-latest"),
+    ]
+    assert job.status()["running"] == 3
+    assert len(server.jobs) == 3
+
+    results = {result.custom_id: result for result in job.results(poll_interval=0)}
+
+    assert sorted(results) == ["a", "b", "c", "request-3", "request-4"]
+    assert results["a"].response.choices[0].message.content == "echo: one"
+    assert results["a"].response.usage.total_tokens == 5
+    assert results["a"].model == "openai:gpt-4o-mini"
+    assert results["b"].response.model == "gpt-4o"
+    assert isinstance(results["c"].error, BadRequestError)
+    assert results["request-3"].response.choices[0].message.content == "echo: three"
+    assert results["request-3"].response.usage.prompt_tokens == 4
+    assert isinstance(results["request-4"].error, BadRequestError)
+    assert job.done
+    client.close()
+
+
+def test_resume_after_crash(server, tmp_path):
+    make_client(server).batches.create(REQUESTS, state_dir=str(tmp_path))
+
+    # A new driver reattaches to the running jobs instead of submitting them again.
+    job = make_client(server).batches.resume(str(tmp_path))
+    assert len(server.jobs) == 3
+    first = [(r.custom_id, r.ok) for r in job.results(poll_interval=0)]
+    assert server.downloads == 3
+
+    # Downloaded results are kept on disk.
+    job = make_client(server).batches.resume(str(tmp_path))
+    assert [(r.custom_id, r.ok) for r in job.results(poll_interval=0)] == first
+    assert server.downloads == 3
+
+
+def test_unsubmitted_shards_are_submitted_on_resume(server, tmp_path):
+    job = make_client(server).batches.create(
+        REQUESTS[:2], state_dir=str(tmp_path), submit=False
+    )
+    assert job.status()["pending"] == 2
+    assert not server.jobs
+
+    job = make_client(server).batches.resume(str(tmp_path))
+    assert job.status()["running"] == 2
+    assert len(server.jobs) == 2
+
+    with pytest.raises(FileExistsError):
+        make_client(server).batches.create(REQUESTS, state_dir=str(tmp_path))
+
+
+class Crash(Exception):
+    pass
+
+
+def crash_after_submit(client, provider_key):
+    """Make the client's driver crash right after the provider accepted a shard."""
+    adapter = client.batches._adapter(provider_key)
+    submit = adapter.submit
+
+    def crashing_submit(shard, input_path):
+        submit(shard, input_path)
+        raise Crash()
+
+    adapter.submit = crashing_submit
+    return client
+
+
+def test_submissions_interrupted_by_a_crash_are_not_repeated(server, tmp_path):
+    with pytest.raises(Crash):
+        crash_after_submit(make_client(server), "openai").batches.create(
+            REQUESTS, state_dir=str(tmp_path)
+        )
+    assert len(server.jobs) == 1
+
+    # The OpenAI job is found by its metadata; the Anthropic shard then crashes.
+    with pytest.raises(Crash):
+        crash_after_submit(make_client(server), "anthropic").batches.resume(
+            str(tmp_path)
+        )
+    assert len(server.jobs) == 3
+
+    # The Anthropic job is found by its creation time and size.
+    job = make_client(server).batches.resume(str(tmp_path))
+    assert len(server.jobs) == 3
+    assert [shard["job_id"] for shard in job.shards] == [
+        "batch_0",
+        "batch_1",
+        "msgbatch_2",
+    ]
+    assert len(list(job.results(poll_interval=0))) == 5
+
+
+def test_invalid_requests(server, tmp_path):
+    client = make_client(server)
+    with pytest.raises(ValueError, match="Duplicate custom_id"):
+        client.batches.create(
+            [REQUESTS[0], REQUESTS[0]], state_dir=str(tmp_path / "duplicate")
+        )
+    with pytest.raises(ValueError, match="no batch API support"):
+        client.batches.create(
+            [("groq:llama3-8b-8192", user("hi"))], state_dir=str(tmp_path / "groq")
+        )
+
+
+def test_bedrock_jobs_below_the_minimum_size_are_refused(tmp_path):
+    client = Client(
+        {
+            "aws": {
+                "batch_role_arn": "arn:aws:iam::123:role/batch",
+                "batch_s3_uri": "s3://bucket/jobs",
+            }
+        }
+    )
+    requests = [("aws:anthropic.claude-3-5-sonnet", user("hi"))] * 99
+    with pytest.raises(ValueError, match="at least 100 requests per batch job"):
+        client.batches.create(requests, state_dir=str(tmp_path / "job"))
+    # Nothing was written or submitted.
+    assert not (tmp_path / "job").exists()
+
+
+def test_bedrock_batch_adapter(tmp_path):
+    adapter = BedrockBatchAdapter(
+        batch_role_arn="arn:aws:iam::123:role/batch", batch_s3_uri="s3://bucket/jobs"
+    )
+    bedrock = adapter.__dict__["bedrock"] = MagicMock()
+    s3 = adapter.__dict__["s3"] = MagicMock()
+
+    line = adapter.format_request(
+        "r1",
+        "anthropic.claude-3-5-sonnet",
+        [
+            {"role": "system", "content": "Be brief."},
+            {"role": "user", "content": "Hi"},
+        ],
+        {"max_tokens": 20},
+    )
+    assert line == {
+        "recordId": "r1",
+        "modelInput": {
+            "anthropic_version": "bedrock-2023-05-31",
+            "system": "Be brief.",
+            "messages": [{"role": "user", "content": "Hi"}],
+            "max_tokens": 20,
+        },
+    }
+
+    bedrock.create_model_invocation_job.return_value = {
+        "jobArn": "arn:aws:bedrock:us-west-2:123:model-invocation-job/abc123"
+    }
+    shard = {
+        "name": "000-aws-model",
+        "model": "anthropic.claude-3-5-sonnet",
+        "submission_id": "0123456789abcdef",
+    }
+    shard.update(adapter.submit(shard, str(tmp_path / "input.jsonl")))
+    request = bedrock.create_model_invocation_job.call_args.kwargs
+    assert request["jobName"] == "aisuite-0123456789ab-000-aws-model"
+    assert request["clientRequestToken"] == "0123456789abcdef"
+    assert request["modelId"] == "anthropic.claude-3-5-sonnet"
+    assert request["roleArn"] == "arn:aws:iam::123:role/batch"
+    assert s3.upload_file.call_args.args[1] == "bucket"
+
+    bedrock.list_model_invocation_jobs.return_value = {
+        "invocationJobSummaries": [
+            {
+                "jobName": request["jobName"],
+                "jobArn": "arn:aws:bedrock:us-west-2:123:model-invocation-job/abc123",
+            }
+        ]
+    }
+    assert adapter.find(shard, None) == {
+        "job_id": shard["job_id"],
+        "output_key": shard["output_key"],
+    }
+
+    bedrock.get_model_invocation_job.return_value = {"status": "Completed"}
+    assert adapter.poll(shard) == {"state": "completed"}
+
+    output = {
+        "recordId": "r1",
+        "modelOutput": {
+            "content": [{"type": "text", "text": "Hello"}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": 5, "output_tokens": 1},
+        },
+    }
+    s3.get_object.return_value = {"Body": io.BytesIO(json.dumps(output).encode())}
+    adapter.download(shard, str(tmp_path / "results.jsonl"))
+    assert s3.get_object.call_args.kwargs["Key"].endswith("/abc123/input.jsonl.out")
+
+    custom_id, response, error = adapter.parse_result(output, shard["model"])
+    assert custom_id == "r1" and error is None
+    assert response.choices[0].message.content == "Hello"
+    assert response.model == "anthropic.claude-3-5-sonnet"
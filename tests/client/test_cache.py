@@ -0,0 +1,84 @@
+import time
+from unittest.mock import patch
+
+from aisuite import Client
+from aisuite.cache import request_key, MemoryCache, DiskCache
+
+MESSAGES = [{"role": "user", "content": "What is 2 + 2?"}]
+
+
+def test_request_key_is_canonical():
+    key = request_key("openai", "gpt-4o", MESSAGES, {"temperature": 0, "top_p": 1})
+    same = request_key("openai", "gpt-4o", MESSAGES, {"top_p": 1, "temperature": 0})
+    other = request_key("openai", "gpt-4o", MESSAGES, {"temperature": 0.5})
+
+    assert key == same
+    assert key != other
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_memory_cache_ttl_and_size_bound():
+    cache = MemoryCache(ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+    cache = MemoryCache(max_bytes=300)
+    cache.set("a", "x" * 100)
+    cache.set("b", "y" * 100)
+    cache.set("c", "z" * 100)
+    assert cache.get("a") is None
+    assert cache.get("c") == "z" * 100
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "cache" / "responses.db")
+    cache = DiskCache(path, max_entries=2)
+    cache.set("a", {"content": "four"})
+    cache.close()
+
+    reopened = DiskCache(path, max_entries=2)
+    assert reopened.get("a") == {"content": "four"}
+    reopened.set("b", 2)
+    reopened.set("c", 3)
+    assert len(reopened) == 2
+    assert reopened.get("c") == 3
+
+
+@patch("aisuite.providers.ollama_provider.OllamaProvider.chat_completions_create")
+def test_client_cache_hits_and_bypass(mock_ollama):
+    mock_ollama.return_value = "Ollama Response"
+    cache = MemoryCache()
+    client = Client(cache=cache)
+
+    for _ in range(3):
+        response = client.chat.completions.create(
+            "ollama:llama3", MESSAGES, temperature=0
+        )
+        assert response == "Ollama Response"
+    assert mock_ollama.call_count == 1
+
+    client.chat.completions.create(
+        "ollama:llama3", MESSAGES, temperature=0, use_cache=False
+    )
+    assert mock_ollama.call_count == 2
+    # use_cache is consumed by the client and never reaches the provider.
+    assert "use_cache" not in mock_ollama.call_args.kwargs
+
+    client.chat.completions.create("ollama:llama3", MESSAGES, stream=True)
+    client.chat.completions.create("ollama:llama3", MESSAGES, stream=True)
+    assert mock_ollama.call_count == 4
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from aisuite import AsyncClient, Client
+from aisuite.framework import (
+    ChatCompletionResponse,
+    Choice,
+    CompletionUsage,
+    Message,
+)
+from aisuite.provider import Provider
+
+
+class SingleChoiceProvider(Provider):
+    """Answers with one choice per call, like a provider without native n."""
+
+    def __init__(self, **config):
+        self.calls = []
+
+    def chat_completions_create(self, model, messages, **kwargs):
+        self.calls.append(kwargs)
+        return ChatCompletionResponse(
+            choices=[Choice(message=Message(content=f"answer {len(self.calls)}"))],
+            usage=CompletionUsage(10, 2),
+            model=model,
+        )
+
+
+class MultiChoiceProvider(SingleChoiceProvider):
+    supports_n = True
+
+
+@pytest.fixture
+def registry(register_provider):
+    register_provider("single", SingleChoiceProvider)
+    register_provider("multi", MultiChoiceProvider)
+
+
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+
+def test_n_is_emulated_with_concurrent_calls(registry):
+    client = Client()
+    response = client.chat.completions.create("single:model", MESSAGES, n=3)
+
+    provider = client.providers["single"]
+    assert provider.calls == [{}, {}, {}]
+    assert [choice.index for choice in response.choices] == [0, 1, 2]
+    assert sorted(choice.message.content for choice in response.choices) == [
+        "answer 1",
+        "answer 2",
+        "answer 3",
+    ]
+    assert response.usage.prompt_tokens == 30
+    assert response.usage.completion_tokens == 6
+    assert response.model == "model"
+    assert response.latency is not None
+    assert len(response.raw) == 3
+
+
+def test_n_is_passed_through_when_supported(registry):
+    client = Client()
+    client.chat.completions.create("multi:model", MESSAGES, n=3)
+    assert client.providers["multi"].calls == [{"n": 3}]
+
+
+def test_n_of_one_is_not_sent_to_providers_without_n(registry):
+    client = Client()
+    response = client.chat.completions.create("single:model", MESSAGES, n=1)
+    assert client.providers["single"].calls == [{}]
+    assert len(response.choices) == 1
+
+
+def test_emulated_n_cannot_stream(registry):
+    with pytest.raises(ValueError, match="does not support n > 1"):
+        Client().chat.completions.create("single:model", MESSAGES, n=2, stream=True)
+
+
+def test_async_n_is_emulated(registry):
+    async def create():
+        client = AsyncClient()
+        response = await client.chat.completions.create("single:model", MESSAGES, n=2)
+        return client, response
+
+    client, response = asyncio.run(create())
+    assert len(client.providers["single"].calls) == 2
+    assert len(response.choices) == 2
+    assert response.usage.total_tokens == 24
@@ -183,6 +183,14 @@ class TestClient(unittest.TestCase):
             "Invalid model format. Expected 'provider:model'", str(context.exception)
         )
 
+    @patch("aisuite.providers.ollama_provider.OllamaProvider.close")
+    def test_client_context_manager_closes_providers(self, mock_close):
+        with Client({"ollama": {}}) as client:
+            self.assertIn("ollama", client.providers)
+
+        mock_close.assert_called_once()
+        self.assertEqual(client.providers, {})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,74 @@
+import json
+
+import httpx
+import pytest
+
+from aisuite import codec
+from aisuite.http_client import HttpClient, iter_sse
+
+PAYLOAD = {
+    "model": "m",
+    "messages": [{"role": "user", "content": "Grüße 👋"}],
+    "temperature": 0.5,
+    "stream": False,
+}
+
+
+@pytest.fixture(params=codec.CODECS)
+def backend(request):
+    previous = codec.get_codec()
+    try:
+        codec.set_codec(request.param)
+    except ImportError:
+        pytest.skip(f"{request.param} is not installed")
+    yield request.param
+    codec.set_codec(previous)
+
+
+def test_round_trip(backend):
+    encoded = codec.dumps(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == PAYLOAD
+    assert codec.loads(encoded) == PAYLOAD
+    assert codec.loads(encoded.decode()) == PAYLOAD
+
+
+def test_non_string_keys_are_encoded_as_strings(backend):
+    payload = {"model": "m", "logit_bias": {50256: -100}}
+    assert codec.loads(codec.dumps(payload)) == json.loads(json.dumps(payload))
+
+
+def test_fastest_installed_codec_is_the_default():
+    previous = codec.get_codec()
+    try:
+        assert codec.set_codec() == previous
+    finally:
+        codec.set_codec(previous)
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        codec.set_codec("pickle")
+
+
+def test_post_json_and_streams_use_the_codec(backend):
+    def handler(request):
+        assert request.headers["Content-Type"] == "application/json"
+        assert request.headers["Authorization"] == "Bearer x"
+        body = json.loads(request.content)
+        if body.get("stream"):
+            return httpx.Response(
+                200, text=f"data: {json.dumps(body)}\n\ndata: [DONE]\n"
+            )
+        return httpx.Response(200, json=body)
+
+    http = HttpClient()
+    http._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    headers = {"Authorization": "Bearer x"}
+    assert http.post_json("http://test", PAYLOAD, headers=headers) == PAYLOAD
+    response = http.open_stream(
+        "http://test", json={**PAYLOAD, "stream": True}, headers=headers
+    )
+    assert list(iter_sse(response)) == [{**PAYLOAD, "stream": True}]
+    assert headers == {"Authorization": "Bearer x"}
@@ -0,0 +1,268 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from aisuite import AsyncClient, Client
+from aisuite.provider import Provider
+
+
+class TrackedProvider(Provider):
+    """Records its config and whether it was closed; calls can be held open."""
+
+    def __init__(self, **config):
+        self.config = config
+        self.closed = False
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def chat_completions_create(self, model, messages, **kwargs):
+        self.started.set()
+        self.release.wait(5)
+        if kwargs.get("stream"):
+            return iter(["a", "b"])
+        return self.config.get("api_key")
+
+    def close(self):
+        self.closed = True
+
+
+class AsyncTrackedProvider(TrackedProvider):
+    async def aclose(self):
+        self.closed = "async"
+
+
+class GatedProvider(TrackedProvider):
+    """
+    Construction waits for the gate when configured with wait=True; the construction
+    numbered fail_at fails.
+    """
+
+    gate = threading.Event()
+    building = threading.Event()
+    instances = []
+    fail_at = None
+
+    def __init__(self, wait=False, **config):
+        if len(GatedProvider.instances) == GatedProvider.fail_at:
+            raise RuntimeError("bad config")
+        if wait:
+            GatedProvider.building.set()
+            assert GatedProvider.gate.wait(5)
+        super().__init__(**config)
+        GatedProvider.instances.append(self)
+
+
+@pytest.fixture
+def registry(register_provider):
+    register_provider("tracked", TrackedProvider)
+    register_provider("atracked", AsyncTrackedProvider)
+    register_provider("gated", GatedProvider)
+    GatedProvider.gate.set()
+    GatedProvider.building.clear()
+    GatedProvider.instances = []
+    GatedProvider.fail_at = None
+
+
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+
+def test_unchanged_providers_are_kept(registry):
+    client = Client(
+        {
+            "tracked": {"api_key": "one"},
+            "other": {"type": "tracked", "api_key": "x"},
+        }
+    )
+    tracked, other = client.providers["tracked"], client.providers["other"]
+
+    client.configure(
+        {"tracked": {"api_key": "two"}, "other": {"type": "tracked", "api_key": "x"}}
+    )
+
+    assert client.providers["other"] is other
+    assert client.providers["tracked"] is not tracked
+    assert tracked.closed and not other.closed
+    assert client.chat.completions.create("tracked:model", MESSAGES) == "two"
+
+
+def test_rate_limit_changes_keep_the_provider(registry):
+    client = Client({"tracked": {"api_key": "one"}})
+    provider = client.providers["tracked"]
+    client._get_rate_limiter("tracked")
+
+    client.configure(
+        {"tracked": {"api_key": "one", "rate_limit": {"requests_per_minute": 10}}}
+    )
+
+    assert client.providers["tracked"] is provider
+    assert client._get_rate_limiter("tracked") is not None
+
+
+def test_replaced_provider_is_closed_after_in_flight_calls(registry):
+    client = Client({"tracked": {"api_key": "old"}})
+    old = client.providers["tracked"]
+    old.release.clear()
+
+    result = []
+    thread = threading.Thread(
+        target=lambda: result.append(
+            client.chat.completions.create("tracked:model", MESSAGES)
+        )
+    )
+    thread.start()
+    assert old.started.wait(5)
+
+    client.configure({"tracked": {"api_key": "new"}})
+    assert client.chat.completions.create("tracked:model", MESSAGES) == "new"
+    assert not old.closed
+
+    old.release.set()
+    thread.join(5)
+    assert result == ["old"]
+    assert old.closed
+
+
+def test_provider_is_kept_open_until_its_stream_ends(registry):
+    client = Client({"tracked": {"api_key": "old"}})
+    old = client.providers["tracked"]
+    stream = client.chat.completions.create("tracked:model", MESSAGES, stream=True)
+
+    client.configure({"tracked": {"api_key": "new"}})
+    assert next(stream) == "a"
+    assert not old.closed
+    assert list(stream) == ["b"]
+    assert old.closed
+
+
+def test_provider_is_closed_when_an_unread_stream_is_dropped(registry):
+    client = Client({"tracked": {"api_key": "old"}})
+    old = client.providers["tracked"]
+    stream = client.chat.completions.create("tracked:model", MESSAGES, stream=True)
+    client.configure({"tracked": {"api_key": "new"}})
+    assert not old.closed
+
+    del stream
+    assert old.closed
+
+
+def test_provider_is_closed_when_an_unread_async_stream_is_closed(registry):
+    class AsyncStreamProvider(TrackedProvider):
+        async def achat_completions_create(self, model, messages, **kwargs):
+            async def chunks():
+                yield "a"
+
+            return chunks()
+
+    async def main():
+        client = AsyncClient({"tracked": {"api_key": "old"}})
+        old = client.providers["tracked"] = AsyncStreamProvider()
+        stream = await client.chat.completions.create(
+            "tracked:model", MESSAGES, stream=True
+        )
+        client.configure({"tracked": {"api_key": "new"}})
+        assert not old.closed
+
+        await stream.aclose()
+        await asyncio.sleep(0)
+        assert old.closed
+
+    asyncio.run(main())
+
+
+def test_replace_removes_missing_providers(registry):
+    client = Client({"tracked": {"api_key": "one"}, "other": {"type": "tracked"}})
+    other = client.providers["other"]
+    client.configure({"tracked": {"api_key": "one"}}, replace=True)
+    assert "other" not in client.providers
+    assert other.closed
+
+
+def test_invalid_config_changes_nothing(registry):
+    config = {"tracked": {"api_key": "one"}}
+    client = Client(config)
+    with pytest.raises(ValueError):
+        client.configure({"bad": {"type": "unknown"}})
+    assert client.provider_configs == {"tracked": {"api_key": "one"}}
+    # The caller's dict is not modified by configure().
+    client.configure({"other": {"type": "tracked"}})
+    assert config == {"tracked": {"api_key": "one"}}
+
+
+def test_async_client_closes_replaced_providers_asynchronously(registry):
+    async def main():
+        client = AsyncClient({"atracked": {"api_key": "one"}})
+        old = client.providers["atracked"]
+        client.configure({"atracked": {"api_key": "two"}})
+        await asyncio.sleep(0)
+        assert old.closed == "async"
+        assert await client.chat.completions.create("atracked:model", MESSAGES) == "two"
+
+    asyncio.run(main())
+
+
+def test_close_closes_providers_waiting_for_their_calls(registry):
+    client = Client({"tracked": {"api_key": "old"}})
+    old = client.providers["tracked"]
+    stream = client.chat.completions.create("tracked:model", MESSAGES, stream=True)
+    client.configure({"tracked": {"api_key": "new"}})
+    new = client.providers["tracked"]
+
+    client.close()
+    assert old.closed and new.closed
+    # The stream ending later does not close the provider again.
+    assert list(stream) == ["a", "b"]
+
+
+def test_building_a_provider_does_not_block_the_others(registry):
+    client = Client({"tracked": {"api_key": "warm"}})
+    client.provider_configs["gated"] = {"wait": True}
+    GatedProvider.gate.clear()
+    thread = threading.Thread(target=client._get_provider, args=("gated",))
+    thread.start()
+    assert GatedProvider.building.wait(5)
+
+    start = time.monotonic()
+    assert client.chat.completions.create("tracked:model", MESSAGES) == "warm"
+    assert time.monotonic() - start < 1
+    GatedProvider.gate.set()
+    thread.join(5)
+
+
+def test_provider_built_from_a_replaced_config_is_discarded(registry):
+    client = Client()
+    client.provider_configs = {"gated": {"api_key": "old", "wait": True}}
+    GatedProvider.gate.clear()
+    thread = threading.Thread(target=client._get_provider, args=("gated",))
+    thread.start()
+    assert GatedProvider.building.wait(5)
+
+    client.configure({"gated": {"api_key": "new"}})
+    GatedProvider.gate.set()
+    thread.join(5)
+
+    # The replacement was built while the first provider was still being built.
+    new, old = GatedProvider.instances
+    assert old.closed and not new.closed
+    assert client.providers["gated"] is new
+    assert client.chat.completions.create("gated:model", MESSAGES) == "new"
+
+
+def test_failed_configure_closes_the_providers_it_built(registry):
+    client = Client({"first": {"type": "gated"}, "second": {"type": "gated"}})
+    first, second = GatedProvider.instances
+    GatedProvider.fail_at = 3
+    with pytest.raises(RuntimeError):
+        client.configure(
+            {
+                "first": {"type": "gated", "api_key": "new"},
+                "second": {"type": "gated", "api_key": "new"},
+            }
+        )
+
+    [rebuilt] = GatedProvider.instances[2:]
+    assert rebuilt.closed
+    assert client.providers == {"first": first, "second": second}
+    assert not first.closed and not second.closed
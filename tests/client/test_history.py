@@ -0,0 +1,144 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from aisuite import tokens
+from aisuite.framework import ChatCompletionResponse
+from aisuite.history import (
+    Conversation,
+    History,
+    LastTurns,
+    Summarize,
+    TokenBudget,
+)
+
+
+def message(role, words):
+    return {"role": role, "content": " ".join(["word"] * words)}
+
+
+def reply(content):
+    response = ChatCompletionResponse()
+    response.choices[0].message.content = content
+    return response
+
+
+def make_history(turns=4, words=10):
+    history = History([message("system", 5)])
+    for _ in range(turns):
+        history.extend([message("user", words), message("assistant", words)])
+    return history
+
+
+def test_token_counts_are_incremental(monkeypatch):
+    history = make_history(turns=2)
+    assert history.total_tokens == tokens.count_tokens(None, None, history.messages)
+
+    count = MagicMock(wraps=tokens.count_message_tokens)
+    monkeypatch.setattr(tokens, "count_message_tokens", count)
+    history.append(message("user", 3))
+    history.total_tokens
+    history.total_tokens
+    assert count.call_count == 1
+
+    history.pop()
+    assert history.total_tokens == tokens.count_tokens(None, None, history.messages)
+
+
+def test_turns_keep_tool_results_with_their_call():
+    history = History(
+        [
+            message("system", 1),
+            message("user", 1),
+            {"role": "assistant", "content": None, "tool_calls": []},
+            {"role": "tool", "content": "42"},
+            message("assistant", 1),
+            message("user", 1),
+        ]
+    )
+    assert history.turn_starts() == [1, 5]
+
+
+def test_last_turns():
+    history = make_history(turns=4)
+    messages = LastTurns(2).apply(history)
+    assert messages == history.messages[:1] + history.messages[5:]
+    assert LastTurns(10).apply(history) == history.messages
+
+
+def test_token_budget_keeps_latest_turns_that_fit():
+    history = make_history(turns=4, words=10)
+    # System 8 tokens, turns 26 tokens each, 3 for the reply.
+    messages = TokenBudget(max_tokens=8 + 2 * 26 + 3).apply(history)
+    assert messages == history.messages[:1] + history.messages[5:]
+    assert TokenBudget(max_tokens=10_000).apply(history) == history.messages
+    # The last turn is always sent.
+    assert TokenBudget(max_tokens=1).apply(history) == (
+        history.messages[:1] + history.messages[7:]
+    )
+
+
+def test_token_budget_defaults_to_context_window():
+    history = make_history(turns=2)
+    history.provider_key, history.model_name = "openai", "gpt-4o"
+    assert TokenBudget().apply(history) == history.messages
+
+    history.model_name = "unknown"
+    assert TokenBudget().apply(history) == history.messages
+
+
+def test_summarize_folds_older_turns_incrementally():
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [reply("S1"), reply("S2")]
+    policy = Summarize(client, "groq:small", max_tokens=70, keep_turns=1)
+
+    history = make_history(turns=2)
+    assert policy.apply(history) == history.messages
+    assert not client.chat.completions.create.called
+
+    history.extend([message("user", 10), message("assistant", 10)])
+    messages = policy.apply(history)
+    assert messages[0]["content"].endswith("Summary of the earlier conversation:\nS1")
+    assert messages[1:] == history.messages[5:]
+    model, prompt = client.chat.completions.create.call_args.args
+    assert model == "groq:small"
+    assert prompt[1]["content"].count("user: ") == 2
+
+    # Within budget again: the summary is reused without a call.
+    assert policy.apply(history) == messages
+    assert client.chat.completions.create.call_count == 1
+
+    history.extend([message("user", 10), message("assistant", 10)] * 2)
+    messages = policy.apply(history)
+    assert messages[0]["content"].endswith("S2")
+    assert messages[1:] == history.messages[-2:]
+    prompt = client.chat.completions.create.call_args.args[1]
+    assert prompt[1]["content"].startswith("Summary so far:\nS1")
+    assert prompt[1]["content"].count("user: ") == 2
+    # The history itself is untouched.
+    assert history.messages[0] == message("system", 5)
+
+
+def test_conversation_records_replies():
+    client = MagicMock()
+    client.chat.completions.create.return_value = reply("Hi!")
+    chat = Conversation(client, "openai:gpt-4o", policy=LastTurns(1), system="Be nice.")
+
+    chat.send("Hello")
+    chat.send("Again", temperature=0)
+    assert chat.messages == [
+        {"role": "system", "content": "Be nice."},
+        {"role": "user", "content": "Hello"},
+        {"role": "assistant", "content": "Hi!"},
+        {"role": "user", "content": "Again"},
+        {"role": "assistant", "content": "Hi!"},
+    ]
+    model, messages = client.chat.completions.create.call_args.args
+    assert model == "openai:gpt-4o"
+    assert messages == chat.messages[:1] + chat.messages[3:4]
+    assert client.chat.completions.create.call_args.kwargs == {"temperature": 0}
+
+    client.chat.completions.create.side_effect = RuntimeError("down")
+    with pytest.raises(RuntimeError):
+        chat.send("Lost")
+    assert len(chat.messages) == 5
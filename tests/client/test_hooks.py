@@ -0,0 +1,152 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from aisuite import Client, AsyncClient
+from aisuite.framework import (
+    ChatCompletionResponse,
+    ChatCompletionChunk,
+    CompletionUsage,
+)
+from aisuite.hooks import Hook
+from aisuite.metrics import MetricsCollector
+from aisuite.provider import OverloadedError
+
+
+class RecordingHook(Hook):
+    def __init__(self):
+        self.events = []
+
+    def before_request(self, context):
+        self.events.append(("before_request", context.provider_key, context.model_name))
+
+    def after_response(self, context, response):
+        self.events.append(("after_response", response))
+
+    def on_error(self, context, error):
+        self.events.append(("on_error", type(error).__name__))
+
+    def on_chunk(self, context, chunk):
+        self.events.append(("on_chunk", chunk.choices[0].delta.content))
+
+
+def make_response(content="Hi", prompt_tokens=5, completion_tokens=2):
+    response = ChatCompletionResponse()
+    response.choices[0].message.content = content
+    response.usage = CompletionUsage(prompt_tokens, completion_tokens)
+    return response
+
+
+@patch("aisuite.providers.ollama_provider.OllamaProvider.chat_completions_create")
+def test_hooks_observe_requests_and_errors(mock_ollama):
+    response = make_response()
+    mock_ollama.side_effect = [response, OverloadedError("busy")]
+    hook = RecordingHook()
+    client = Client(hooks=[hook])
+
+    client.chat.completions.create("ollama:llama3", messages=[])
+    with pytest.raises(OverloadedError):
+        client.chat.completions.create("ollama:llama3", messages=[])
+
+    assert hook.events == [
+        ("before_request", "ollama", "llama3"),
+        ("after_response", response),
+        ("before_request", "ollama", "llama3"),
+        ("on_error", "OverloadedError"),
+    ]
+
+
+@patch("aisuite.providers.ollama_provider.OllamaProvider.chat_completions_create")
+def test_hooks_observe_stream_chunks(mock_ollama):
+    mock_ollama.return_value = iter(
+        [
+            ChatCompletionChunk(content="Hel", role="assistant"),
+            ChatCompletionChunk(content="lo", usage=CompletionUsage(4, 1)),
+            ChatCompletionChunk(finish_reason="stop", usage=CompletionUsage(0, 2)),
+        ]
+    )
+    hook = RecordingHook()
+    metrics = MetricsCollector()
+    client = Client(hooks=[hook, metrics])
+
+    stream = client.chat.completions.create("ollama:llama3", messages=[], stream=True)
+    assert [e[0] for e in hook.events] == ["before_request"]
+    list(stream)
+
+    assert hook.events[1:] == [
+        ("on_chunk", "Hel"),
+        ("on_chunk", "lo"),
+        ("on_chunk", None),
+        ("after_response", None),
+    ]
+    snapshot = metrics.snapshot()["resourceMetrics"][0]["scopeMetrics"][0]["metrics"]
+    by_name = {metric["name"]: metric for metric in snapshot}
+    assert by_name["aisuite.prompt_tokens"]["sum"]["dataPoints"][0]["asInt"] == 4
+    assert by_name["aisuite.completion_tokens"]["sum"]["dataPoints"][0]["asInt"] == 2
+    ttft = by_name["aisuite.time_to_first_token"]["histogram"]["dataPoints"][0]
+    assert ttft["count"] == 1
+
+
+@patch("aisuite.providers.ollama_provider.OllamaProvider.chat_completions_create")
+def test_hooks_observe_streams_closed_early(mock_ollama):
+    mock_ollama.return_value = iter(
+        [ChatCompletionChunk(content="Hel"), ChatCompletionChunk(content="lo")]
+    )
+    hook = RecordingHook()
+    client = Client(hooks=[hook])
+
+    stream = client.chat.completions.create("ollama:llama3", messages=[], stream=True)
+    next(stream)
+    stream.close()
+
+    assert hook.events[1:] == [("on_chunk", "Hel"), ("after_response", None)]
+
+
+@patch("aisuite.providers.ollama_provider.OllamaProvider.chat_completions_create")
+def test_metrics_prometheus_export(mock_ollama):
+    mock_ollama.side_effect = [make_response(), OverloadedError("busy")]
+    metrics = MetricsCollector(buckets=(1.0, 5.0))
+    client = Client(hooks=[metrics])
+
+    client.chat.completions.create("ollama:llama3", messages=[])
+    with pytest.raises(OverloadedError):
+        client.chat.completions.create("ollama:llama3", messages=[])
+
+    text = metrics.to_prometheus()
+    assert 'aisuite_requests_total{provider="ollama",model="llama3"} 2' in text
+    assert (
+        'aisuite_errors_total{provider="ollama",model="llama3",error="OverloadedError"} 1'
+        in text
+    )
+    assert 'aisuite_prompt_tokens_total{provider="ollama",model="llama3"} 5' in text
+    assert 'aisuite_completion_tokens_total{provider="ollama",model="llama3"} 2' in text
+    assert (
+        'aisuite_request_duration_seconds_bucket{provider="ollama",model="llama3",le="1.0"} 1'
+        in text
+    )
+    assert (
+        'aisuite_request_duration_seconds_bucket{provider="ollama",model="llama3",le="+Inf"} 1'
+        in text
+    )
+    assert (
+        'aisuite_request_duration_seconds_count{provider="ollama",model="llama3"} 1'
+        in text
+    )
+
+
+def test_async_client_runs_hooks():
+    hook = RecordingHook()
+    client = AsyncClient(hooks=[hook])
+    response = make_response()
+
+    with patch(
+        "aisuite.providers.ollama_provider.OllamaProvider.achat_completions_create",
+        return_value=response,
+    ):
+        asyncio.run(client.chat.completions.create("ollama:llama3", messages=[]))
+
+    assert hook.events == [
+        ("before_request", "ollama", "llama3"),
+        ("after_response", response),
+    ]
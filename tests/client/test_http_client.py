@@ -0,0 +1,25 @@
+import asyncio
+
+from aisuite.http_client import HttpClient
+
+
+def test_async_clients_are_kept_per_event_loop():
+    http = HttpClient()
+
+    async def get_client():
+        client = http.async_client
+        assert http.async_client is client
+        return client
+
+    first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+    first = first_loop.run_until_complete(get_client())
+    first_loop.close()
+    second = second_loop.run_until_complete(get_client())
+    assert second is not first
+    # The client of the first loop, now closed, was dropped rather than kept.
+    assert list(http._async_clients.values()) == [second]
+
+    second_loop.run_until_complete(http.aclose())
+    second_loop.close()
+    assert second.is_closed
+    assert not http._async_clients
@@ -0,0 +1,59 @@
+import pytest
+
+from aisuite import Client
+from aisuite.framework import CompletionUsage
+from aisuite.provider import Provider
+
+
+class RecordingProvider(Provider):
+    def __init__(self, **config):
+        self.messages = None
+
+    def chat_completions_create(self, model, messages, **kwargs):
+        self.messages = messages
+        return "ok"
+
+
+class CachingProvider(RecordingProvider):
+    supports_cache_markers = True
+
+
+@pytest.fixture
+def registry(register_provider):
+    register_provider("plain", RecordingProvider)
+    register_provider("caching", CachingProvider)
+
+
+MESSAGES = [
+    {"role": "system", "content": "Long instructions.", "cache": True},
+    {"role": "user", "content": "Question?"},
+]
+
+
+def test_cache_markers_are_removed_for_providers_without_caching(registry):
+    client = Client()
+    client.chat.completions.create("plain:model", MESSAGES)
+    assert client.providers["plain"].messages == [
+        {"role": "system", "content": "Long instructions."},
+        {"role": "user", "content": "Question?"},
+    ]
+    # The caller's messages are left untouched.
+    assert MESSAGES[0]["cache"] is True
+
+
+def test_cache_markers_are_kept_for_providers_with_caching(registry):
+    client = Client()
+    client.chat.completions.create("caching:model", MESSAGES)
+    assert client.providers["caching"].messages is MESSAGES
+
+
+def test_openai_cached_tokens():
+    usage = CompletionUsage.from_dict(
+        {
+            "prompt_tokens": 2000,
+            "completion_tokens": 10,
+            "prompt_tokens_details": {"cached_tokens": 1920},
+        }
+    )
+    assert usage.cache_read_tokens == 1920
+    assert usage.cache_write_tokens == 0
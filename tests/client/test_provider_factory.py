@@ -0,0 +1,183 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+from pathlib import Path
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from aisuite import Client
+from aisuite.provider import (
+    Provider,
+    ProviderFactory,
+    BUILTIN_PROVIDERS,
+    locked_cached_property,
+)
+
+
+class EchoProvider(Provider):
+    def __init__(self, **config):
+        self.config = config
+
+    def chat_completions_create(self, model, messages, **kwargs):
+        return f"{model}: {messages[-1]['content']}"
+
+
+class SlowProvider(EchoProvider):
+    instances = 0
+    closed = 0
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        SlowProvider.instances += 1
+        time.sleep(0.05)
+
+    def close(self):
+        SlowProvider.closed += 1
+
+
+@pytest.fixture
+def registry(register_provider):
+    SlowProvider.instances = SlowProvider.closed = 0
+    yield
+    ProviderFactory.close_shared_providers()
+    ProviderFactory.get_supported_providers.cache_clear()
+    ProviderFactory._entry_points.cache_clear()
+
+
+def test_builtin_registry_matches_provider_modules():
+    providers_dir = Path(__file__).parents[2] / "aisuite" / "providers"
+    modules = {
+        path.stem[: -len("_provider")] for path in providers_dir.glob("*_provider.py")
+    }
+    assert set(BUILTIN_PROVIDERS) == modules
+
+
+def test_register_provider(registry, register_provider):
+    register_provider("echo", EchoProvider)
+    assert "echo" in ProviderFactory.get_supported_providers()
+
+    client = Client({"echo": {"greeting": "hi"}})
+    response = client.chat.completions.create(
+        "echo:model", messages=[{"role": "user", "content": "Hello"}]
+    )
+
+    assert response == "model: Hello"
+    assert client.providers["echo"].config == {"greeting": "hi"}
+
+
+def test_unregister_provider():
+    ProviderFactory.register_provider("echo", EchoProvider)
+    ProviderFactory.register_provider("ollama", EchoProvider)
+    ProviderFactory.unregister_provider("echo")
+    ProviderFactory.unregister_provider("ollama")
+
+    assert not ProviderFactory.is_supported("echo")
+    assert "echo" not in ProviderFactory.get_supported_providers()
+    # A built-in provider that was registered over is restored.
+    assert not isinstance(ProviderFactory.create_provider("ollama", {}), EchoProvider)
+
+
+def test_entry_point_providers(registry):
+    class FakeEntryPoint:
+        name = "echo"
+        value = "tests.client.test_provider_factory:EchoProvider"
+
+    ProviderFactory._entry_points.cache_clear()
+    ProviderFactory.get_supported_providers.cache_clear()
+    with patch("importlib.metadata.entry_points", return_value=[FakeEntryPoint()]):
+        assert ProviderFactory.is_supported("echo")
+        provider = ProviderFactory.create_provider("echo", {})
+
+    assert isinstance(provider, EchoProvider)
+
+
+def test_sdks_are_imported_on_first_call():
+    script = """
+import json, sys
+from aisuite import Client
+client = Client({
+    "openai": {"api_key": "x"},
+    "anthropic": {"api_key": "x"},
+    "groq": {"api_key": "x"},
+    "mistral": {"api_key": "x"},
+    "aws": {},
+})
+print(json.dumps([m for m in ("openai", "anthropic", "groq", "mistralai", "boto3", "vertexai") if m in sys.modules]))
+"""
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    assert json.loads(output) == []
+
+
+def test_concurrent_first_calls_create_one_provider(registry, register_provider):
+    register_provider("slow", SlowProvider)
+    client = Client()
+    with ThreadPoolExecutor(8) as executor:
+        providers = list(executor.map(lambda _: client._get_provider("slow"), range(8)))
+    assert SlowProvider.instances == 1
+    assert all(provider is providers[0] for provider in providers)
+
+
+def test_shared_providers(registry, register_provider):
+    register_provider("slow", SlowProvider)
+    first = Client({"slow": {"a": 1, "b": 2}}, share_providers=True)
+    second = Client({"slow": {"b": 2, "a": 1}}, share_providers=True)
+    other = Client({"slow": {"a": 3}}, share_providers=True)
+    private = Client({"slow": {"a": 1, "b": 2}})
+
+    assert first.providers["slow"] is second.providers["slow"]
+    assert other.providers["slow"] is not first.providers["slow"]
+    assert private.providers["slow"] is not first.providers["slow"]
+    assert SlowProvider.instances == 3
+
+    # Closing a client leaves the shared providers open for the others.
+    first.close()
+    assert SlowProvider.closed == 0
+    assert Client({"slow": {"a": 1, "b": 2}}, share_providers=True).providers[
+        "slow"
+    ] is (second.providers["slow"])
+
+    ProviderFactory.close_shared_providers()
+    assert SlowProvider.closed == 2
+
+
+def test_shared_providers_are_closed_asynchronously(registry, register_provider):
+    class AsyncSlowProvider(SlowProvider):
+        async def aclose(self):
+            SlowProvider.closed += 10
+
+    register_provider("aslow", AsyncSlowProvider)
+    register_provider("slow", SlowProvider)
+    Client({"aslow": {}, "slow": {}}, share_providers=True)
+
+    asyncio.run(ProviderFactory.aclose_shared_providers())
+    assert SlowProvider.closed == 11
+
+
+def test_locked_cached_property_is_computed_once():
+    class Holder:
+        calls = 0
+
+        @locked_cached_property
+        def client(self):
+            Holder.calls += 1
+            time.sleep(0.05)
+            return object()
+
+    holder = Holder()
+    barrier = threading.Barrier(8)
+
+    def get(_):
+        barrier.wait()
+        return holder.client
+
+    with ThreadPoolExecutor(8) as executor:
+        clients = list(executor.map(get, range(8)))
+    assert Holder.calls == 1
+    assert all(client is clients[0] for client in clients)
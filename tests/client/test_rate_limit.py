@@ -0,0 +1,94 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+from aisuite import Client, AsyncClient
+from aisuite.rate_limit import TokenBucket, RateLimiter, estimate_tokens
+
+MESSAGES = [{"role": "user", "content": "x" * 400}]
+
+
+def test_token_bucket_reservations():
+    bucket = TokenBucket(per_minute=60, burst=2)  # one unit per second
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert 0.9 < bucket.reserve() <= 1.0
+    # A further reservation queues behind the previous one.
+    assert 1.9 < bucket.reserve() <= 2.0
+
+
+def test_estimate_tokens_includes_max_tokens():
+    assert estimate_tokens(MESSAGES, {}) == 101
+    assert estimate_tokens(MESSAGES, {"max_tokens": 50}) == 151
+
+
+def test_rate_limiter_uses_tightest_limit():
+    limiter = RateLimiter(
+        requests_per_minute=6000,
+        models={"slow-model": {"requests_per_minute": 60}},
+    )
+    limiter._model_buckets["slow-model"][0].level = 0
+
+    with patch("aisuite.rate_limit.time.sleep") as mock_sleep:
+        limiter.acquire("fast-model", MESSAGES, {})
+        mock_sleep.assert_not_called()
+
+        limiter.acquire("slow-model", MESSAGES, {})
+        mock_sleep.assert_called_once()
+        assert 0.9 < mock_sleep.call_args.args[0] <= 1.0
+
+
+@patch("aisuite.providers.ollama_provider.OllamaProvider.chat_completions_create")
+def test_client_enforces_configured_limits(mock_ollama):
+    mock_ollama.return_value = "Ollama Response"
+    client = Client(
+        {
+            "ollama": {
+                "rate_limit": {"requests_per_minute": 1200, "tokens_per_minute": 100000}
+            }
+        }
+    )
+    limiter = client._get_rate_limiter("ollama")
+    limiter._buckets[0].burst = limiter._buckets[0].level = 1
+
+    start = time.monotonic()
+    client.chat.completions.create("ollama:llama3", MESSAGES)
+    client.chat.completions.create("ollama:llama3", MESSAGES)
+    elapsed = time.monotonic() - start
+
+    # 1200 requests per minute is one every 50ms once the burst is spent.
+    assert elapsed >= 0.04
+    assert mock_ollama.call_count == 2
+
+
+def test_rate_limit_config_is_not_passed_to_provider():
+    with patch("aisuite.provider.ProviderFactory.create_provider") as mock_create:
+        Client({"groq": {"api_key": "key", "rate_limit": {"requests_per_minute": 30}}})
+
+    mock_create.assert_called_once_with("groq", {"api_key": "key"})
+
+
+def test_async_client_shares_limiter_across_tasks():
+    client = AsyncClient({"ollama": {"rate_limit": {"requests_per_minute": 600}}})
+    limiter = client._get_rate_limiter("ollama")
+    limiter._buckets[0].burst = limiter._buckets[0].level = 1
+
+    async def fake_create(self, model, messages, **kwargs):
+        return time.monotonic()
+
+    async def run():
+        with patch(
+            "aisuite.providers.ollama_provider.OllamaProvider.achat_completions_create",
+            fake_create,
+        ):
+            return await asyncio.gather(
+                *[
+                    client.chat.completions.create("ollama:llama3", MESSAGES)
+                    for _ in range(3)
+                ]
+            )
+
+    finished = sorted(asyncio.run(run()))
+    # 600 requests per minute is one every 100ms after the first.
+    assert finished[2] - finished[0] >= 0.18
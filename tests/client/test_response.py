@@ -0,0 +1,99 @@
+import pickle
+from types import SimpleNamespace
+
+from aisuite.framework import ChatCompletionResponse
+
+
+def test_default_response_has_one_empty_choice():
+    response = ChatCompletionResponse()
+    response.choices[0].message.content = "Hi"
+    assert response.choices[0].message.role == "assistant"
+    assert response.usage is None
+    assert not hasattr(response, "__dict__")
+
+
+def test_from_openai_dict():
+    response = ChatCompletionResponse.from_openai_dict(
+        {
+            "model": "llama3",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "Hi"},
+                    "finish_reason": "stop",
+                },
+                {
+                    "index": 1,
+                    "message": {
+                        "role": "assistant",
+                        "content": None,
+                        "tool_calls": [
+                            {
+                                "id": "call_1",
+                                "type": "function",
+                                "function": {
+                                    "name": "get_weather",
+                                    "arguments": '{"city": "Paris"}',
+                                },
+                            }
+                        ],
+                    },
+                    "finish_reason": "tool_calls",
+                },
+            ],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 4},
+        }
+    )
+
+    assert [c.message.content for c in response.choices] == ["Hi", None]
+    assert [c.finish_reason for c in response.choices] == ["stop", "tool_calls"]
+    tool_call = response.choices[1].message.tool_calls[0]
+    assert (tool_call.id, tool_call.function.name) == ("call_1", "get_weather")
+    assert tool_call.function.arguments == '{"city": "Paris"}'
+    assert response.usage.total_tokens == 14
+    assert response.model == "llama3"
+    assert response.raw["model"] == "llama3"
+
+
+def test_from_openai_object_encodes_dict_arguments():
+    call = SimpleNamespace(
+        id="call_1",
+        type=None,
+        function=SimpleNamespace(name="get_weather", arguments={"city": "Paris"}),
+    )
+    sdk_response = SimpleNamespace(
+        model=None,
+        choices=[
+            SimpleNamespace(
+                index=0,
+                message=SimpleNamespace(content=None, role=None, tool_calls=[call]),
+                finish_reason="tool_calls",
+            )
+        ],
+        usage=SimpleNamespace(prompt_tokens=3, completion_tokens=2),
+    )
+
+    response = ChatCompletionResponse.from_openai_object(sdk_response, "mistral-large")
+
+    tool_call = response.choices[0].message.tool_calls[0]
+    assert tool_call.type == "function"
+    assert tool_call.function.arguments == '{"city": "Paris"}'
+    assert response.model == "mistral-large"
+    assert response.raw is sdk_response
+
+
+def test_raw_is_resolved_lazily_and_on_pickle():
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {"id": "x"}
+
+    response = ChatCompletionResponse(raw=load)
+    assert calls == []
+
+    restored = pickle.loads(pickle.dumps(response))
+
+    assert restored.raw == {"id": "x"}
+    assert response.raw == {"id": "x"}
+    assert calls == [1]
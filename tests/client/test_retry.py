@@ -0,0 +1,131 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from aisuite import Client, AsyncClient
+from aisuite.provider import (
+    LLMError,
+    RateLimitError,
+    OverloadedError,
+    APITimeoutError,
+    AuthenticationError,
+    BadRequestError,
+    error_from_status,
+    parse_retry_after,
+)
+from aisuite.retry import RetryPolicy
+
+
+@pytest.mark.parametrize(
+    "status_code, error_class",
+    [
+        (429, RateLimitError),
+        (503, OverloadedError),
+        (529, OverloadedError),
+        (504, APITimeoutError),
+        (401, AuthenticationError),
+        (400, BadRequestError),
+        (404, BadRequestError),
+    ],
+)
+def test_error_from_status(status_code, error_class):
+    error = error_from_status(status_code, "failed", provider="groq")
+    assert type(error) is error_class
+    assert error.status_code == status_code
+    assert error.provider == "groq"
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after-ms": "250", "retry-after": "1"}) == 0.25
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({}) is None
+
+
+def flaky(errors, result="ok"):
+    """Return a function that raises the given errors in turn, then returns result."""
+    errors = list(errors)
+    calls = []
+
+    def fn():
+        calls.append(time.monotonic())
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    fn.calls = calls
+    return fn
+
+
+@patch("aisuite.retry.time.sleep")
+def test_retries_retryable_errors_with_backoff(mock_sleep):
+    fn = flaky([OverloadedError("busy"), RateLimitError("slow down", retry_after=2.0)])
+    policy = RetryPolicy(max_attempts=3, initial_backoff=1.0, max_backoff=10.0)
+
+    assert policy.call(fn) == "ok"
+    assert len(fn.calls) == 3
+    first_wait, second_wait = [c.args[0] for c in mock_sleep.call_args_list]
+    assert 0 <= first_wait <= 1.0  # jittered
+    assert second_wait == 2.0  # Retry-After honored
+
+
+@patch("aisuite.retry.time.sleep")
+def test_fatal_errors_and_exhausted_attempts_are_raised(mock_sleep):
+    fn = flaky([BadRequestError("bad")])
+    with pytest.raises(BadRequestError):
+        RetryPolicy().call(fn)
+    assert len(fn.calls) == 1
+
+    fn = flaky([RateLimitError("slow down")] * 5)
+    with pytest.raises(RateLimitError):
+        RetryPolicy(max_attempts=2).call(fn)
+    assert len(fn.calls) == 2
+
+    with pytest.raises(ValueError):
+        RetryPolicy().call(flaky([ValueError("not an LLMError")]))
+
+
+def test_deadline_stops_retries():
+    fn = flaky([RateLimitError("slow down", retry_after=5.0)])
+    with pytest.raises(RateLimitError):
+        RetryPolicy(max_attempts=5, max_backoff=10.0, deadline=1.0).call(fn)
+    assert len(fn.calls) == 1
+
+
+def test_async_deadline_bounds_slow_attempts():
+    async def slow():
+        await asyncio.sleep(1)
+
+    policy = RetryPolicy(max_attempts=3, initial_backoff=0.01, deadline=0.1)
+    start = time.monotonic()
+    with pytest.raises(APITimeoutError):
+        asyncio.run(policy.acall(slow))
+    assert time.monotonic() - start < 0.5
+
+
+@patch("aisuite.providers.ollama_provider.OllamaProvider.chat_completions_create")
+def test_client_applies_retry_policy(mock_ollama):
+    mock_ollama.side_effect = [OverloadedError("busy"), "Ollama Response"]
+    client = Client(retry_policy=RetryPolicy(initial_backoff=0.01))
+
+    response = client.chat.completions.create("ollama:llama3", messages=[])
+
+    assert response == "Ollama Response"
+    assert mock_ollama.call_count == 2
+
+
+def test_async_client_applies_retry_policy():
+    client = AsyncClient(retry_policy=RetryPolicy(initial_backoff=0.01))
+
+    with patch(
+        "aisuite.providers.ollama_provider.OllamaProvider.achat_completions_create",
+        side_effect=[APITimeoutError("timed out"), "Ollama Response"],
+    ) as mock_ollama:
+        response = asyncio.run(
+            client.chat.completions.create("ollama:llama3", messages=[])
+        )
+
+    assert response == "Ollama Response"
+    assert mock_ollama.call_count == 2
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from aisuite import Client, AsyncClient
+from aisuite.provider import OverloadedError, BadRequestError
+from aisuite import routing
+from aisuite.routing import Route, route_call, aroute_call
+
+
+def test_fails_over_to_next_target_on_retryable_error():
+    calls = []
+
+    def call(target):
+        calls.append(target)
+        if target == "groq:llama3":
+            raise OverloadedError("busy")
+        return target
+
+    assert route_call(Route(["groq:llama3", "ollama:llama3"]), call) == "ollama:llama3"
+    assert calls == ["groq:llama3", "ollama:llama3"]
+
+
+def test_fatal_error_is_not_failed_over():
+    calls = []
+
+    def call(target):
+        calls.append(target)
+        raise BadRequestError("bad request")
+
+    with pytest.raises(BadRequestError):
+        route_call(Route(["groq:llama3", "ollama:llama3"]), call)
+    assert calls == ["groq:llama3"]
+
+
+def test_last_error_is_raised_when_all_targets_fail():
+    def call(target):
+        raise OverloadedError(target)
+
+    with pytest.raises(OverloadedError, match="ollama:llama3"):
+        route_call(Route(["groq:llama3", "ollama:llama3"]), call)
+
+
+def test_hedge_returns_faster_backup():
+    release = threading.Event()
+
+    def call(target):
+        if target == "groq:llama3":
+            release.wait(2)
+            return "slow"
+        return "fast"
+
+    route = Route(["groq:llama3", "ollama:llama3"], hedge_after=0.05)
+    start = time.monotonic()
+    assert route_call(route, call) == "fast"
+    assert time.monotonic() - start < 1
+    release.set()
+
+
+def test_hedge_sends_backup_early_when_primary_fails():
+    def call(target):
+        if target == "groq:llama3":
+            raise OverloadedError("busy")
+        return "backup"
+
+    route = Route(["groq:llama3", "ollama:llama3"], hedge_after=10)
+    start = time.monotonic()
+    assert route_call(route, call) == "backup"
+    assert time.monotonic() - start < 1
+
+
+def test_hedge_delay_from_latency_percentile():
+    route = Route(
+        ["groq:llama3", "ollama:llama3"],
+        hedge_after=1.0,
+        hedge_percentile=0.9,
+        min_samples=10,
+    )
+    assert route.hedge_delay("groq:llama3") == 1.0
+    for latency in range(1, 11):
+        route.on_success("groq:llama3", latency / 10)
+    assert route.hedge_delay("groq:llama3") == 1.0
+    route.on_success("groq:llama3", 0.05)
+    assert route.hedge_delay("groq:llama3") == 0.9
+
+
+def test_async_hedge_cancels_loser():
+    cancelled = []
+
+    async def call(target):
+        if target == "groq:llama3":
+            try:
+                await asyncio.sleep(2)
+            except asyncio.CancelledError:
+                cancelled.append(target)
+                raise
+            return "slow"
+        return "fast"
+
+    async def run():
+        route = Route(["groq:llama3", "ollama:llama3"], hedge_after=0.05)
+        result = await aroute_call(route, call)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == "fast"
+    assert cancelled == ["groq:llama3"]
+
+
+class Stream:
+    def __init__(self, target):
+        self.target = target
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_hedge_closes_a_loser_that_finished_at_the_same_time():
+    streams = []
+    both = threading.Barrier(2)
+
+    def call(target):
+        both.wait(2)
+        streams.append(Stream(target))
+        return streams[-1]
+
+    real_wait = routing.wait
+
+    def wait_for_both(futures, timeout, return_when):
+        return real_wait(futures, timeout=None if len(futures) == 2 else timeout)
+
+    route = Route(["groq:llama3", "ollama:llama3"], hedge_after=0.05)
+    with patch.object(routing, "wait", wait_for_both):
+        winner = route_call(route, call)
+    assert not winner.closed
+    assert [s.closed for s in streams if s is not winner] == [True]
+
+
+def test_async_hedge_closes_a_loser_that_finished_at_the_same_time():
+    streams = []
+
+    async def call(target):
+        await asyncio.sleep(0.1 if target == "groq:llama3" else 0.05)
+        streams.append(Stream(target))
+        return streams[-1]
+
+    async def run():
+        route = Route(["groq:llama3", "ollama:llama3"], hedge_after=0.05)
+        real_wait = asyncio.wait
+
+        async def wait_for_both(tasks, timeout, return_when):
+            if len(tasks) == 2:
+                return await real_wait(tasks)
+            return await real_wait(tasks, timeout=timeout, return_when=return_when)
+
+        with patch.object(routing.asyncio, "wait", wait_for_both):
+            winner = await aroute_call(route, call)
+        await asyncio.sleep(0.01)
+        return winner
+
+    winner = asyncio.run(run())
+    assert not winner.closed
+    assert [s.closed for s in streams if s is not winner] == [True]
+
+
+@patch("aisuite.providers.ollama_provider.OllamaProvider.chat_completions_create")
+@patch("aisuite.providers.groq_provider.GroqProvider.chat_completions_create")
+def test_client_accepts_list_of_models(mock_groq, mock_ollama):
+    mock_groq.side_effect = OverloadedError("busy")
+    mock_ollama.return_value = "Ollama Response"
+    client = Client({"groq": {"api_key": "groq-api-key"}})
+
+    response = client.chat.completions.create(
+        ["groq:llama3", "ollama:llama3"], messages=[], temperature=0.5
+    )
+
+    assert response == "Ollama Response"
+    mock_groq.assert_called_once_with("llama3", [], temperature=0.5)
+    mock_ollama.assert_called_once_with("llama3", [], temperature=0.5)
+
+
+def test_async_client_accepts_route():
+    client = AsyncClient()
+
+    with patch(
+        "aisuite.providers.ollama_provider.OllamaProvider.achat_completions_create",
+        side_effect=[OverloadedError("busy"), "Ollama Response"],
+    ) as mock_ollama:
+        response = asyncio.run(
+            client.chat.completions.create(
+                Route(["ollama:llama3", "ollama:mistral"]), messages=[]
+            )
+        )
+
+    assert response == "Ollama Response"
+    assert [c.args[0] for c in mock_ollama.call_args_list] == ["llama3", "mistral"]
@@ -0,0 +1,143 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+from aisuite import AsyncClient, Client
+from aisuite.metrics import MetricsCollector
+from aisuite.provider import Provider, RateLimitError
+from aisuite.singleflight import SingleFlight
+
+
+class SlowProvider(Provider):
+    """Answers after a delay, counting the calls it receives."""
+
+    def __init__(self, **config):
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.error = None
+
+    def chat_completions_create(self, model, messages, **kwargs):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.2)
+        if self.error:
+            raise self.error
+        return f"answer {self.calls}"
+
+    async def achat_completions_create(self, model, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.2)
+        if self.error:
+            raise self.error
+        return f"answer {self.calls}"
+
+
+@pytest.fixture
+def registry(register_provider):
+    register_provider("slow", SlowProvider)
+
+
+MESSAGES = [{"role": "user", "content": "Same question"}]
+
+
+def run_threads(client, count, **kwargs):
+    with ThreadPoolExecutor(count) as executor:
+        futures = [
+            executor.submit(
+                client.chat.completions.create, "slow:model", MESSAGES, **kwargs
+            )
+            for _ in range(count)
+        ]
+        return [future.result() for future in futures]
+
+
+def test_identical_requests_in_flight_share_one_call(registry):
+    metrics = MetricsCollector()
+    client = Client(coalesce=True, hooks=[metrics])
+
+    assert run_threads(client, 8) == ["answer 1"] * 8
+    assert client.providers["slow"].calls == 1
+    assert client.singleflight.stats()["collapsed"] == 7
+    assert 'aisuite_coalesced_requests_total{provider="slow",model="model"} 7' in (
+        metrics.to_prometheus()
+    )
+    assert 'aisuite_requests_total{provider="slow",model="model"} 1' in (
+        metrics.to_prometheus()
+    )
+
+    # Once the call has completed, the next request makes a new one.
+    client.chat.completions.create("slow:model", MESSAGES)
+    assert client.providers["slow"].calls == 2
+
+
+def test_different_requests_are_not_coalesced(registry):
+    client = Client(coalesce=True)
+    with ThreadPoolExecutor(2) as executor:
+        list(
+            executor.map(
+                lambda t: client.chat.completions.create(
+                    "slow:model", MESSAGES, temperature=t
+                ),
+                [0, 1],
+            )
+        )
+    assert client.providers["slow"].calls == 2
+
+
+def test_opt_out_and_streams_are_not_coalesced(registry):
+    client = Client(coalesce=True)
+    run_threads(client, 3, coalesce=False)
+    assert client.providers["slow"].calls == 3
+
+    client = Client()
+    run_threads(client, 3)
+    assert client.providers["slow"].calls == 3
+
+
+def test_errors_are_shared(registry):
+    client = Client(coalesce=True)
+    client._get_provider("slow").error = RateLimitError("slow down")
+    with ThreadPoolExecutor(4) as executor:
+        futures = [
+            executor.submit(client.chat.completions.create, "slow:model", MESSAGES)
+            for _ in range(4)
+        ]
+        for future in futures:
+            with pytest.raises(RateLimitError):
+                future.result()
+    assert client.providers["slow"].calls == 1
+
+
+def test_async_requests_are_coalesced(registry):
+    async def main():
+        client = AsyncClient(coalesce=True)
+        responses = await asyncio.gather(
+            *(client.chat.completions.create("slow:model", MESSAGES) for _ in range(5))
+        )
+        assert responses == ["answer 1"] * 5
+        assert client.providers["slow"].calls == 1
+        assert client.singleflight.stats()["collapsed"] == 4
+
+    asyncio.run(main())
+
+
+def test_cancelling_the_leader_does_not_cancel_the_followers():
+    flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.ado("key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.ado("key", call))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await follower == "done"
+        assert flight.stats()["calls"] == 1
+
+    asyncio.run(main())
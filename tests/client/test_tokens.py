@@ -0,0 +1,119 @@
+import pytest
+
+from aisuite import Client
+from aisuite import tokens
+from aisuite.provider import ContextWindowExceededError, Provider
+
+
+class RecordingProvider(Provider):
+    def __init__(self, **config):
+        self.messages = None
+
+    def chat_completions_create(self, model, messages, **kwargs):
+        self.messages = messages
+        return "ok"
+
+
+@pytest.fixture
+def registry(register_provider):
+    windows = dict(tokens.CONTEXT_WINDOWS)
+    register_provider("small", RecordingProvider)
+    tokens.register_context_window("small:model", 30)
+    yield
+    tokens.CONTEXT_WINDOWS = windows
+    tokens.context_window.cache_clear()
+
+
+def message(role, words):
+    return {"role": role, "content": " ".join(["word"] * words)}
+
+
+def test_approximate_tokenizer():
+    tokenizer = tokens.ApproximateTokenizer()
+    assert tokenizer.count("") == 0
+    assert tokenizer.count("Hello, world!") == 4
+    assert tokenizer.count("internationalization") == 4
+
+
+def test_count_tokens_adds_message_overhead():
+    messages = [message("system", 2), message("user", 3)]
+    count = tokens.count_tokens("mistral", "mistral-large-latest", messages)
+    assert count == tokens.TOKENS_PER_REPLY + 2 * tokens.TOKENS_PER_MESSAGE + 5
+
+    client = Client()
+    assert client.count_tokens("mistral:mistral-large-latest", messages) == count
+
+
+def test_tokenizers_are_memoized():
+    assert tokens.get_tokenizer("openai", "gpt-4o") is tokens.get_tokenizer(
+        "openai", "gpt-4o"
+    )
+
+
+def test_context_window_matches_longest_prefix():
+    assert tokens.context_window("openai", "gpt-4") == 8_192
+    assert tokens.context_window("openai", "gpt-4o-2024-08-06") == 128_000
+    assert tokens.context_window("openai", "unknown-model") is None
+
+
+def test_preflight_error(registry):
+    client = Client(preflight="error")
+    with pytest.raises(ContextWindowExceededError, match="30-token context window"):
+        client.chat.completions.create("small:model", [message("user", 40)])
+    with pytest.raises(ContextWindowExceededError):
+        client.chat.completions.create(
+            "small:model", [message("user", 10)], max_tokens=30
+        )
+
+    client.chat.completions.create("small:model", [message("user", 10)])
+    # Per-call override.
+    client.chat.completions.create(
+        "small:model", [message("user", 40)], preflight=False
+    )
+    assert len(client.providers["small"].messages[0]["content"].split()) == 40
+
+
+def test_preflight_truncate_drops_oldest_turns(registry):
+    client = Client()
+    messages = [
+        message("system", 5),
+        message("user", 10),
+        message("assistant", 10),
+        message("user", 5),
+    ]
+    client.chat.completions.create("small:model", messages, preflight="truncate")
+    assert client.providers["small"].messages == [messages[0], messages[3]]
+
+    with pytest.raises(ContextWindowExceededError):
+        client.chat.completions.create(
+            "small:model", [message("user", 50)], preflight="truncate"
+        )
+
+
+def test_preflight_truncate_keeps_tool_results_with_their_calls(registry):
+    client = Client()
+    call = {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {
+                "id": "call_1",
+                "type": "function",
+                "function": {"name": "lookup", "arguments": "{}"},
+            }
+        ],
+    }
+    result = {"role": "tool", "tool_call_id": "call_1", "content": "word " * 10}
+    for messages in (
+        [message("system", 5), message("user", 10), call, result, message("user", 5)],
+        [message("system", 5), message("assistant", 10), result, message("user", 5)],
+    ):
+        client.chat.completions.create("small:model", messages, preflight="truncate")
+        assert client.providers["small"].messages == [messages[0], messages[-1]]
+
+
+def test_preflight_skips_unknown_models(registry):
+    client = Client(preflight="error")
+    tokens.CONTEXT_WINDOWS.pop("small:model")
+    tokens.context_window.cache_clear()
+    client.chat.completions.create("small:model", [message("user", 100)])
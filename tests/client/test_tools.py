@@ -0,0 +1,256 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Literal, Optional
+
+import pytest
+
+from aisuite import AsyncClient, Client
+from aisuite.framework import (
+    ChatCompletionResponse,
+    Choice,
+    Function,
+    Message,
+    ToolCall,
+)
+from aisuite.provider import Provider
+from aisuite.tools import Tool, ToolRunner, function_parameters, tool
+
+
+class ScriptedProvider(Provider):
+    """
+    Calls the configured tools in reply to a user message and, once their results
+    are sent back, answers with the results (or calls them again, with always_call).
+    """
+
+    def __init__(self, calls=(), always_call=False):
+        self.calls = calls
+        self.always_call = always_call
+        self.requests = []
+
+    def chat_completions_create(self, model, messages, **kwargs):
+        self.requests.append((list(messages), kwargs))
+        if messages[-1]["role"] == "tool" and not self.always_call:
+            results = [m["content"] for m in messages if m["role"] == "tool"]
+            return ChatCompletionResponse(
+                choices=[Choice(message=Message(content=" | ".join(results)))]
+            )
+        tool_calls = [
+            ToolCall(id=f"call_{index}", function=Function(name, json.dumps(args)))
+            for index, (name, args) in enumerate(self.calls)
+        ]
+        return ChatCompletionResponse(
+            choices=[
+                Choice(
+                    message=Message(tool_calls=tool_calls), finish_reason="tool_calls"
+                )
+            ]
+        )
+
+    async def achat_completions_create(self, model, messages, **kwargs):
+        return self.chat_completions_create(model, messages, **kwargs)
+
+
+@pytest.fixture
+def registry(register_provider):
+    register_provider("scripted", ScriptedProvider)
+
+
+MESSAGES = [{"role": "user", "content": "Weather in Paris and Rome?"}]
+
+
+def weather_calls(*cities):
+    return [("get_weather", {"city": city}) for city in cities]
+
+
+def test_function_parameters():
+    def search(
+        query: str,
+        limit: int = 10,
+        mode: Literal["fast", "exact"] = "fast",
+        tags: list[str] = None,
+        after: Optional[float] = None,
+        **options,
+    ):
+        """Search the documents."""
+
+    assert function_parameters(search) == {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string"},
+            "limit": {"type": "integer"},
+            "mode": {"enum": ["fast", "exact"]},
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "after": {"type": "number"},
+        },
+        "required": ["query"],
+    }
+    assert tool(search).spec["function"]["description"] == "Search the documents."
+    assert tool(name="find")(search).name == "find"
+
+
+def test_tool_calls_of_one_reply_run_in_parallel(registry):
+    threads = set()
+
+    @tool
+    def get_weather(city: str):
+        """Return the weather in a city."""
+        threads.add(threading.get_ident())
+        time.sleep(0.2)
+        return {"city": city, "sky": "sunny"}
+
+    client = Client({"scripted": {"calls": weather_calls("Paris", "Rome")}})
+    start = time.monotonic()
+    result = client.chat.completions.run_tools(
+        "scripted:model", MESSAGES, [get_weather]
+    )
+
+    assert time.monotonic() - start < 0.35
+    assert len(threads) == 2
+    assert result.turns == 2
+    assert result.content == (
+        '{"city": "Paris", "sky": "sunny"} | {"city": "Rome", "sky": "sunny"}'
+    )
+    assert [m["role"] for m in result.messages] == [
+        "user",
+        "assistant",
+        "tool",
+        "tool",
+        "assistant",
+    ]
+    assert result.messages[2]["tool_call_id"] == "call_0"
+    # The caller's messages are not modified, and the tools are sent every turn.
+    assert len(MESSAGES) == 1
+    requests = client.providers["scripted"].requests
+    assert all(kwargs["tools"] == [get_weather.spec] for _, kwargs in requests)
+
+
+def test_tool_errors_and_timeouts_are_reported_to_the_model(registry):
+    @tool(timeout=0.05)
+    def slow():
+        time.sleep(0.5)
+
+    def broken():
+        raise RuntimeError("database is down")
+
+    client = Client(
+        {
+            "scripted": {
+                "calls": [("slow", {}), ("broken", {}), ("missing", {})],
+            }
+        }
+    )
+    start = time.monotonic()
+    result = client.chat.completions.run_tools(
+        "scripted:model", MESSAGES, [slow, broken]
+    )
+    assert time.monotonic() - start < 0.3
+    assert result.content == (
+        "Error: tool 'slow' timed out after 0.05 seconds. | "
+        "Error: RuntimeError: database is down | "
+        "Error: ValueError: Unknown tool 'missing'."
+    )
+
+
+def test_pure_tool_results_are_cached(registry):
+    calls = []
+
+    @tool(pure=True)
+    def get_weather(city: str):
+        calls.append(city)
+        return "sunny"
+
+    runner = ToolRunner([get_weather])
+    client = Client({"scripted": {"calls": weather_calls("Paris", "Paris", "Rome")}})
+    for _ in range(2):
+        result = client.chat.completions.run_tools("scripted:model", MESSAGES, runner)
+        assert result.content == "sunny | sunny | sunny"
+    # Identical calls in one reply run once, and later runs reuse the results.
+    assert sorted(calls) == ["Paris", "Rome"]
+    assert runner.cache.stats()["hits"] == 3
+    runner.close()
+
+
+def test_max_turns(registry):
+    client = Client(
+        {"scripted": {"calls": weather_calls("Paris"), "always_call": True}}
+    )
+    result = client.chat.completions.run_tools(
+        "scripted:model", MESSAGES, [lambda city: "sunny"], max_turns=3
+    )
+    assert result.turns == 3
+    assert result.response.choices[0].finish_reason == "tool_calls"
+    assert len(client.providers["scripted"].requests) == 3
+    with pytest.raises(ValueError):
+        client.chat.completions.run_tools("scripted:model", MESSAGES, [], max_turns=0)
+
+
+def test_create_accepts_tool_objects(registry):
+    def get_weather(city: str):
+        """Return the weather in a city."""
+
+    client = Client({"scripted": {}})
+    client.chat.completions.create("scripted:model", MESSAGES, tools=[get_weather])
+    [(_, kwargs)] = client.providers["scripted"].requests
+    assert kwargs["tools"] == [Tool(get_weather).spec]
+
+
+def test_async_tools_run_concurrently(registry):
+    async def get_weather(city: str):
+        await asyncio.sleep(0.2)
+        return f"sunny in {city}"
+
+    @tool(timeout=0.05)
+    async def forecast(city: str):
+        await asyncio.sleep(1)
+
+    def sync_weather(city: str):
+        time.sleep(0.2)
+        return f"cloudy in {city}"
+
+    async def main():
+        client = AsyncClient(
+            {
+                "scripted": {
+                    "calls": weather_calls("Paris", "Rome")
+                    + [
+                        ("forecast", {"city": "Oslo"}),
+                        ("sync_weather", {"city": "Bern"}),
+                    ]
+                }
+            }
+        )
+        start = time.monotonic()
+        result = await client.chat.completions.run_tools(
+            "scripted:model", MESSAGES, [get_weather, forecast, sync_weather]
+        )
+        assert time.monotonic() - start < 0.35
+        assert result.content == (
+            "sunny in Paris | sunny in Rome | "
+            "Error: tool 'forecast' timed out after 0.05 seconds. | cloudy in Bern"
+        )
+
+    asyncio.run(main())
+
+
+def test_bad_arguments_are_reported_to_the_model(registry):
+    async def add(a: int, b: int):
+        return a + b
+
+    def multiply(a: int, b: int):
+        return a * b
+
+    calls = [("add", {"a": 1}), ("multiply", {"a": 2, "c": 3})]
+
+    async def main():
+        client = AsyncClient({"scripted": {"calls": calls}})
+        return await client.chat.completions.run_tools(
+            "scripted:model", MESSAGES, [add, multiply]
+        )
+
+    add_result, multiply_result = asyncio.run(main()).content.split(" | ")
+    assert add_result.startswith("Error: TypeError: ")
+    assert "missing 1 required positional argument: 'b'" in add_result
+    assert multiply_result.startswith("Error: TypeError: ")
+    assert "unexpected keyword argument 'c'" in multiply_result
@@ -0,0 +1,238 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from aisuite.providers.anthropic_provider import AnthropicProvider, build_request
+
+
+def test_normalize_response():
+    """Test that text and tool_use blocks are normalized into one choice."""
+
+    response = SimpleNamespace(
+        model="claude-3-5-sonnet-20240620",
+        stop_reason="tool_use",
+        content=[
+            SimpleNamespace(type="text", text="Let me check."),
+            SimpleNamespace(
+                type="tool_use",
+                id="toolu_1",
+                name="get_weather",
+                input={"city": "Paris"},
+            ),
+        ],
+        usage=SimpleNamespace(input_tokens=20, output_tokens=8),
+    )
+
+    normalized = AnthropicProvider(api_key="test-api-key").normalize_response(response)
+
+    choice = normalized.choices[0]
+    assert choice.message.content == "Let me check."
+    assert choice.finish_reason == "tool_calls"
+    assert choice.message.tool_calls[0].id == "toolu_1"
+    assert choice.message.tool_calls[0].function.arguments == '{"city": "Paris"}'
+    assert normalized.usage.prompt_tokens == 20
+    assert normalized.usage.completion_tokens == 8
+    assert normalized.model == "claude-3-5-sonnet-20240620"
+    assert normalized.raw is response
+
+
+def test_cache_markers_become_cache_control_breakpoints():
+    """Test that marked messages are sent as content blocks with cache_control."""
+
+    request = build_request(
+        "claude-3-5-sonnet-20240620",
+        [
+            {"role": "system", "content": "Long instructions.", "cache": True},
+            {"role": "user", "content": "Long document.", "cache": True},
+            {"role": "assistant", "content": "Noted."},
+            {"role": "user", "content": "Question?"},
+        ],
+    )
+
+    breakpoint_block = {
+        "type": "text",
+        "text": "Long instructions.",
+        "cache_control": {"type": "ephemeral"},
+    }
+    assert request["system"] == [breakpoint_block]
+    assert request["messages"] == [
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "Long document.",
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        },
+        {"role": "assistant", "content": "Noted."},
+        {"role": "user", "content": "Question?"},
+    ]
+
+
+def test_cache_usage():
+    """Test that cached prompt tokens are counted in prompt_tokens and reported apart."""
+
+    response = SimpleNamespace(
+        model="claude-3-5-sonnet-20240620",
+        stop_reason="end_turn",
+        content=[SimpleNamespace(type="text", text="Hi")],
+        usage=SimpleNamespace(
+            input_tokens=10,
+            output_tokens=5,
+            cache_read_input_tokens=2000,
+            cache_creation_input_tokens=300,
+        ),
+    )
+
+    usage = AnthropicProvider(api_key="test-api-key").normalize_response(response).usage
+    assert usage.prompt_tokens == 2310
+    assert usage.cache_read_tokens == 2000
+    assert usage.cache_write_tokens == 300
+    assert usage.total_tokens == 2315
+
+
+def test_tools_and_tool_messages_are_mapped_to_tool_use_blocks():
+    """Test that OpenAI-style tools, tool calls and tool results use Anthropic blocks."""
+
+    tools = [
+        {
+            "type": "function",
+            "function": {
+                "name": "get_weather",
+                "description": "Return the weather in a city.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {"city": {"type": "string"}},
+                },
+            },
+        }
+    ]
+    request = build_request(
+        "claude-3-5-sonnet-20240620",
+        [
+            {"role": "user", "content": "Weather in Paris and Rome?"},
+            {
+                "role": "assistant",
+                "content": "Let me check.",
+                "tool_calls": [
+                    {
+                        "id": "toolu_1",
+                        "type": "function",
+                        "function": {
+                            "name": "get_weather",
+                            "arguments": '{"city": "Paris"}',
+                        },
+                    },
+                    {
+                        "id": "toolu_2",
+                        "type": "function",
+                        "function": {
+                            "name": "get_weather",
+                            "arguments": '{"city": "Rome"}',
+                        },
+                    },
+                ],
+            },
+            {"role": "tool", "tool_call_id": "toolu_1", "content": "Sunny"},
+            {"role": "tool", "tool_call_id": "toolu_2", "content": "Rainy"},
+        ],
+        tools=tools,
+        tool_choice={"type": "function", "function": {"name": "get_weather"}},
+    )
+
+    assert request["tools"] == [
+        {
+            "name": "get_weather",
+            "description": "Return the weather in a city.",
+            "input_schema": tools[0]["function"]["parameters"],
+        }
+    ]
+    assert request["tool_choice"] == {"type": "tool", "name": "get_weather"}
+    assert request["messages"][1:] == [
+        {
+            "role": "assistant",
+            "content": [
+                {"type": "text", "text": "Let me check."},
+                {
+                    "type": "tool_use",
+                    "id": "toolu_1",
+                    "name": "get_weather",
+                    "input": {"city": "Paris"},
+                },
+                {
+                    "type": "tool_use",
+                    "id": "toolu_2",
+                    "name": "get_weather",
+                    "input": {"city": "Rome"},
+                },
+            ],
+        },
+        {
+            "role": "user",
+            "content": [
+                {"type": "tool_result", "tool_use_id": "toolu_1", "content": "Sunny"},
+                {"type": "tool_result", "tool_use_id": "toolu_2", "content": "Rainy"},
+            ],
+        },
+    ]
+
+
+def test_streamed_tool_use_blocks_become_tool_calls():
+    """Test that tool_use blocks and their input_json_delta events are streamed."""
+
+    def event(type, **fields):
+        return SimpleNamespace(type=type, **fields)
+
+    def delta(index, **fields):
+        return event(
+            "content_block_delta", index=index, delta=SimpleNamespace(**fields)
+        )
+
+    events = [
+        event(
+            "message_start",
+            message=SimpleNamespace(
+                usage=SimpleNamespace(input_tokens=10, output_tokens=1)
+            ),
+        ),
+        event(
+            "content_block_start", index=0, content_block=SimpleNamespace(type="text")
+        ),
+        delta(0, type="text_delta", text="Checking."),
+        event(
+            "content_block_start",
+            index=1,
+            content_block=SimpleNamespace(
+                type="tool_use", id="toolu_1", name="get_weather"
+            ),
+        ),
+        delta(1, type="input_json_delta", partial_json='{"city": '),
+        delta(1, type="input_json_delta", partial_json='"Paris"}'),
+        event(
+            "message_delta",
+            delta=SimpleNamespace(stop_reason="tool_use"),
+            usage=SimpleNamespace(output_tokens=12),
+        ),
+    ]
+    provider = AnthropicProvider(api_key="test-api-key")
+    client = provider.__dict__["client"] = MagicMock()
+    client.messages.create.return_value = iter(events)
+
+    chunks = list(
+        provider.chat_completions_create(
+            "claude-3-5-sonnet-20240620",
+            [{"role": "user", "content": "Hi"}],
+            stream=True,
+        )
+    )
+
+    pieces = [call for c in chunks for call in c.choices[0].delta.tool_calls or ()]
+    # Tool calls are numbered from 0, whatever the index of their content block.
+    assert [(p.index, p.id, p.function.name) for p in pieces] == [
+        (0, "toolu_1", "get_weather"),
+        (0, None, None),
+        (0, None, None),
+    ]
+    assert "".join(p.function.arguments for p in pieces) == '{"city": "Paris"}'
+    assert chunks[-1].choices[0].finish_reason == "tool_calls"
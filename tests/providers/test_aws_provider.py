@@ -0,0 +1,197 @@
+from unittest.mock import MagicMock
+
+from aisuite.providers.aws_provider import AwsProvider
+
+
+def test_cache_markers_become_cache_points():
+    """Test that marked messages get a Bedrock cache point and cache usage is reported."""
+
+    provider = AwsProvider()
+    client = provider.__dict__["client"] = MagicMock()
+    client.converse.return_value = {
+        "output": {"message": {"content": [{"text": "Answer."}]}},
+        "stopReason": "end_turn",
+        "usage": {
+            "inputTokens": 12,
+            "outputTokens": 3,
+            "cacheReadInputTokens": 1000,
+            "cacheWriteInputTokens": 0,
+        },
+    }
+
+    response = provider.chat_completions_create(
+        "anthropic.claude-3-5-sonnet-20241022-v2:0",
+        [
+            {"role": "system", "content": "Long instructions.", "cache": True},
+            {"role": "user", "content": "Question?"},
+        ],
+        maxTokens=100,
+    )
+
+    request = client.converse.call_args.kwargs
+    assert request["system"] == [
+        {"text": "Long instructions."},
+        {"cachePoint": {"type": "default"}},
+    ]
+    assert request["messages"] == [{"role": "user", "content": [{"text": "Question?"}]}]
+    assert request["inferenceConfig"] == {"maxTokens": 100}
+    assert response.choices[0].message.content == "Answer."
+    assert response.usage.prompt_tokens == 1012
+    assert response.usage.cache_read_tokens == 1000
+
+
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_weather",
+            "description": "Return the weather in a city.",
+            "parameters": {
+                "type": "object",
+                "properties": {"city": {"type": "string"}},
+                "required": ["city"],
+            },
+        },
+    }
+]
+
+TOOL_CONVERSATION = [
+    {"role": "user", "content": "Weather in Paris and Rome?"},
+    {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {
+                "id": "call_1",
+                "type": "function",
+                "function": {"name": "get_weather", "arguments": '{"city": "Paris"}'},
+            },
+            {
+                "id": "call_2",
+                "type": "function",
+                "function": {"name": "get_weather", "arguments": '{"city": "Rome"}'},
+            },
+        ],
+    },
+    {"role": "tool", "tool_call_id": "call_1", "content": "Sunny"},
+    {"role": "tool", "tool_call_id": "call_2", "content": "Rainy"},
+]
+
+
+def test_tools_and_tool_messages_are_mapped_to_converse():
+    """Test that OpenAI-style tools, tool calls and tool results use the Converse format."""
+
+    provider = AwsProvider()
+    client = provider.__dict__["client"] = MagicMock()
+    client.converse.return_value = {
+        "output": {"message": {"content": [{"text": "Sunny in Paris."}]}},
+        "stopReason": "end_turn",
+    }
+
+    provider.chat_completions_create(
+        "model", TOOL_CONVERSATION, tools=TOOLS, tool_choice="required"
+    )
+
+    request = client.converse.call_args.kwargs
+    assert request["toolConfig"] == {
+        "tools": [
+            {
+                "toolSpec": {
+                    "name": "get_weather",
+                    "description": "Return the weather in a city.",
+                    "inputSchema": {"json": TOOLS[0]["function"]["parameters"]},
+                }
+            }
+        ],
+        "toolChoice": {"any": {}},
+    }
+    assert request["additionalModelRequestFields"] == {}
+    assert request["messages"][1:] == [
+        {
+            "role": "assistant",
+            "content": [
+                {
+                    "toolUse": {
+                        "toolUseId": "call_1",
+                        "name": "get_weather",
+                        "input": {"city": "Paris"},
+                    }
+                },
+                {
+                    "toolUse": {
+                        "toolUseId": "call_2",
+                        "name": "get_weather",
+                        "input": {"city": "Rome"},
+                    }
+                },
+            ],
+        },
+        {
+            "role": "user",
+            "content": [
+                {
+                    "toolResult": {
+                        "toolUseId": "call_1",
+                        "content": [{"text": "Sunny"}],
+                    }
+                },
+                {
+                    "toolResult": {
+                        "toolUseId": "call_2",
+                        "content": [{"text": "Rainy"}],
+                    }
+                },
+            ],
+        },
+    ]
+
+
+def test_streamed_tool_use_blocks_become_tool_calls():
+    """Test that toolUse block starts and deltas of ConverseStream are streamed."""
+
+    provider = AwsProvider()
+    client = provider.__dict__["client"] = MagicMock()
+    client.converse_stream.return_value = {
+        "stream": iter(
+            [
+                {"messageStart": {"role": "assistant"}},
+                {
+                    "contentBlockDelta": {
+                        "delta": {"text": "Checking."},
+                        "contentBlockIndex": 0,
+                    }
+                },
+                {
+                    "contentBlockStart": {
+                        "start": {
+                            "toolUse": {"toolUseId": "tooluse_1", "name": "get_weather"}
+                        },
+                        "contentBlockIndex": 1,
+                    }
+                },
+                {
+                    "contentBlockDelta": {
+                        "delta": {"toolUse": {"input": '{"city": "Paris"}'}},
+                        "contentBlockIndex": 1,
+                    }
+                },
+                {"messageStop": {"stopReason": "tool_use"}},
+            ]
+        )
+    }
+
+    chunks = list(
+        provider.chat_completions_create(
+            "anthropic.claude-3-5-sonnet-20241022-v2:0",
+            [{"role": "user", "content": "Hi"}],
+            stream=True,
+        )
+    )
+
+    pieces = [call for c in chunks for call in c.choices[0].delta.tool_calls or ()]
+    assert [(p.index, p.id, p.function.name) for p in pieces] == [
+        (0, "tooluse_1", "get_weather"),
+        (0, None, None),
+    ]
+    assert pieces[1].function.arguments == '{"city": "Paris"}'
+    assert chunks[-1].choices[0].finish_reason == "tool_calls"
@@ -26,23 +26,26 @@ def test_vertex_interface():
     """High-level test that the interface is initialized and chat completions are requested successfully."""
 
     user_greeting = "Hello!"
-    message_history = [{"role": "user", "content": user_greeting}]
+    message_history = [
+        {"role": "system", "content": "Be brief."},
+        {"role": "user", "content": user_greeting},
+    ]
     selected_model = "our-favorite-model"
     response_text_content = "mocked-text-response-from-model"
 
     interface = GoogleProvider()
     mock_response = MagicMock()
     mock_response.candidates = [MagicMock()]
-    mock_response.candidates[0].content.parts[0].text = response_text_content
+    mock_response.candidates[0].content.parts = [
+        MagicMock(text=response_text_content, function_call=None)
+    ]
 
-    with patch(
-        "aisuite.providers.google_provider.GenerativeModel"
+    with patch("vertexai.init"), patch(
+        "vertexai.generative_models.GenerativeModel"
     ) as mock_generative_model:
         mock_model = MagicMock()
         mock_generative_model.return_value = mock_model
-        mock_chat = MagicMock()
-        mock_model.start_chat.return_value = mock_chat
-        mock_chat.send_message.return_value = mock_response
+        mock_model.generate_content.return_value = mock_response
 
         response = interface.chat_completions_create(
             messages=message_history,
@@ -56,19 +59,47 @@ def test_vertex_interface():
         assert args[0] == selected_model
         assert "generation_config" in kwargs
 
-        # Assert that start_chat was called with correct history.
-        mock_model.start_chat.assert_called_once()
-        _chat_args, chat_kwargs = mock_model.start_chat.call_args
-        assert "history" in chat_kwargs
-        assert isinstance(chat_kwargs["history"], list)
+        # Assert that the full history was sent in a single request.
+        mock_model.generate_content.assert_called_once()
+        (contents,), _ = mock_model.generate_content.call_args
+        assert [content.role for content in contents] == ["user", "user"]
+        assert contents[-1].parts[0].text == user_greeting
 
-        # Assert that send_message was called with the last message.
-        mock_chat.send_message.assert_called_once_with(user_greeting)
+        # Assert that the caller's messages were not modified.
+        assert message_history[0]["role"] == "system"
 
         # Assert that the response is in the correct format.
         assert response.choices[0].message.content == response_text_content
 
 
+def test_models_are_cached_per_generation_config():
+    """Test that GenerativeModel handles are reused for the same model and config."""
+
+    interface = GoogleProvider()
+    messages = [{"role": "user", "content": "Hello!"}]
+
+    with patch("vertexai.init") as mock_init, patch(
+        "vertexai.generative_models.GenerativeModel"
+    ) as mock_generative_model, patch(
+        "vertexai.generative_models.GenerationConfig"
+    ) as mock_generation_config, patch.object(
+        interface, "normalize_response"
+    ):
+        interface.chat_completions_create("model-a", messages, temperature=0.2)
+        interface.chat_completions_create("model-a", messages, temperature=0.2)
+        assert mock_generative_model.call_count == 1
+
+        interface.chat_completions_create(
+            "model-a", messages, temperature=0.2, max_tokens=50, top_p=0.9, stop="END"
+        )
+        assert mock_generative_model.call_count == 2
+        mock_generation_config.assert_called_with(
+            temperature=0.2, max_output_tokens=50, top_p=0.9, stop_sequences=["END"]
+        )
+
+    assert mock_init.call_count <= 1
+
+
 def test_convert_openai_to_vertex_ai():
     interface = GoogleProvider()
     message_history = [{"role": "user", "content": "Hello!"}]
@@ -98,3 +129,84 @@ def test_transform_roles():
     result = interface.transform_roles(messages)
 
     assert result == expected_output
+    assert messages[0]["role"] == "system"
+
+
+def test_tools_and_tool_messages_are_mapped_to_function_parts():
+    """Test that tools become function declarations and tool calls function parts."""
+    interface = GoogleProvider()
+    messages = interface.transform_roles(
+        [
+            {"role": "user", "content": "Weather in Paris?"},
+            {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": "call_0",
+                        "type": "function",
+                        "function": {
+                            "name": "get_weather",
+                            "arguments": '{"city": "Paris"}',
+                        },
+                    }
+                ],
+            },
+            {"role": "tool", "tool_call_id": "call_0", "content": "Sunny"},
+        ]
+    )
+
+    result = interface.convert_openai_to_vertex_ai(messages)
+
+    assert [content.role for content in result] == ["user", "model", "user"]
+    assert result[1].parts[0].to_dict() == {
+        "function_call": {"name": "get_weather", "args": {"city": "Paris"}}
+    }
+    assert result[2].parts[0].to_dict() == {
+        "function_response": {"name": "get_weather", "response": {"content": "Sunny"}}
+    }
+
+    converted = interface.convert_tools(
+        [
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_weather",
+                    "description": "Return the weather in a city.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {"city": {"type": "string"}},
+                    },
+                },
+            }
+        ],
+        "required",
+    )
+    declaration = converted["tools"][0].to_dict()["function_declarations"][0]
+    assert declaration["name"] == "get_weather"
+    assert declaration["description"] == "Return the weather in a city."
+    assert "mode: ANY" in str(converted["tool_config"]._gapic_tool_config)
+    assert interface.convert_tools(None) == {}
+
+
+def test_streamed_function_calls_become_tool_calls():
+    """Test that function call parts of a streamed response are not read as text."""
+    interface = GoogleProvider()
+    function_part = MagicMock()
+    function_part.function_call.to_dict.return_value = {
+        "name": "get_weather",
+        "args": {"city": "Paris"},
+    }
+    response = MagicMock()
+    response.candidates = [MagicMock()]
+    response.candidates[0].content.parts = [function_part]
+    response.candidates[0].finish_reason.name = "STOP"
+
+    chunk = interface.normalize_chunk(response)
+
+    choice = chunk.choices[0]
+    assert choice.delta.content is None
+    assert choice.finish_reason == "tool_calls"
+    [call] = choice.delta.tool_calls
+    assert call.function.name == "get_weather"
+    assert call.function.arguments == '{"city": "Paris"}'
@@ -1,7 +1,11 @@
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import groq
+import httpx
 import pytest
 
+from aisuite.provider import APIConnectionError, RateLimitError
 from aisuite.providers.groq_provider import GroqProvider
 
 
@@ -44,3 +48,121 @@ def test_groq_provider():
         )
 
         assert response.choices[0].message.content == response_text_content
+
+
+def test_groq_provider_streaming():
+    """Test that stream=True normalizes the SDK stream into ChatCompletionChunk objects."""
+
+    provider = GroqProvider()
+    sdk_chunks = []
+    for content, finish_reason in [("Hel", None), ("lo", None), (None, "stop")]:
+        chunk = MagicMock(choices=[MagicMock(index=0)])
+        chunk.choices[0].delta.content = content
+        chunk.choices[0].finish_reason = finish_reason
+        sdk_chunks.append(chunk)
+
+    with patch.object(
+        provider.client.chat.completions, "create", return_value=iter(sdk_chunks)
+    ):
+        chunks = list(
+            provider.chat_completions_create(
+                messages=[{"role": "user", "content": "Hi"}],
+                model="our-favorite-model",
+                stream=True,
+            )
+        )
+
+    assert [c.choices[0].delta.content for c in chunks] == ["Hel", "lo", None]
+    assert chunks[-1].choices[0].finish_reason == "stop"
+
+
+def test_groq_errors_are_typed():
+    """Test that SDK errors are re-raised as typed LLMError subclasses."""
+
+    provider = GroqProvider()
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    sdk_error = groq.RateLimitError(
+        "rate limited",
+        response=httpx.Response(429, headers={"retry-after": "2"}, request=request),
+        body=None,
+    )
+
+    with patch.object(
+        provider.client.chat.completions, "create", side_effect=sdk_error
+    ):
+        with pytest.raises(RateLimitError) as exc_info:
+            provider.chat_completions_create(messages=[], model="our-favorite-model")
+
+    assert exc_info.value.retry_after == 2.0
+    assert exc_info.value.provider == "groq"
+    assert exc_info.value.__cause__ is sdk_error
+
+
+def test_groq_stream_errors_are_typed():
+    """Test that SDK errors raised while a stream is read are typed too."""
+
+    provider = GroqProvider()
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    sdk_error = groq.APIConnectionError(request=request)
+    chunk = MagicMock(choices=[MagicMock(index=0)])
+    chunk.choices[0].delta.content = "Hel"
+
+    def sdk_stream():
+        yield chunk
+        raise sdk_error
+
+    with patch.object(
+        provider.client.chat.completions, "create", return_value=sdk_stream()
+    ):
+        stream = provider.chat_completions_create(
+            messages=[{"role": "user", "content": "Hi"}],
+            model="our-favorite-model",
+            stream=True,
+        )
+        assert next(stream).choices[0].delta.content == "Hel"
+        with pytest.raises(APIConnectionError) as exc_info:
+            next(stream)
+
+    assert exc_info.value.provider == "groq"
+    assert exc_info.value.__cause__ is sdk_error
+
+
+def test_groq_streamed_tool_calls():
+    """Test that tool calls streamed in pieces are passed through with their index."""
+
+    def chunk(tool_calls, finish_reason=None):
+        delta = SimpleNamespace(content=None, role=None, tool_calls=tool_calls)
+        choice = SimpleNamespace(index=0, delta=delta, finish_reason=finish_reason)
+        return SimpleNamespace(choices=[choice], usage=None)
+
+    def piece(index, arguments, id=None, name=None):
+        function = SimpleNamespace(name=name, arguments=arguments)
+        return SimpleNamespace(index=index, id=id, type=None, function=function)
+
+    provider = GroqProvider()
+    sdk_chunks = [
+        chunk([piece(0, "", id="call_a", name="get_weather")]),
+        chunk([piece(0, '{"city": "Paris"}')]),
+        chunk([piece(1, '{"city": "Rome"}', id="call_b", name="get_weather")]),
+        chunk(None, finish_reason="tool_calls"),
+    ]
+
+    with patch.object(
+        provider.client.chat.completions, "create", return_value=iter(sdk_chunks)
+    ):
+        chunks = list(
+            provider.chat_completions_create(
+                messages=[{"role": "user", "content": "Hi"}],
+                model="our-favorite-model",
+                stream=True,
+            )
+        )
+
+    pieces = [call for c in chunks for call in c.choices[0].delta.tool_calls or ()]
+    assert [(p.index, p.id, p.function.name) for p in pieces] == [
+        (0, "call_a", "get_weather"),
+        (0, None, None),
+        (1, "call_b", "get_weather"),
+    ]
+    assert pieces[1].function.arguments == '{"city": "Paris"}'
+    assert chunks[-1].choices[0].finish_reason == "tool_calls"
@@ -41,3 +41,21 @@ def test_mistral_provider():
         )
 
         assert response.choices[0].message.content == response_text_content
+
+
+def test_sdk_errors_without_a_response_are_typed():
+    """Test that an SDKError without its HTTP response still becomes an LLMError."""
+    from mistralai import models
+
+    from aisuite.provider import LLMError
+    from aisuite.providers.mistral_provider import translate_mistral_errors
+
+    sdk_error = models.SDKError.__new__(models.SDKError)
+    object.__setattr__(sdk_error, "message", "boom")
+
+    with pytest.raises(LLMError) as exc_info:
+        with translate_mistral_errors():
+            raise sdk_error
+
+    assert exc_info.value.provider == "mistral"
+    assert exc_info.value.__cause__ is sdk_error
@@ -1,6 +1,10 @@
+import asyncio
+import json
+import httpx
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from aisuite.providers.ollama_provider import OllamaProvider
+from aisuite.provider import RateLimitError, APIConnectionError
 
 
 @pytest.fixture(autouse=True)
@@ -19,11 +23,17 @@ def test_completion():
     response_text_content = "mocked-text-response-from-ollama-model"
 
     ollama = OllamaProvider()
-    mock_response = {"message": {"content": response_text_content}}
+    mock_response = {
+        "message": {"content": response_text_content},
+        "prompt_eval_count": 7,
+        "eval_count": 3,
+    }
 
     with patch(
-        "httpx.post",
-        return_value=MagicMock(status_code=200, json=lambda: mock_response),
+        "httpx.Client.post",
+        return_value=MagicMock(
+            status_code=200, content=json.dumps(mock_response).encode()
+        ),
     ) as mock_post:
         response = ollama.chat_completions_create(
             messages=message_history,
@@ -31,15 +41,177 @@ def test_completion():
             temperature=chosen_temperature,
         )
 
-        mock_post.assert_called_once_with(
-            "http://localhost:11434/api/chat",
-            json={
-                "model": selected_model,
-                "messages": message_history,
-                "stream": False,
-                "temperature": chosen_temperature,
-            },
-            timeout=30,
+        mock_post.assert_called_once()
+        args, kwargs = mock_post.call_args
+        assert args == ("http://localhost:11434/api/chat",)
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        assert json.loads(kwargs["content"]) == {
+            "model": selected_model,
+            "messages": message_history,
+            "stream": False,
+            "temperature": chosen_temperature,
+        }
+
+        assert response.choices[0].message.content == response_text_content
+        assert response.usage.prompt_tokens == 7
+        assert response.usage.completion_tokens == 3
+
+
+def test_async_completion():
+    """Test that async completions request successfully."""
+
+    message_history = [{"role": "user", "content": "Howdy!"}]
+    response_text_content = "mocked-async-response-from-ollama-model"
+
+    ollama = OllamaProvider()
+    mock_response = {"message": {"content": response_text_content}}
+
+    with patch(
+        "httpx.AsyncClient.post",
+        new_callable=AsyncMock,
+        return_value=MagicMock(
+            status_code=200, content=json.dumps(mock_response).encode()
+        ),
+    ) as mock_post:
+        response = asyncio.run(
+            ollama.achat_completions_create(
+                messages=message_history, model="best-model-ever"
+            )
         )
 
+        mock_post.assert_called_once()
+        args, kwargs = mock_post.call_args
+        assert args == ("http://localhost:11434/api/chat",)
+        assert json.loads(kwargs["content"]) == {
+            "model": "best-model-ever",
+            "messages": message_history,
+            "stream": False,
+        }
+
         assert response.choices[0].message.content == response_text_content
+
+
+def test_connection_pool_is_reused():
+    """Test that the provider keeps one pooled httpx client across calls until closed."""
+
+    ollama = OllamaProvider(max_connections=4, keepalive_expiry=30)
+    mock_response = {"message": {"content": "pooled"}}
+
+    with patch(
+        "httpx.Client.post",
+        return_value=MagicMock(
+            status_code=200, content=json.dumps(mock_response).encode()
+        ),
+    ):
+        ollama.chat_completions_create(messages=[], model="best-model-ever")
+        http_client = ollama.http.client
+        ollama.chat_completions_create(messages=[], model="best-model-ever")
+        assert ollama.http.client is http_client
+
+    assert ollama.http.limits.max_connections == 4
+    assert ollama.http.limits.keepalive_expiry == 30
+
+    ollama.close()
+    assert http_client.is_closed
+
+
+def test_streaming_completion():
+    """Test that stream=True yields normalized chunks parsed from Ollama's NDJSON stream."""
+
+    lines = [
+        {"message": {"role": "assistant", "content": "Hel"}, "done": False},
+        {"message": {"role": "assistant", "content": "lo"}, "done": False},
+        {
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": 12,
+            "eval_count": 2,
+        },
+    ]
+    body = "\n".join(json.dumps(line) for line in lines)
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, text=body)
+
+    ollama = OllamaProvider()
+    ollama.http._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    chunks = list(
+        ollama.chat_completions_create(
+            messages=[{"role": "user", "content": "Hi"}],
+            model="best-model-ever",
+            stream=True,
+        )
+    )
+
+    assert "".join(c.choices[0].delta.content for c in chunks) == "Hello"
+    assert chunks[0].choices[0].delta.role == "assistant"
+    assert chunks[-1].choices[0].finish_reason == "stop"
+    assert chunks[0].usage is None
+    assert chunks[-1].usage.prompt_tokens == 12
+    assert chunks[-1].usage.total_tokens == 14
+
+
+def test_streamed_tool_calls():
+    """Test that the tool calls of Ollama's stream are normalized."""
+
+    lines = [
+        {
+            "message": {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "function": {
+                            "name": "get_weather",
+                            "arguments": {"city": "Paris"},
+                        }
+                    }
+                ],
+            },
+            "done": False,
+        },
+        {"message": {"role": "assistant", "content": ""}, "done": True},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines)
+    ollama = OllamaProvider()
+    ollama.http._client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+    )
+
+    chunks = list(
+        ollama.chat_completions_create(
+            messages=[{"role": "user", "content": "Hi"}],
+            model="best-model-ever",
+            stream=True,
+        )
+    )
+
+    [call] = chunks[0].choices[0].delta.tool_calls
+    assert (call.index, call.id, call.function.name) == (0, "call_0", "get_weather")
+    assert call.function.arguments == '{"city": "Paris"}'
+    assert chunks[1].choices[0].delta.tool_calls is None
+
+
+def test_errors_are_typed():
+    """Test that HTTP and connection failures are raised as typed LLMError subclasses."""
+
+    def handler(request):
+        return httpx.Response(429, headers={"Retry-After": "7"}, text="busy")
+
+    ollama = OllamaProvider()
+    ollama.http._client = httpx.Client(transport=httpx.MockTransport(handler))
+    with pytest.raises(RateLimitError) as exc_info:
+        ollama.chat_completions_create(messages=[], model="best-model-ever")
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.retry_after == 7.0
+
+    def refuse(request):
+        raise httpx.ConnectError("connection refused")
+
+    ollama.http._client = httpx.Client(transport=httpx.MockTransport(refuse))
+    with pytest.raises(APIConnectionError) as exc_info:
+        ollama.chat_completions_create(messages=[], model="best-model-ever")
+    assert "Ollama is likely not running" in str(exc_info.value)
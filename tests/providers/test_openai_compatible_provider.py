@@ -0,0 +1,211 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from aisuite import Client
+from aisuite.provider import AuthenticationError
+from aisuite.providers.azure_provider import AzureProvider
+from aisuite.providers.huggingface_provider import HuggingfaceProvider
+from aisuite.providers.openai_compatible_provider import OpenaiCompatibleProvider
+
+COMPLETION = {
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "Hello!"},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 2},
+}
+
+
+def mock_transport(requests, response=COMPLETION, status_code=200):
+    def handler(request):
+        requests.append(request)
+        body = json.loads(request.content)
+        if body.get("stream"):
+            lines = [
+                {"choices": [{"delta": {"role": "assistant", "content": "Hel"}}]},
+                {"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}]},
+            ]
+            text = "".join(f"data: {json.dumps(line)}\n\n" for line in lines)
+            return httpx.Response(status_code, text=text + "data: [DONE]\n\n")
+        return httpx.Response(status_code, json=response)
+
+    return httpx.MockTransport(handler)
+
+
+def test_endpoint_registered_by_config():
+    client = Client(
+        {
+            "vllm": {
+                "type": "openai_compatible",
+                "base_url": "http://localhost:8000/v1/",
+                "api_key": "secret",
+                "headers": {"X-Team": "search"},
+            }
+        }
+    )
+    provider = client.providers["vllm"]
+    assert isinstance(provider, OpenaiCompatibleProvider)
+
+    requests = []
+    provider.http._client = httpx.Client(transport=mock_transport(requests))
+    response = client.chat.completions.create(
+        "vllm:meta-llama/Llama-3.1-8B-Instruct",
+        messages=[{"role": "user", "content": "Hi"}],
+        temperature=0.2,
+    )
+
+    assert response.choices[0].message.content == "Hello!"
+    assert response.usage.total_tokens == 7
+    request = requests[0]
+    assert str(request.url) == "http://localhost:8000/v1/chat/completions"
+    assert request.headers["Authorization"] == "Bearer secret"
+    assert request.headers["X-Team"] == "search"
+    assert json.loads(request.content) == {
+        "model": "meta-llama/Llama-3.1-8B-Instruct",
+        "messages": [{"role": "user", "content": "Hi"}],
+        "temperature": 0.2,
+    }
+
+
+def test_unknown_provider_type():
+    with pytest.raises(ValueError, match="Invalid provider key 'vllm'"):
+        Client({"vllm": {"type": "nope"}})
+
+
+def test_base_url_is_required():
+    with pytest.raises(ValueError, match="base_url is required"):
+        OpenaiCompatibleProvider()
+
+
+def test_streaming_and_async():
+    provider = OpenaiCompatibleProvider(base_url="http://localhost:1234/v1")
+    requests = []
+    provider.http._client = httpx.Client(transport=mock_transport(requests))
+
+    chunks = list(provider.chat_completions_create("local", [], stream=True))
+    assert "".join(c.choices[0].delta.content for c in chunks) == "Hello"
+    assert chunks[-1].choices[0].finish_reason == "stop"
+    # No API key configured, so none is sent.
+    assert "Authorization" not in requests[0].headers
+
+    async def call():
+        provider.http._async_clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+            transport=mock_transport(requests)
+        )
+        return await provider.achat_completions_create("local", [])
+
+    assert asyncio.run(call()).choices[0].message.content == "Hello!"
+
+
+def test_errors_carry_the_configured_name():
+    provider = OpenaiCompatibleProvider(
+        base_url="http://localhost:1234/v1", name="lmstudio"
+    )
+    provider.http._client = httpx.Client(
+        transport=mock_transport([], response={}, status_code=401)
+    )
+    with pytest.raises(AuthenticationError) as exc_info:
+        provider.chat_completions_create("local", [])
+    assert exc_info.value.provider == "lmstudio"
+    assert "lmstudio request failed" in str(exc_info.value)
+
+
+def test_hosted_providers_customize_the_request():
+    azure = AzureProvider(api_key="key", base_url="https://model.ai.azure.com")
+    url, headers, data = azure._prepare_request("model", [], temperature=0)
+    assert url == "https://model.ai.azure.com/chat/completions"
+    assert headers["Authorization"] == "key"
+    assert data == {"messages": [], "temperature": 0}
+
+    huggingface = HuggingfaceProvider(token="hf")
+    url, headers, data = huggingface._prepare_request("org/model", [])
+    assert (
+        url
+        == "https://api-inference.huggingface.co/models/org/model/v1/chat/completions"
+    )
+    assert headers["Authorization"] == "Bearer hf"
+    assert data["model"] == "org/model"
+
+
+def test_streamed_tool_calls():
+    lines = [
+        {
+            "choices": [
+                {
+                    "delta": {
+                        "role": "assistant",
+                        "tool_calls": [
+                            {
+                                "index": 0,
+                                "id": "call_a",
+                                "type": "function",
+                                "function": {"name": "get_weather", "arguments": ""},
+                            }
+                        ],
+                    }
+                }
+            ]
+        },
+        {
+            "choices": [
+                {
+                    "delta": {
+                        "tool_calls": [
+                            {"index": 0, "function": {"arguments": '{"city": "Paris"}'}}
+                        ]
+                    },
+                    "finish_reason": "tool_calls",
+                }
+            ]
+        },
+    ]
+    text = "".join(f"data: {json.dumps(line)}\n\n" for line in lines)
+    provider = OpenaiCompatibleProvider(base_url="http://localhost:1234/v1")
+    provider.http._client = httpx.Client(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text=text + "data: [DONE]\n\n")
+        )
+    )
+
+    first, second = provider.chat_completions_create("local", [], stream=True)
+
+    [call] = first.choices[0].delta.tool_calls
+    assert (call.index, call.id, call.function.name) == (0, "call_a", "get_weather")
+    [call] = second.choices[0].delta.tool_calls
+    assert (call.index, call.id, call.function.arguments) == (
+        0,
+        None,
+        '{"city": "Paris"}',
+    )
+    assert second.choices[0].finish_reason == "tool_calls"
+
+
+def test_streamed_choices_keep_their_index():
+    lines = [
+        {
+            "choices": [
+                {"index": 0, "delta": {"content": "Yes"}},
+                {"index": 1, "delta": {"content": "No"}, "finish_reason": "stop"},
+            ]
+        },
+    ]
+    text = "".join(f"data: {json.dumps(line)}\n\n" for line in lines)
+    provider = OpenaiCompatibleProvider(base_url="http://localhost:1234/v1")
+    provider.http._client = httpx.Client(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text=text + "data: [DONE]\n\n")
+        )
+    )
+
+    [chunk] = provider.chat_completions_create("local", [], n=2, stream=True)
+
+    assert [(c.index, c.delta.content, c.finish_reason) for c in chunk.choices] == [
+        (0, "Yes", None),
+        (1, "No", "stop"),
+    ]